@@ -0,0 +1,96 @@
+"""Login-storm benchmark for the FastAPI backend.
+
+Measures the latency of an unrelated endpoint (GET /api/projects) on its
+own and while a burst of concurrent logins is in flight. With password
+hashing off the event loop the two p99s should stay close; when bcrypt
+runs on the loop every probe queues behind the hashes.
+
+    python bench_login_storm.py --base-url http://localhost:8001/api --logins 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def probe(client, headers, stop, samples, interval):
+    """Hit the unrelated endpoint until stop is set, recording latencies in ms"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/projects", headers=headers)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def measure(client, headers, seconds, interval, load=None):
+    samples = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, headers, stop, samples, interval))
+    if load is None:
+        await asyncio.sleep(seconds)
+    else:
+        await load
+    stop.set()
+    await prober
+    return samples
+
+
+async def storm(client, credentials, logins):
+    async def login():
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - started
+
+
+def report(name, samples):
+    print(f"{name:>10}: n={len(samples):4d}  p50={statistics.median(samples):7.1f} ms  "
+          f"p99={percentile(samples, 0.99):7.1f} ms  max={max(samples):7.1f} ms")
+
+
+async def main(args):
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:8]}@example.com", "password": "bench-password"}
+    limits = httpx.Limits(max_connections=args.logins + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        response = await client.post("/auth/register", json={**credentials, "name": "Login storm"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        baseline = await measure(client, headers, args.seconds, args.interval)
+        elapsed = []
+
+        async def load():
+            elapsed.append(await storm(client, credentials, args.logins))
+
+        during = await measure(client, headers, args.seconds, args.interval, load())
+
+    report("baseline", baseline)
+    report("storm", during)
+    print(f"{args.logins} logins took {elapsed[0]:.2f} s")
+
+    ratio = percentile(during, 0.99) / max(percentile(baseline, 0.99), 1.0)
+    print(f"p99 ratio: {ratio:.2f} (limit {args.max_ratio})")
+    return 0 if ratio <= args.max_ratio else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--logins", type=int, default=100, help="concurrent logins in the storm")
+    parser.add_argument("--seconds", type=float, default=3, help="length of the baseline window")
+    parser.add_argument("--interval", type=float, default=0.01, help="pause between probes")
+    parser.add_argument("--max-ratio", type=float, default=3.0,
+                        help="fail when storm p99 exceeds baseline p99 by more than this factor")
+    sys.exit(asyncio.run(main(parser.parse_args())))
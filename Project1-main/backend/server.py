@@ -6,6 +6,9 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import jwt
 import os
 import logging
@@ -30,10 +33,24 @@ api_router = APIRouter(prefix="/api")
 
 # Security
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor; every +1 doubles the cost of a hash or verify
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the
+# event loop; logins beyond PASSWORD_HASH_WORKERS queue instead of stalling
+# every other request on the worker
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 JWT_SECRET = os.environ.get("JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 
+# Users resolved from tokens are trusted for USER_CACHE_TTL seconds, so an
+# authenticated request does not need a users lookup every time
+USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", "30"))
+user_cache = TTLCache(maxsize=4096, ttl=USER_CACHE_TTL)
+user_cache_stats = {"hits": 0, "db_fallbacks": 0}
+
 # Enums
 class TaskStatus(str, Enum):
     TODO = "todo"
@@ -153,11 +170,13 @@ class DashboardStats(BaseModel):
     recent_tasks: List[Task]
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify, plain_password, hashed_password)
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -172,11 +191,19 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
+        user = user_cache.get(user_id)
+        if user is not None:
+            user_cache_stats["hits"] += 1
+            return user.model_copy()
+        
+        user_cache_stats["db_fallbacks"] += 1
         user_data = await db.users.find_one({"id": user_id})
         if user_data is None:
             raise HTTPException(status_code=401, detail="User not found")
         
-        return User(**user_data)
+        user = User(**user_data)
+        user_cache[user_id] = user
+        return user.model_copy()
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -189,7 +216,7 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     user = User(
         email=user_data.email,
         name=user_data.name,
@@ -208,7 +235,7 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login(login_data: UserLogin):
     user_data = await db.users.find_one({"email": login_data.email})
-    if not user_data or not verify_password(login_data.password, user_data["hashed_password"]):
+    if not user_data or not await verify_password(login_data.password, user_data["hashed_password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     user = User(**user_data)
@@ -347,4 +374,5 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    password_executor.shutdown(wait=False)
\ No newline at end of file
@@ -1,5 +1,25 @@
+"""
+TaskFlow API checks.
+
+By default this runs the functional checks below in sequence. With --load
+it instead drives a local server with concurrent virtual users, each
+replaying a mix of scenarios, and reports throughput and latency per
+endpoint as JSON:
+
+    python django_backend/manage.py seed_scale --seed 1
+    python backend_test.py --load --users 50 --duration 60 --accounts 200 --accounts-seed 1 \
+        --label main --output load.json
+
+Load mode needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import random
 import requests
+import statistics
 import sys
+import time
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
 import json
 
@@ -228,11 +248,264 @@ class TaskFlowAPITester:
         self.token = original_token
         return success
 
+
+LOAD_MIX = {
+    'dashboard': 30,
+    'kanban': 20,
+    'timer': 15,
+    'notifications': 35,
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class TaskFlowLoadTester:
+    """Concurrent virtual users replaying scenario mixes against one server"""
+
+    def __init__(self, base_url, accounts, users=20, duration=30.0, ramp_up=5.0, mix=None,
+                 think_time=(0.2, 1.0), seed=None, timeout=30.0):
+        self.base_url = base_url.rstrip('/')
+        self.accounts = accounts
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.mix = mix or LOAD_MIX
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.timeout = timeout
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.iterations = Counter()
+        self.logins = Counter()
+
+    async def call(self, client, vu, method, endpoint, label=None, expected=(200,), **kwargs):
+        """Time one request and record it under `label`, e.g. "POST tasks/{id}/move/" """
+        name = f"{method} {label or endpoint}"
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, f"{self.base_url}/{endpoint}",
+                                            headers=vu.get('headers'), **kwargs)
+        except Exception as e:
+            self.statuses[name][type(e).__name__] += 1
+            return None
+        self.samples[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][str(response.status_code)] += 1
+        if response.status_code not in expected:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    async def login(self, client, vu):
+        email, password = vu['account']
+        data = await self.call(client, vu, 'POST', 'auth/login/', json={'email': email, 'password': password})
+        if data and 'access_token' in data:
+            vu['headers'] = {'Authorization': f"Bearer {data['access_token']}"}
+            vu['user_id'] = data['user']['id']
+            return True
+        return False
+
+    async def scenario_dashboard(self, client, vu):
+        """Open the dashboard: profile, stats, projects, task list and recent activity"""
+        await self.call(client, vu, 'GET', 'auth/me/')
+        await self.call(client, vu, 'GET', 'dashboard/stats/')
+        projects = await self.call(client, vu, 'GET', 'projects/')
+        tasks = await self.call(client, vu, 'GET', 'tasks/')
+        await self.call(client, vu, 'GET', 'activity-logs/recent/')
+        if projects:
+            vu['projects'] = [project['id'] for project in projects.get('results', [])]
+        if tasks:
+            vu['tasks'] = [task['id'] for task in tasks.get('results', [])]
+
+    async def scenario_kanban(self, client, vu):
+        """Open a project board and drag one of the user's cards to another column"""
+        if not vu.get('projects'):
+            projects = await self.call(client, vu, 'GET', 'projects/')
+            vu['projects'] = [project['id'] for project in (projects or {}).get('results', [])]
+        if not vu['projects']:
+            return
+        project_id = self.random.choice(vu['projects'])
+        board = await self.call(client, vu, 'GET', f'projects/{project_id}/board/', 'projects/{id}/board/')
+        if not board:
+            return
+        columns = [column['status'] for column in board['columns']]
+        cards = [
+            (column['status'], card['id']) for column in board['columns'] for card in column['cards']
+            if (card.get('assigned_to') or {}).get('id') == vu['user_id']
+        ]
+        if not cards or len(columns) < 2:
+            return
+        current, task_id = self.random.choice(cards)
+        target = self.random.choice([column for column in columns if column != current])
+        await self.call(client, vu, 'POST', f'tasks/{task_id}/move/', 'tasks/{id}/move/', json={'status': target})
+
+    async def scenario_timer(self, client, vu):
+        """Start a timer on one of the user's tasks, work a little, then stop it"""
+        if not vu.get('tasks'):
+            tasks = await self.call(client, vu, 'GET', 'tasks/')
+            vu['tasks'] = [task['id'] for task in (tasks or {}).get('results', [])]
+        if not vu['tasks']:
+            return
+        task_id = self.random.choice(vu['tasks'])
+        # 400 means a timer is already running for this task, which the stop below ends
+        await self.call(client, vu, 'POST', f'tasks/{task_id}/timer/start/', 'tasks/{id}/timer/start/',
+                        expected=(201, 400))
+        await asyncio.sleep(self.random.uniform(*self.think_time))
+        await self.call(client, vu, 'POST', f'tasks/{task_id}/timer/stop/', 'tasks/{id}/timer/stop/')
+        await self.call(client, vu, 'GET', 'time-entries/active-timer/')
+
+    async def scenario_notifications(self, client, vu):
+        """Poll the notification badge, opening the list when something is unread"""
+        summary = await self.call(client, vu, 'GET', 'notifications/summary/')
+        if summary and summary.get('unread_count'):
+            await self.call(client, vu, 'GET', 'notifications/')
+
+    async def virtual_user(self, client, index, deadline):
+        await asyncio.sleep(self.ramp_up * index / self.users)
+        vu = {'account': self.accounts[index % len(self.accounts)]}
+        if not await self.login(client, vu):
+            self.logins['failed'] += 1
+            return
+        self.logins['ok'] += 1
+        scenarios = list(self.mix)
+        weights = [self.mix[name] for name in scenarios]
+        while time.perf_counter() < deadline:
+            name = self.random.choices(scenarios, weights)[0]
+            await getattr(self, f'scenario_{name}')(client, vu)
+            self.iterations[name] += 1
+            await asyncio.sleep(self.random.uniform(*self.think_time))
+
+    async def run(self):
+        try:
+            import httpx
+        except ImportError:
+            raise SystemExit('Load mode needs httpx: pip install httpx')
+
+        limits = httpx.Limits(max_connections=self.users, max_keepalive_connections=self.users)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout) as client:
+            started = time.perf_counter()
+            deadline = started + self.duration
+            await asyncio.gather(*(self.virtual_user(client, index, deadline) for index in range(self.users)))
+            elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def summarize(self, samples, statuses, elapsed):
+        errors = sum(count for status, count in statuses.items() if not status.startswith(('2', '3')))
+        return {
+            'requests': sum(statuses.values()),
+            'errors': errors,
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'mean_ms': round(statistics.fmean(samples), 1) if samples else None,
+            'p50_ms': round(statistics.median(samples), 1) if samples else None,
+            'p95_ms': round(percentile(samples, 0.95), 1),
+            'p99_ms': round(percentile(samples, 0.99), 1),
+            'statuses': dict(statuses),
+        }
+
+    def report(self, elapsed):
+        all_samples = [sample for samples in self.samples.values() for sample in samples]
+        all_statuses = sum(self.statuses.values(), Counter())
+        return {
+            'base_url': self.base_url,
+            'virtual_users': self.users,
+            'duration_s': round(elapsed, 1),
+            'mix': self.mix,
+            'logins': {'ok': self.logins['ok'], 'failed': self.logins['failed']},
+            'scenarios': dict(self.iterations),
+            'total': self.summarize(all_samples, all_statuses, elapsed),
+            'endpoints': {
+                name: self.summarize(self.samples[name], self.statuses[name], elapsed)
+                for name in sorted(self.statuses)
+            },
+        }
+
+
+def parse_mix(value):
+    """Parse "dashboard=30,timer=10" into scenario weights"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in LOAD_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}', expected one of {', '.join(LOAD_MIX)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def run_load(args):
+    if args.accounts:
+        # Users created by: manage.py seed_scale --seed <accounts-seed>
+        accounts = [(f'seed{args.accounts_seed}-user{index}@example.com', 'password123')
+                    for index in range(args.accounts)]
+    else:
+        accounts = [(args.email, args.password)]
+
+    tester = TaskFlowLoadTester(args.base_url, accounts, users=args.users, duration=args.duration,
+                                ramp_up=args.ramp_up, mix=args.mix, seed=args.seed)
+    print(f"🚀 Load testing {tester.base_url} with {args.users} virtual users for {args.duration:g}s...",
+          file=sys.stderr)
+    result = {'label': args.label, **asyncio.run(tester.run())}
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        runs = {}
+        try:
+            with open(args.output) as f:
+                runs = json.load(f)
+        except FileNotFoundError:
+            pass
+        runs[args.label] = result
+        with open(args.output, 'w') as f:
+            json.dump(runs, f, indent=2)
+
+        # Throughput and p95 of every recorded build, relative to the first
+        for name in sorted({name for run in runs.values() for name in run['endpoints']}):
+            stats = {label: run['endpoints'].get(name) for label, run in runs.items()}
+            base = next(iter(stats.values())) or {}
+            print(f'{name}: ' + ' | '.join(
+                f"{label} {stat['requests_per_second']} req/s p95 {stat['p95_ms']} ms"
+                + (f" ({stat['p95_ms'] / base['p95_ms']:.2f}x)" if base.get('p95_ms') else '')
+                for label, stat in stats.items() if stat
+            ), file=sys.stderr)
+
+    if not result['logins']['ok']:
+        print(f"❌ No virtual user could log in as {accounts[0][0]}"
+              + (" (check --accounts-seed against seed_scale --seed)" if args.accounts else ""),
+              file=sys.stderr)
+        return 1
+    return 1 if result['total']['errors'] else 0
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='API root (default: the preview deployment, or a local server with --load)')
+    parser.add_argument('--load', action='store_true', help='Run the load test instead of the functional checks')
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to keep starting scenarios')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which virtual users start')
+    parser.add_argument('--mix', type=parse_mix, default=LOAD_MIX,
+                        help='Scenario weights, e.g. dashboard=30,kanban=20,timer=15,notifications=35')
+    parser.add_argument('--accounts', type=int, default=0,
+                        help='Spread virtual users over this many seed_scale accounts')
+    parser.add_argument('--accounts-seed', type=int, default=1,
+                        help='--seed the accounts were created with (default 1, like seed_scale)')
+    parser.add_argument('--email', default='demo@taskflow.com', help='Account to use without --accounts')
+    parser.add_argument('--password', default='demo123')
+    parser.add_argument('--seed', type=int, help='Seed for scenario choices')
+    parser.add_argument('--label', default='run', help='Name of this build in the output')
+    parser.add_argument('--output', help='JSON file collecting results of several runs by label')
+    args = parser.parse_args()
+
+    if args.load:
+        args.base_url = args.base_url or 'http://127.0.0.1:8000/api'
+        return run_load(args)
+
     print("🚀 Starting TaskFlow API Testing...")
     print("=" * 50)
     
-    tester = TaskFlowAPITester()
+    tester = TaskFlowAPITester(args.base_url) if args.base_url else TaskFlowAPITester()
     
     # Test sequence
     tests = [
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from .db_routing import id_subquery
 from .models import User, Project, Task, TimeEntry, Comment, Notification
 
 
@@ -49,9 +50,14 @@ class TaskAdmin(admin.ModelAdmin):
     fieldsets = (
         (None, {'fields': ('title', 'description')}),
         ('Assignment', {'fields': ('project', 'assigned_to', 'created_by')}),
-        ('Details', {'fields': ('status', 'priority', 'due_date')}),
+        ('Details', {'fields': ('status', 'priority', 'due_date', 'completed_at')}),
         ('Time Tracking', {'fields': ('estimated_hours', 'actual_hours')}),
     )
+    readonly_fields = ['completed_at']
+    
+    def save_model(self, request, obj, form, change):
+        obj.status_changed_by = request.user
+        super().save_model(request, obj, form, change)
 
 
 @admin.register(TimeEntry)
@@ -79,6 +85,14 @@ class NotificationAdmin(admin.ModelAdmin):
     """Admin interface for Notification model"""
     list_display = ['title', 'user', 'notification_type', 'is_read', 'created_at']
     list_filter = ['notification_type', 'is_read', 'created_at']
-    search_fields = ['title', 'user__name']
+    search_fields = ['title']
     date_hierarchy = 'created_at'
-    ordering = ['-created_at']
\ No newline at end of file
+    ordering = ['-created_at']
+
+    def get_search_results(self, request, queryset, search_term):
+        # user is a plain id (see ActivityLog), so match names separately
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            users = User.objects.filter(name__icontains=search_term)
+            results |= queryset.filter(user_id__in=id_subquery(users, Notification))
+        return results, may_have_duplicates
\ No newline at end of file
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        # Register change-log, event clean-up, blob clean-up, user-cache,
+        # connection-tuning, SQL-metrics and query-check signal handlers,
+        # and the replica routing system check
+        from . import sync  # noqa: F401
+        from . import events  # noqa: F401
+        from . import storage  # noqa: F401
+        from . import authentication  # noqa: F401
+        from . import connections  # noqa: F401
+        from . import metrics  # noqa: F401
+        from . import querycheck  # noqa: F401
+        from . import db_routing  # noqa: F401
@@ -1,5 +1,28 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from .authentication import CLAIMS_VERSION_CLAIM, MAX_PROJECT_CLAIMS, PROJECTS_CLAIM
+from .models import User
+from .revocation import RevocableRefreshToken
+
+
+def add_claims(token, user):
+    """Embed the claims read-only endpoints authorize from"""
+    token['name'] = user.name
+    token['role'] = user.role
+    token['email'] = user.email
+    token[CLAIMS_VERSION_CLAIM] = user.claims_version
+
+    project_ids = list(user.projects.values_list('id', flat=True)[:MAX_PROJECT_CLAIMS + 1])
+    if len(project_ids) <= MAX_PROJECT_CLAIMS:
+        token[PROJECTS_CLAIM] = [str(pk) for pk in project_ids]
+    elif PROJECTS_CLAIM in token:
+        del token[PROJECTS_CLAIM]
+    return token
 
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -11,11 +34,7 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
         
         # Add custom claims
-        token['name'] = user.name
-        token['role'] = user.role
-        token['email'] = user.email
-        
-        return token
+        return add_claims(token, user)
     
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -38,3 +57,29 @@ class EmailTokenObtainPairView(TokenObtainPairView):
     serializer_class = EmailTokenObtainPairSerializer
 
 
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that re-reads the user, so new tokens carry current claims.
+    
+    Refresh tokens are checked against the revocation store, and the one
+    presented is revoked when it is rotated.
+    """
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        access = AccessToken(data['access'])
+        user = User.objects.filter(pk=access[api_settings.USER_ID_CLAIM], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(_("No active account found for the given token"), code="no_active_account")
+
+        data['access'] = str(add_claims(access, user))
+        if 'refresh' in data:
+            data['refresh'] = str(add_claims(self.token_class(data['refresh']), user))
+        return data
+
+
+class ClaimsTokenRefreshView(TokenRefreshView):
+    serializer_class = ClaimsTokenRefreshSerializer
@@ -0,0 +1,403 @@
+"""
+JWT authentication with cached user resolution.
+
+simplejwt's JWTAuthentication loads the user row on every request. The
+CachedJWTAuthentication below keeps recently seen users in a small
+per-process LRU with a short TTL, optionally backed by a shared Django
+cache (AUTH_USER_CACHE['SHARED_CACHE']), and only falls back to the
+database on a miss.
+
+Saving or deleting a User (profile updates, change_password, deactivation)
+drops its entry from the local and shared cache. Other processes keep
+their local copy until it expires, so the TTL bounds how long a change can
+take to reach every worker.
+
+Read-only views that set `claims_authorization = True` skip the user row
+entirely: the request is authorized from the token's signed claims (role,
+project ids) through a ClaimsUser, as long as the token's claims version
+still matches the user's. Role, activation, password and membership changes
+bump User.claims_version, after which such tokens fall back to the database
+user until they are refreshed.
+
+Claims versions are cached next to the users. With a shared cache a bump
+from any worker deletes the entry every other worker reads. Without one
+each process keeps the versions in its LRU for the same TTL as the users,
+so a role or membership change made in another worker can take up to the
+TTL to reach a claims-authorized read, the same bound as for cached users.
+A shared alias whose backend is itself per-process (LocMemCache) is
+reported by the api.W001 system check.
+
+Plain async views (api.views_async) use aauthenticate(), the same checks
+with the database lookup done through the async ORM.
+"""
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User, Project
+
+DEFAULTS = {
+    'TTL': 30,             # seconds a resolved user is trusted
+    'MAX_SIZE': 4096,      # users kept per process
+    'SHARED_CACHE': None,  # alias in CACHES shared by all workers, e.g. 'default'
+}
+
+CLAIMS_VERSION_CLAIM = 'cv'
+PROJECTS_CLAIM = 'projects'
+
+# Users in more projects get no project claim and are checked in the database
+MAX_PROJECT_CLAIMS = 32
+
+# Changing any of these makes previously issued claims stale
+CLAIMED_FIELDS = ('role', 'is_active', 'password')
+
+
+def _config(name):
+    return getattr(settings, 'AUTH_USER_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class UserCache:
+    """Thread-safe LRU of User objects with a TTL and hit/fallback counters.
+
+    Also keeps the claims version of each user when no shared cache is
+    configured, with the same TTL and size limit.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._versions = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'shared_hits': 0, 'db_fallbacks': 0, 'invalidations': 0,
+                         'claims_hits': 0, 'stale_claims': 0}
+
+    @staticmethod
+    def _shared():
+        alias = _config('SHARED_CACHE')
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _shared_key(user_id):
+        return f'auth-user:{user_id}'
+
+    def get(self, user_id):
+        """Return a private copy of the cached user, or None"""
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    # Views may modify request.user, never hand out the cached instance
+                    return copy.copy(user)
+                del self._entries[key]
+
+        shared = self._shared()
+        user = shared.get(self._shared_key(key)) if shared else None
+        if user is not None:
+            self._store(key, user)
+            self.count('shared_hits')
+            return copy.copy(user)
+        return None
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _store(self, key, user, entries=None):
+        entries = self._entries if entries is None else entries
+        with self._lock:
+            entries[key] = (user, time.monotonic() + _config('TTL'))
+            entries.move_to_end(key)
+            while len(entries) > _config('MAX_SIZE'):
+                entries.popitem(last=False)
+
+    def set(self, user):
+        key = str(user.pk)
+        cached = copy.copy(user)
+        self._store(key, cached)
+        shared = self._shared()
+        if shared:
+            shared.set(self._shared_key(key), cached, _config('TTL'))
+
+    def invalidate(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self.counters['invalidations'] += 1
+        shared = self._shared()
+        if shared:
+            shared.delete(self._shared_key(key))
+
+    def get_version(self, user_id):
+        """Locally cached claims version of a user, or None"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._versions.get(key)
+            if entry is not None:
+                version, expires = entry
+                if expires > time.monotonic():
+                    self._versions.move_to_end(key)
+                    return version
+                del self._versions[key]
+        return None
+
+    def set_version(self, user_id, version):
+        self._store(str(user_id), version, self._versions)
+
+    def forget_versions(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._versions.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            for name in self.counters:
+                self.counters[name] = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, size=len(self._entries))
+
+
+user_cache = UserCache()
+
+
+# Cache backends that only live inside one process
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register(checks.Tags.security)
+def check_shared_cache(app_configs, **kwargs):
+    alias = _config('SHARED_CACHE')
+    if alias and settings.CACHES.get(alias, {}).get('BACKEND') in LOCAL_CACHE_BACKENDS:
+        return [checks.Warning(
+            f"AUTH_USER_CACHE['SHARED_CACHE'] is {alias!r}, a per-process cache backend.",
+            hint='Claims revoked in one worker stay valid in the others for up to the TTL. '
+                 'Point it at a cache every worker shares (Redis, Memcached, database).',
+            id='api.W001',
+        )]
+    return []
+
+
+def _version_cache():
+    """The shared cache claims versions live in, None to keep them in user_cache"""
+    alias = _config('SHARED_CACHE')
+    return caches[alias] if alias else None
+
+
+def _version_key(user_id):
+    return f'auth-claims-version:{user_id}'
+
+
+def claims_version(user_id):
+    """Current claims version of a user, 0 when the user is inactive or gone"""
+    cache = _version_cache()
+    if cache:
+        version = cache.get(_version_key(user_id))
+    else:
+        version = user_cache.get_version(user_id)
+    if version is None:
+        version = User.objects.filter(pk=user_id, is_active=True).values_list(
+            'claims_version', flat=True
+        ).first() or 0
+        if cache:
+            cache.set(_version_key(user_id), version, _config('TTL'))
+        else:
+            user_cache.set_version(user_id, version)
+    return version
+
+
+def forget_claims_versions(user_ids):
+    user_ids = list(user_ids)
+    user_cache.forget_versions(user_ids)
+    cache = _version_cache()
+    if cache:
+        cache.delete_many([_version_key(pk) for pk in user_ids])
+
+
+def bump_claims_version(user_ids):
+    """Make the claims in every token issued to these users stale"""
+    user_ids = list(user_ids)
+    if user_ids:
+        User.objects.filter(pk__in=user_ids).update(claims_version=F('claims_version') + 1)
+        forget_claims_versions(user_ids)
+
+
+@receiver(pre_save, sender=User)
+def detect_claim_changes(sender, instance, update_fields=None, **kwargs):
+    instance._claims_changed = False
+    if instance._state.adding or (update_fields is not None and not set(update_fields) & set(CLAIMED_FIELDS)):
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*CLAIMED_FIELDS).first()
+    instance._claims_changed = bool(previous) and any(
+        previous[field] != getattr(instance, field) for field in CLAIMED_FIELDS
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    if instance.__dict__.pop('_claims_changed', False):
+        bump_claims_version([instance.pk])
+        instance.refresh_from_db(fields=['claims_version'])
+    forget_claims_versions([instance.pk])
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # user.projects.add(...) and friends
+        bump_claims_version([instance.pk])
+    elif action == 'pre_clear':
+        bump_claims_version(instance.team_members.values_list('id', flat=True))
+    else:
+        bump_claims_version(pk_set)
+
+
+class ClaimsUser(TokenUser):
+    """Stateless user authorized from a token's signed claims.
+
+    `role`, `name` and `email` come from the token like any other custom
+    claim. `project_ids` is None when the token carries no project claim.
+    """
+
+    @cached_property
+    def id(self):
+        return uuid.UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def project_ids(self):
+        project_ids = self.token.get(PROJECTS_CLAIM)
+        return None if project_ids is None else frozenset(uuid.UUID(pk) for pk in project_ids)
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves users through user_cache, or from
+    the token's claims on read requests to views that allow it"""
+
+    def authenticate(self, request):
+        view = (request.parser_context or {}).get('view')
+        if request.method not in SAFE_METHODS or not getattr(view, 'claims_authorization', False):
+            return super().authenticate(request)
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_claims_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        """ClaimsUser when the token's claims are current, the stored user otherwise"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Claims are honoured until the version changes, which every worker
+        # sees at once through a shared cache, or within the TTL without one
+        version = validated_token.get(CLAIMS_VERSION_CLAIM)
+        if version is not None and version == claims_version(user_id):
+            user_cache.count('claims_hits')
+            return ClaimsUser(validated_token)
+        user_cache.count('stale_claims')
+        return self.get_user(validated_token)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user_cache.count('db_fallbacks')
+            user = super().get_user(validated_token)
+            user_cache.set(user)
+            return user
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        # Same checks simplejwt makes on a freshly loaded user
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for plain async views: (user, token) or None.
+
+        Token checks are CPU-only; a cache miss loads the user with the
+        async ORM instead of blocking the event loop.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # A shared cache backend may block on I/O, the local LRU does not
+        shared = bool(_config('SHARED_CACHE'))
+        user = await sync_to_async(user_cache.get)(user_id) if shared else user_cache.get(user_id)
+        if user is None:
+            user_cache.count('db_fallbacks')
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user = self.check_user(user, validated_token)
+            if shared:
+                await sync_to_async(user_cache.set)(user)
+            else:
+                user_cache.set(user)
+        else:
+            user = self.check_user(user, validated_token)
+        return user, validated_token
@@ -0,0 +1,85 @@
+"""
+Per-connection database tuning and connection counters.
+
+Connections are persistent (CONN_MAX_AGE with CONN_HEALTH_CHECKS in
+settings), so the setup below runs once per new connection, not once per
+request:
+
+- SQLite gets synchronous=NORMAL, a busy timeout and memory-mapped reads
+  (DB_TUNING['SQLITE_PRAGMAS']), and WAL journaling when
+  DB_TUNING['SQLITE_JOURNAL_MODE'] asks for it. The journal mode is written
+  into the database file and outlives the connection, so it is opt-in:
+  the development db.sqlite3 is tracked in git and any manage.py command
+  would otherwise convert it.
+- MySQL gets a session statement timeout for SELECTs
+  (DB_TUNING['MYSQL_STATEMENT_TIMEOUT_MS']).
+
+The counters tell how many connections each alias opened and how many
+requests started on an already open one.
+"""
+import threading
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+DEFAULTS = {
+    'SQLITE_JOURNAL_MODE': None,  # e.g. 'WAL'; None leaves the file's mode alone
+    'SQLITE_PRAGMAS': {
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+    },
+    'MYSQL_STATEMENT_TIMEOUT_MS': 30000,
+}
+
+_lock = threading.Lock()
+_counters = {}
+
+
+def _config(name):
+    return getattr(settings, 'DB_TUNING', {}).get(name, DEFAULTS[name])
+
+
+def _count(alias, name):
+    with _lock:
+        counters = _counters.setdefault(alias, {'opened': 0, 'reused': 0})
+        counters[name] += 1
+
+
+def connection_stats():
+    """Opened / reused connection counts per database alias in this process"""
+    with _lock:
+        return {alias: dict(counters) for alias, counters in _counters.items()}
+
+
+def reset_connection_stats():
+    with _lock:
+        _counters.clear()
+
+
+@receiver(connection_created)
+def tune_connection(sender, connection, **kwargs):
+    _count(connection.alias, 'opened')
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            journal_mode = _config('SQLITE_JOURNAL_MODE')
+            if journal_mode:
+                cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+            for pragma, value in _config('SQLITE_PRAGMAS').items():
+                cursor.execute(f'PRAGMA {pragma} = {value}')
+        elif connection.vendor == 'mysql':
+            timeout = int(_config('MYSQL_STATEMENT_TIMEOUT_MS'))
+            if timeout:
+                cursor.execute(f'SET SESSION max_execution_time = {timeout}')
+
+
+@receiver(request_started)
+def count_reused_connections(sender, **kwargs):
+    # Runs after Django's close_old_connections, so whatever is still open
+    # here will serve this request
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            _count(connection.alias, 'reused')
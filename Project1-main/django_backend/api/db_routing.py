@@ -0,0 +1,291 @@
+"""
+Read-replica routing for report queries.
+
+Views decorated with @replica_reads (analytics, time summary, timesheets)
+read from the `replica` database alias when one is configured; every
+other query, and every write, stays on `default`. The replica is skipped,
+and the view reads from the primary, when:
+
+- the request asks for it with `X-Read-Consistency: primary` (or
+  `?consistency=primary`); `replica` instead skips the write check below,
+- the acting user wrote something in the last READ_YOUR_WRITES seconds,
+  so they always see their own changes,
+- the replica lags the primary by more than MAX_LAG seconds.
+
+The write pin has to reach whichever worker serves the next request, so
+it is not kept in process memory. ReadYourWritesMiddleware stores it per
+user in REPLICA_ROUTING['SHARED_CACHE'] (the 'default' cache unless set),
+which must be a cache all workers share; the api.W002 system check warns
+when a replica is configured and it is not. It also sets the pin as a
+signed, expiring cookie on the write response, for clients that send
+cookies back.
+
+Lag is measured from the newest ChangeLog row on each side, checked at
+most every LAG_CHECK_INTERVAL seconds per process, so it works the same
+for a MySQL replica and for a periodically refreshed SQLite snapshot
+(see the snapshot_replica command).
+
+Separately, the high-write event tables (ActivityLog, Notification,
+TaskTimer) live in the `events` database when that alias is configured,
+so timer and notification writes do not queue behind task edits for the
+same write lock. Their references to users, tasks and projects are plain
+id columns; filter them with id_subquery() rather than joins.
+"""
+import contextvars
+import threading
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DatabaseError, router
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA = 'replica'
+EVENTS = 'events'
+EVENT_MODELS = {'activitylog', 'notification', 'tasktimer'}
+
+DEFAULTS = {
+    'MAX_LAG': 30,              # seconds the replica may trail the primary
+    'LAG_CHECK_INTERVAL': 5,    # seconds a lag measurement is reused
+    'READ_YOUR_WRITES': 60,     # seconds a user reads from the primary after writing
+    'SHARED_CACHE': 'default',  # CACHES alias all workers share, holds write pins
+}
+
+PIN_COOKIE = 'db_write_pin'
+PIN_SALT = 'api.db_routing.write-pin'
+
+_read_alias = contextvars.ContextVar('db_read_alias', default=None)
+_lag_lock = threading.Lock()
+_lag = {'value': None, 'checked': 0.0}
+
+
+def _config(name):
+    return getattr(settings, 'REPLICA_ROUTING', {}).get(name, DEFAULTS[name])
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def _write_key(user_id):
+    return f'db-last-write:{user_id}'
+
+
+def _pin_alias():
+    return _config('SHARED_CACHE') or DEFAULTS['SHARED_CACHE']
+
+
+def _pin_cache():
+    return caches[_pin_alias()]
+
+
+@checks.register(checks.Tags.database)
+def check_pin_cache(app_configs, **kwargs):
+    from .authentication import LOCAL_CACHE_BACKENDS
+
+    alias = _pin_alias()
+    if replica_configured() and settings.CACHES.get(alias, {}).get('BACKEND') in LOCAL_CACHE_BACKENDS:
+        return [checks.Warning(
+            f"A replica is configured but REPLICA_ROUTING['SHARED_CACHE'] ({alias!r}) is a per-process cache.",
+            hint='Users whose next request reaches another worker may read reports from the replica '
+                 'right after writing. Point it at a cache every worker shares (Redis, Memcached, database).',
+            id='api.W002',
+        )]
+    return []
+
+
+def mark_write(user_id, response=None):
+    """Pin the user's report reads to the primary for READ_YOUR_WRITES seconds"""
+    ttl = _config('READ_YOUR_WRITES')
+    if response is not None:
+        response.set_signed_cookie(PIN_COOKIE, str(user_id), salt=PIN_SALT, max_age=ttl,
+                                   httponly=True, samesite='Lax')
+    _pin_cache().set(_write_key(user_id), True, ttl)
+
+
+def wrote_recently(user_id, request=None):
+    if request is not None:
+        # The signature is timestamped, so an old cookie replayed after max_age does not count
+        pinned = request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_SALT,
+                                           max_age=_config('READ_YOUR_WRITES'))
+        if pinned == str(user_id):
+            return True
+    return _pin_cache().get(_write_key(user_id)) is not None
+
+
+def _latest_change(alias):
+    from .models import ChangeLog
+
+    return ChangeLog.objects.using(alias).order_by('-id').values_list('id', 'created_at').first()
+
+
+def replica_lag():
+    """Seconds the replica trails the primary, None when it cannot be reached"""
+    now = time.monotonic()
+    with _lag_lock:
+        if now - _lag['checked'] < _config('LAG_CHECK_INTERVAL'):
+            return _lag['value']
+
+    try:
+        primary = _latest_change('default')
+        replica = _latest_change(REPLICA)
+    except DatabaseError:
+        lag = None
+    else:
+        if primary is None or (replica is not None and replica[0] >= primary[0]):
+            lag = 0.0
+        elif replica is None:
+            lag = float('inf')
+        else:
+            lag = (primary[1] - replica[1]).total_seconds()
+
+    with _lag_lock:
+        _lag.update(value=lag, checked=now)
+    return lag
+
+
+def reset_replica_lag():
+    with _lag_lock:
+        _lag.update(value=None, checked=0.0)
+
+
+def choose_read_alias(request):
+    """Alias report queries of this request should read from, None for the primary"""
+    if not replica_configured():
+        return None
+
+    consistency = request.headers.get('X-Read-Consistency') or request.GET.get('consistency')
+    if consistency == 'primary':
+        return None
+    if consistency != 'replica' and request.user.is_authenticated and wrote_recently(request.user.pk, request):
+        return None
+
+    lag = replica_lag()
+    if lag is None or lag > _config('MAX_LAG'):
+        return None
+    return REPLICA
+
+
+def replica_reads(view):
+    """Run a read-only function view's queries on the replica when it is safe to.
+
+    Goes below @api_view so request.user is already authenticated.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _read_alias.set(choose_read_alias(request))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send reads inside @replica_reads views to the replica, everything else to default"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes from the primary
+        return False if db == REPLICA else None
+
+
+def events_configured():
+    return EVENTS in settings.DATABASES
+
+
+def is_event_model(app_label, model_name):
+    return app_label == 'api' and model_name in EVENT_MODELS
+
+
+def id_subquery(queryset, model):
+    """Ids from `queryset` for an `id__in` filter on `model`.
+
+    Stays a subquery when both tables are in the same database and is
+    evaluated to a list when they are not, since a query cannot join
+    across databases.
+    """
+    queryset = queryset.values_list('pk', flat=True)
+    if router.db_for_read(model) == queryset.db:
+        return queryset
+    return list(queryset)
+
+
+async def aid_subquery(queryset, model):
+    """id_subquery() for async views"""
+    queryset = queryset.values_list('pk', flat=True)
+    if router.db_for_read(model) == queryset.db:
+        return queryset
+    return [pk async for pk in queryset]
+
+
+class EventsRouter:
+    """Keep the event tables in the events database when one is configured"""
+
+    def _route(self, model):
+        if events_configured() and is_event_model(model._meta.app_label, model._meta.model_name):
+            return EVENTS
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._route(model)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not events_configured():
+            return None
+        if db == EVENTS:
+            return is_event_model(app_label, model_name)
+        if is_event_model(app_label, model_name):
+            return False
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """Remember which users just wrote, so their reports come from the primary.
+
+    Works in sync and async stacks, so async views under ASGI are not
+    pushed onto a thread by this middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.record_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            await sync_to_async(self.record_write)(request, response)
+        return response
+
+    def record_write(self, request, response):
+        # DRF copies the user it authenticated onto the Django request
+        user = getattr(request, 'user', None)
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and user is not None and user.is_authenticated and replica_configured()):
+            mark_write(user.pk, response)
@@ -0,0 +1,31 @@
+"""
+Clean-up for the event tables (ActivityLog, Notification, TaskTimer).
+
+Their user/task/project references are plain id columns rather than
+foreign keys, because the tables may live in the events database (see
+api.db_routing), so the database no longer cascades deletes to them.
+The handlers below do it instead. When the events database is separate
+the clean-up runs in its own transaction on that database.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import User, Project, Task, ActivityLog, Notification, TaskTimer
+
+
+@receiver(post_delete, sender=User)
+def delete_user_events(sender, instance, **kwargs):
+    ActivityLog.objects.filter(user_id=instance.pk).delete()
+    Notification.objects.filter(user_id=instance.pk).delete()
+    TaskTimer.objects.filter(user_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Task)
+def delete_task_events(sender, instance, **kwargs):
+    ActivityLog.objects.filter(task_id=instance.pk).delete()
+    TaskTimer.objects.filter(task_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Project)
+def delete_project_events(sender, instance, **kwargs):
+    ActivityLog.objects.filter(project_id=instance.pk).delete()
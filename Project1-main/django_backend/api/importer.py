@@ -0,0 +1,220 @@
+"""
+Bulk import of tasks and time entries from CSV or NDJSON files.
+
+Used by POST /api/imports/<kind>/ and `manage.py import_tasks`. Rows are
+read lazily, validated in batches, every reference in a batch (user emails,
+project titles, task ids) is resolved with one query per model, and the
+valid rows are inserted with bulk_create in one transaction per batch.
+Invalid rows are skipped and reported by row number. A file that cannot be
+read at all (bad UTF-8, a CSV field over csv.field_size_limit()) stops the
+import at that row.
+"""
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import User, Project, Task, TimeEntry, ChangeLog, TaskStatusTransition
+from .ranking import assign_bottom_ranks
+from .renderers import orjson
+from .serializers_bulk import TaskImportRowSerializer, TimeEntryImportRowSerializer
+from .views_bulk import writable_project_ids
+from .views_calendar import visible_tasks
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+class UnreadableFile(ValueError):
+    """The rows of an import file cannot be decoded or parsed past some point"""
+
+
+def read_rows(stream, fmt):
+    """Yield one dict per record of a binary CSV or NDJSON stream.
+
+    Lines that are not a JSON object are yielded as None so they can be
+    reported against their row number. Raises UnreadableFile when the CSV
+    is not UTF-8 or cannot be parsed, as no later row can be trusted.
+    """
+    if fmt == 'csv':
+        try:
+            yield from csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        except UnicodeDecodeError:
+            raise UnreadableFile('The file is not valid UTF-8')
+        except csv.Error as exc:
+            raise UnreadableFile(f'The file is not valid CSV: {exc}')
+        return
+
+    loads = orjson.loads if orjson else json.loads
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def _resolve_tasks(user, rows):
+    """Turn validated task rows into unsaved Task objects, or per-row errors"""
+    titles = {data['project'] for _, data in rows if data.get('project')}
+    emails = {data['assigned_to'] for _, data in rows if data.get('assigned_to')}
+
+    projects = {}
+    for title, project_id in Project.objects.filter(title__in=titles).values_list('title', 'id'):
+        projects.setdefault(title, []).append(project_id)
+    writable = writable_project_ids(user, {pk for ids in projects.values() for pk in ids})
+    users = dict(User.objects.filter(email__in=emails, is_active=True).values_list('email', 'id'))
+
+    created, errors = [], []
+    for number, data in rows:
+        row_errors = {}
+        title = data.pop('project', None)
+        email = data.pop('assigned_to', None)
+
+        if title:
+            matches = projects.get(title, [])
+            if len(matches) > 1:
+                row_errors['project'] = 'More than one project has this title'
+            elif not matches or matches[0] not in writable:
+                row_errors['project'] = 'Project not found or you are not a member of it'
+            else:
+                data['project_id'] = matches[0]
+        if email:
+            if email in users:
+                data['assigned_to_id'] = users[email]
+            else:
+                row_errors['assigned_to'] = 'User not found'
+
+        if row_errors:
+            errors.append((number, row_errors))
+        else:
+            created.append(Task(created_by=user, **data))
+    return created, errors
+
+
+def _resolve_time_entries(user, rows):
+    """Turn validated time entry rows into unsaved TimeEntry objects, or per-row errors"""
+    is_scrum_master = user.role == 'SCRUM_MASTER'
+    task_ids = {data['task_id'] for _, data in rows}
+    emails = {data['user'] for _, data in rows if data.get('user')}
+
+    tasks = Task.objects if is_scrum_master else visible_tasks(user)
+    tasks = set(tasks.filter(id__in=task_ids).values_list('id', flat=True))
+    users = dict(User.objects.filter(email__in=emails, is_active=True).values_list('email', 'id'))
+
+    created, errors = [], []
+    for number, data in rows:
+        row_errors = {}
+        email = data.pop('user', None)
+
+        if data['task_id'] not in tasks:
+            row_errors['task_id'] = 'Task not found'
+        if not email or email == user.email:
+            data['user_id'] = user.id
+        elif not is_scrum_master:
+            row_errors['user'] = 'You can only import your own time entries'
+        elif email not in users:
+            row_errors['user'] = 'User not found'
+        else:
+            data['user_id'] = users[email]
+
+        if row_errors:
+            errors.append((number, row_errors))
+            continue
+
+        # bulk_create skips TimeEntry.save(), so derive the duration here
+        if data.get('end_time'):
+            data['duration_hours'] = (data['end_time'] - data['start_time']).total_seconds() / 3600
+        created.append(TimeEntry(**data))
+    return created, errors
+
+
+IMPORTERS = {
+    'tasks': (TaskImportRowSerializer, _resolve_tasks),
+    'time-entries': (TimeEntryImportRowSerializer, _resolve_time_entries),
+}
+
+
+def _import_batch(kind, user, batch, report, dry_run):
+    serializer_class, resolve = IMPORTERS[kind]
+
+    # One serializer validates the whole batch, so its fields are built once
+    serializer = serializer_class()
+    valid, errors = [], []
+    for number, raw in batch:
+        if raw is None:
+            errors.append((number, {'row': 'Each line must be a JSON object'}))
+            continue
+        # Empty CSV cells mean "not given"
+        data = {key.strip(): value for key, value in raw.items()
+                if key and value is not None and value != ''}
+        try:
+            valid.append((number, dict(serializer.run_validation(data))))
+        except ValidationError as exc:
+            errors.append((number, exc.detail))
+
+    objects, resolve_errors = resolve(user, valid) if valid else ([], [])
+    errors += resolve_errors
+
+    if objects and not dry_run:
+        model = objects[0].__class__
+        with transaction.atomic():
+            if model is Task:
+                assign_bottom_ranks(objects)
+                now = timezone.now()
+                for task in objects:
+                    task.sync_completed_at(now)
+            model.objects.bulk_create(objects)
+            ChangeLog.record(kind.replace('-', '_'), [obj.id for obj in objects])
+            if model is Task:
+                TaskStatusTransition.record(
+                    [(task.id, None, task.status) for task in objects], user_id=user.pk, at=now
+                )
+
+    report['created'] += len(objects)
+    report['failed'] += len(errors)
+    for number, row_errors in sorted(errors, key=lambda error: error[0]):
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'errors': row_errors})
+
+
+def import_rows(kind, rows, user, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Import an iterable of row dicts as `kind` ('tasks' or 'time-entries') on behalf of user.
+
+    Returns a report with the number of rows read, created and rejected and
+    the errors of the first MAX_REPORTED_ERRORS rejected rows (row numbers
+    are 1-based data rows, not counting a CSV header). With dry_run the rows
+    are validated and resolved but nothing is written.
+
+    If reading the rows raises UnreadableFile the import stops: the rows of
+    the unfinished batch are dropped, batches already written stay, and the
+    report gets a 'file_error' with the row number where reading failed.
+    """
+    report = {'kind': kind, 'total': 0, 'created': 0, 'failed': 0, 'dry_run': dry_run, 'errors': []}
+
+    batch = []
+    try:
+        for number, raw in enumerate(rows, 1):
+            batch.append((number, raw))
+            if len(batch) == batch_size:
+                _import_batch(kind, user, batch, report, dry_run)
+                batch = []
+            report['total'] = number
+    except UnreadableFile as exc:
+        report['file_error'] = {'row': report['total'] + 1, 'detail': str(exc)}
+        return report
+    if batch:
+        _import_batch(kind, user, batch, report, dry_run)
+    return report
@@ -0,0 +1,115 @@
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, router, transaction
+from django.utils import timezone
+import statistics
+import threading
+import time
+import uuid
+
+from api.models import User, Project, Task, TaskTimer, ActivityLog, Notification
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class Command(BaseCommand):
+    help = ('Measure write throughput with concurrent timer/notification writers and task editors. '
+            'Run once with and once without an events database (EVENTS_DB_PATH) to compare.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5, help='Length of the run')
+        parser.add_argument('--timer-workers', type=int, default=4,
+                            help='Threads starting/stopping timers and writing notifications')
+        parser.add_argument('--editors', type=int, default=2, help='Threads editing tasks')
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f'bench-contention-{tag}',
+            email=f'bench-contention-{tag}@example.com',
+            password=uuid.uuid4().hex,
+            name='Contention benchmark',
+            role='EMPLOYEE',
+        )
+        project = Project.objects.create(title=f'Contention {tag}', created_by=user)
+        workers = options['timer_workers'] + options['editors']
+        tasks = [
+            Task.objects.create(title=f'Contention task {i}', project=project, created_by=user, assigned_to=user)
+            for i in range(workers)
+        ]
+
+        for model in (Task, TaskTimer, ActivityLog, Notification):
+            self.stdout.write(f'{model.__name__}: {router.db_for_write(model)}')
+
+        results = {'events': [], 'edits': []}
+        errors = {'events': 0, 'edits': 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def record(kind, started):
+            with lock:
+                results[kind].append((time.perf_counter() - started) * 1000)
+
+        def fail(kind):
+            with lock:
+                errors[kind] += 1
+
+        def timer_worker(task):
+            # One timer start + stop, with their activity rows and a notification
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    timer = TaskTimer.objects.create(task=task, user=user, start_time=timezone.now())
+                    ActivityLog.objects.create(user=user, task=task, action='created', description='Started timer')
+                    timer.end_time = timezone.now()
+                    timer.save()
+                    ActivityLog.objects.create(user=user, task=task, action='updated', description='Stopped timer')
+                    Notification.objects.create(user=user, title='Timer stopped', message=task.title,
+                                                notification_type='task_due')
+                except OperationalError:
+                    fail('events')
+                else:
+                    record('events', started)
+
+        def editor(task):
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with transaction.atomic():
+                        task.description = uuid.uuid4().hex
+                        task.save()
+                except OperationalError:
+                    fail('edits')
+                else:
+                    record('edits', started)
+
+        def run(target, task):
+            try:
+                target(task)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=run, args=(timer_worker if i < options['timer_workers'] else editor, task))
+            for i, task in enumerate(tasks)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        for kind, label, writes in (('events', 'timer cycles', 5), ('edits', 'task edits', 1)):
+            samples = results[kind]
+            rate = len(samples) / options['seconds']
+            self.stdout.write(
+                f'{label}: {len(samples)} ({rate:.1f}/s, {rate * writes:.1f} writes/s) | '
+                f'p50 {statistics.median(samples) if samples else 0:.1f} ms | '
+                f'p99 {percentile(samples, 0.99):.1f} ms | lock errors {errors[kind]}'
+            )
+
+        # Removes the tasks and project, and through api.events the event rows
+        user.delete()
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+import time
+
+from api.models import User
+from api.renderers import FastJSONRenderer, orjson
+from api.views import TaskListCreateView, ActivityLogListView
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON rendering time of the stdlib and orjson renderers on list endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help='User to render the lists for (default: first Scrum Master)')
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per renderer')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; FastJSONRenderer would use the stdlib')
+
+        users = User.objects.filter(is_active=True)
+        if options['email']:
+            user = users.filter(email=options['email']).first()
+        else:
+            user = users.filter(role='SCRUM_MASTER').first() or users.first()
+        if user is None:
+            raise CommandError('No matching user found')
+
+        factory = APIRequestFactory()
+        endpoints = [
+            ('tasks', TaskListCreateView, '/api/tasks/'),
+            ('activity-logs', ActivityLogListView, '/api/activity-logs/'),
+        ]
+
+        for name, view_class, path in endpoints:
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            # Render the whole list rather than one 20-row page
+            view = view_class.as_view(pagination_class=None)
+            data = view(request).data
+
+            timings = {}
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                start = time.perf_counter()
+                for _ in range(options['iterations']):
+                    body = renderer.render(data)
+                timings[type(renderer).__name__] = (time.perf_counter() - start) / options['iterations']
+
+            stdlib = timings['JSONRenderer'] * 1000
+            fast = timings['FastJSONRenderer'] * 1000
+            self.stdout.write(
+                f'{name}: {len(data)} rows, {len(body)} bytes | '
+                f'JSONRenderer {stdlib:.3f} ms | FastJSONRenderer {fast:.3f} ms | '
+                f'{stdlib / fast if fast else 0:.1f}x faster'
+            )
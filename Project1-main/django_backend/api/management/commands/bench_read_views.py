@@ -0,0 +1,113 @@
+"""
+Throughput of the read-heavy endpoints against a running server.
+
+Run it once per deployment and compare, for example:
+
+    gunicorn taskflow_api.wsgi -w 1 --threads 32
+    python manage.py bench_read_views --label wsgi-threads --output bench.json
+
+    ASYNC_READ_VIEWS=true uvicorn taskflow_api.asgi:application --workers 1
+    python manage.py bench_read_views --label asgi-async --output bench.json
+
+The token is minted from this project's settings and database, so run
+the command against a server that shares them.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+import json
+import os
+import statistics
+import time
+import urllib.error
+import urllib.request
+
+from api.auth import add_claims
+from api.models import User
+
+ENDPOINTS = [
+    'auth/me/',
+    'dashboard/stats/',
+    'time-entries/active-timer/',
+    'notifications/summary/',
+    'activity-logs/recent/',
+]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class Command(BaseCommand):
+    help = 'Measure requests/s and latency of the read-heavy endpoints on a running WSGI or ASGI server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000/api')
+        parser.add_argument('--email', help='User to authenticate as (default: first active employee)')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint')
+        parser.add_argument('--label', default='run', help='Name of this deployment in the output')
+        parser.add_argument('--output', help='JSON file collecting results of several runs by label')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['email']:
+            user = users.filter(email=options['email']).first()
+        else:
+            user = users.filter(role='EMPLOYEE').first() or users.first()
+        if user is None:
+            raise CommandError('No matching user found')
+        token = add_claims(RefreshToken.for_user(user), user).access_token
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def fetch(url):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                return None
+            return (time.perf_counter() - started) * 1000
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for endpoint in ENDPOINTS:
+                url = f"{options['base_url'].rstrip('/')}/{endpoint}"
+                if fetch(url) is None:
+                    raise CommandError(f'{url} is not answering')
+
+                started = time.perf_counter()
+                latencies = list(pool.map(fetch, [url] * options['requests']))
+                elapsed = time.perf_counter() - started
+
+                samples = [latency for latency in latencies if latency is not None]
+                results[endpoint] = {
+                    'requests_per_second': round(len(samples) / elapsed, 1),
+                    'p50_ms': round(statistics.median(samples), 1) if samples else None,
+                    'p99_ms': round(percentile(samples, 0.99), 1),
+                    'errors': len(latencies) - len(samples),
+                }
+                self.stdout.write(
+                    f"{options['label']} {endpoint}: {results[endpoint]['requests_per_second']} req/s | "
+                    f"p50 {results[endpoint]['p50_ms']} ms | p99 {results[endpoint]['p99_ms']} ms | "
+                    f"errors {results[endpoint]['errors']}"
+                )
+
+        if options['output']:
+            runs = {}
+            if os.path.exists(options['output']):
+                with open(options['output']) as f:
+                    runs = json.load(f)
+            runs[options['label']] = results
+            with open(options['output'], 'w') as f:
+                json.dump(runs, f, indent=2)
+
+            # Requests/s of every recorded deployment, relative to the first
+            for endpoint in ENDPOINTS:
+                rates = {label: run.get(endpoint, {}).get('requests_per_second', 0) for label, run in runs.items()}
+                base = next(iter(rates.values()))
+                self.stdout.write(f'{endpoint}: ' + ' | '.join(
+                    f'{label} {rate} req/s' + (f' ({rate / base:.2f}x)' if base else '')
+                    for label, rate in rates.items()
+                ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh-token JTIs whose tokens have expired'
+
+    def handle(self, *args, **options):
+        deleted = revocation_store.compact()
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired revoked tokens'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Attachment
+from api.previews import can_preview, has_preview, render_preview
+
+
+class Command(BaseCommand):
+    help = 'Render missing attachment previews (e.g. after enabling Pillow or PyMuPDF)'
+
+    def handle(self, *args, **options):
+        rendered = failed = 0
+        blobs = (
+            Attachment.objects.exclude(content_hash='')
+            .order_by().values_list('content_hash', 'file_type').distinct()
+        )
+        for content_hash, file_type in blobs:
+            if not can_preview(file_type) or has_preview(content_hash):
+                continue
+            try:
+                render_preview(content_hash, file_type)
+                rendered += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'{content_hash}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} previews ({failed} failed)'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+
+from api.importer import IMPORTERS, IMPORT_FORMATS, IMPORT_BATCH_SIZE, import_rows, read_rows
+from api.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import tasks (or time entries) from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv, .ndjson or .jsonl file to import')
+        parser.add_argument('--as', dest='email', required=True,
+                            help='Email of the user the rows are imported for (becomes created_by)')
+        parser.add_argument('--kind', choices=sorted(IMPORTERS), default='tasks')
+        parser.add_argument('--format', dest='fmt', choices=sorted(set(IMPORT_FORMATS.values())),
+                            help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate without writing')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['email']}")
+
+        fmt = options['fmt'] or IMPORT_FORMATS.get(os.path.splitext(options['path'])[1].lower())
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name, pass --format')
+
+        with open(options['path'], 'rb') as stream:
+            report = import_rows(options['kind'], read_rows(stream, fmt), user,
+                                 batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        if 'file_error' in report:
+            raise CommandError(f"row {report['file_error']['row']}: {report['file_error']['detail']} "
+                               f"({report['created']} rows were imported before it)")
+        verb = 'Validated' if report['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} of {report['total']} rows ({report['failed']} rejected)"
+        ))
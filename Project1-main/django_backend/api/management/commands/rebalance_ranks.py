@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Length
+from api.models import Task
+from api.ranking import rebalance_column, REBALANCE_LENGTH
+
+
+class Command(BaseCommand):
+    help = 'Renumber Kanban card ranks in columns whose keys have grown too long'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Rebalance every column, not only the ones with long keys')
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.order_by()
+        if not options['all']:
+            tasks = tasks.annotate(rank_length=Length('rank')).filter(rank_length__gt=REBALANCE_LENGTH)
+
+        columns = tasks.values_list('project_id', 'status').distinct()
+        for project_id, status in columns:
+            count = rebalance_column(project_id, status)
+            self.stdout.write(f'Rebalanced {count} cards in project {project_id} / {status}')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {len(columns)} column(s)'))
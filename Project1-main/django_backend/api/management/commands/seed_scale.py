@@ -0,0 +1,361 @@
+"""
+Synthetic data at load-testing scale.
+
+The defaults write about 50k rows. Roughly 10M rows:
+
+    python manage.py seed_scale --users 20000 --projects 5000 --tasks-per-project 200 \\
+        --comments 2000000 --time-entries 3000000 --timers 1000000 \\
+        --notifications 1000000 --activity-logs 2000000
+
+The same --seed gives the same rows, ids included, with timestamps
+counted back from the start of the current day. Distributions are
+skewed the way real workspaces are: team sizes and tasks per project are
+long-tailed, a few users and tasks draw most comments, assignments and
+notifications, older tasks are more likely done, and time entries and
+timers are mostly short with a long tail of multi-hour sessions.
+
+Rows are generated as tuples one chunk at a time and each chunk is
+written by passing a single-row INSERT ... VALUES statement to the
+cursor's executemany(), in its own transaction, on the database the
+router picks for each model (so event tables land in the events database
+when one is configured). bulk_create would write the same rows, but its
+per-value SQL compilation caps it at a few thousand rows a second.
+Nothing here goes through save() or signals: ranks, durations, status
+histories and timestamps are filled in by the generator, and seeded rows
+are not added to the sync change log. Seeded users share the password "password123".
+"""
+from datetime import timedelta
+from functools import partial
+import bisect
+import itertools
+import math
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from api.models import (
+    User, Project, Task, TaskStatusTransition, TimeEntry, Comment, Notification, ActivityLog, TaskTimer
+)
+from api.ranking import spread_ranks
+
+FIRST_NAMES = ['Alex', 'Sam', 'Priya', 'Chen', 'Maria', 'Omar', 'Lena', 'Kenji', 'Ana', 'Noah',
+               'Fatima', 'Ivan', 'Grace', 'Luis', 'Aisha', 'Tom', 'Mei', 'Ravi', 'Sara', 'Jonas']
+LAST_NAMES = ['Smith', 'Patel', 'Garcia', 'Kim', 'Nguyen', 'Muller', 'Rossi', 'Silva', 'Khan', 'Ito',
+              'Brown', 'Novak', 'Haddad', 'Jensen', 'Okafor', 'Lopez', 'Wang', 'Dubois', 'Singh', 'Cohen']
+TASK_WORDS = ['Implement', 'Fix', 'Review', 'Design', 'Refactor', 'Document', 'Test', 'Migrate', 'Profile', 'Ship']
+TASK_OBJECTS = ['login flow', 'dashboard', 'export', 'billing page', 'search', 'notifications', 'API client',
+                'onboarding', 'reports', 'settings', 'Kanban board', 'timesheets']
+
+PROJECT_STATUSES = (['active', 'planning', 'completed', 'paused'], [60, 15, 15, 10])
+OPEN_STATUSES = (['todo', 'in_progress', 'review'], [50, 35, 15])
+PRIORITIES = (['low', 'medium', 'high', 'urgent'], [25, 45, 22, 8])
+NOTIFICATION_TYPES = (['task_assigned', 'task_due', 'project_update', 'comment_added'], [40, 25, 10, 25])
+ACTIONS = (['created', 'updated', 'assigned', 'status_changed', 'commented', 'attached_file'],
+           [15, 30, 15, 25, 12, 3])
+
+
+def _same(value):
+    return value
+
+
+def fast_prep(field, connection):
+    """A cheaper stand-in for field.get_db_prep_save for the values generated here.
+
+    Only a guess from the backend's features; insert() checks it against
+    get_db_prep_save on the first row and falls back when they differ.
+    """
+    target = field.target_field if field.is_relation else field
+    if isinstance(target, models.UUIDField):
+        return _same if connection.features.has_native_uuid_field else (lambda value: value and value.hex)
+    if isinstance(target, models.DateTimeField):
+        # Backends without time zone support store naive UTC; generated values are UTC, so drop "+00:00"
+        return _same if connection.features.supports_timezones else (
+            lambda value: value and value.isoformat(' ')[:-6]
+        )
+    if isinstance(target, (models.CharField, models.TextField, models.IntegerField,
+                           models.FloatField, models.BooleanField)):
+        return _same
+    return partial(field.get_db_prep_save, connection=connection)
+
+
+class Skewed:
+    """Draws from a population with Zipf-like weights (the first items are the busiest)"""
+
+    def __init__(self, rng, population, exponent=1.0):
+        self.rng = rng
+        self.population = population
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(len(population))))
+
+    def pick(self):
+        index = bisect.bisect(self.cum_weights, self.rng.random() * self.cum_weights[-1])
+        return self.population[min(index, len(self.population) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, deterministic, realistically skewed dataset for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--tasks-per-project', type=int, default=50, help='Mean; the actual count is long-tailed')
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--time-entries', type=int, default=10000)
+        parser.add_argument('--timers', type=int, default=5000)
+        parser.add_argument('--notifications', type=int, default=10000)
+        parser.add_argument('--activity-logs', type=int, default=10000)
+        parser.add_argument('--days', type=int, default=365, help='How far back the history reaches')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per executemany() transaction')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['projects'] < 1:
+            raise CommandError('--users and --projects must be at least 1')
+        self.rng = random.Random(options['seed'])
+        self.seed = options['seed']
+        self.chunk_size = options['chunk_size']
+        self.now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.span = options['days'] * 86400
+        if User.objects.filter(email=self.email(0)).exists():
+            raise CommandError(f'Seed {self.seed} was already generated here; pick another --seed')
+
+        self.total_rows = 0
+        started = time.perf_counter()
+        self.seed_users(options['users'])
+        self.seed_projects(options['projects'])
+        self.seed_tasks(options['tasks_per_project'])
+        self.seed_comments(options['comments'])
+        self.seed_time_entries(options['time_entries'])
+        self.seed_timers(options['timers'])
+        self.seed_notifications(options['notifications'])
+        self.seed_activity_logs(options['activity_logs'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {self.total_rows} rows in {elapsed:.1f}s ({self.total_rows / elapsed:.0f} rows/s)'
+        ))
+
+    # Helpers
+
+    def new_id(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def email(self, index):
+        return f'seed{self.seed}-user{index}@example.com'
+
+    def choice(self, options):
+        values, weights = options
+        return self.rng.choices(values, weights)[0]
+
+    def moment_after(self, earliest):
+        """A time between `earliest` and now, biased towards recent activity"""
+        window = (self.now - earliest).total_seconds()
+        return self.now - timedelta(seconds=window * self.rng.random() ** 2)
+
+    def status_history(self, status, created):
+        """(from_status, to_status, at) steps from todo to `status`, hours to days apart"""
+        if status == 'done':
+            path = [step for step, odds in (('in_progress', 0.9), ('review', 0.5)) if self.rng.random() < odds]
+            path.append('done')
+        else:
+            path = {'todo': [], 'in_progress': ['in_progress'], 'review': ['in_progress', 'review']}[status]
+        steps, previous, at = [], 'todo', created
+        for step in path:
+            at = min(self.now, at + timedelta(hours=self.rng.lognormvariate(math.log(24), 1.2)))
+            steps.append((previous, step, at))
+            previous = step
+        return steps
+
+    def long_tail_minutes(self):
+        # Median ~40 minutes, a few sessions run for most of a day
+        return min(10 * 60, max(1.0, self.rng.lognormvariate(math.log(40), 1.0)))
+
+    def insert(self, model, columns, rows):
+        """Write tuples of `columns` values in chunks; other columns get their field default"""
+        database = router.db_for_write(model)
+        connection = connections[database]
+        fields = [model._meta.get_field(name) for name in columns]
+        defaults = [field for field in model._meta.concrete_fields
+                    if field not in fields and field is not model._meta.auto_field]
+        constants = tuple(field.get_db_prep_save(field.get_default(), connection) for field in defaults)
+        preps = [fast_prep(field, connection) for field in fields]
+
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields + defaults),
+            ', '.join(['%s'] * (len(fields) + len(defaults))),
+        )
+
+        written = 0
+        started = time.perf_counter()
+        for chunk in iter(lambda: list(itertools.islice(rows, self.chunk_size)), []):
+            if not written:
+                for index, (field, value) in enumerate(zip(fields, chunk[0])):
+                    exact = partial(field.get_db_prep_save, connection=connection)
+                    if value is not None and preps[index](value) != exact(value):
+                        preps[index] = exact
+                converted = [(index, prep) for index, prep in enumerate(preps) if prep is not _same]
+            params = []
+            for row in chunk:
+                row = list(row)
+                for index, prep in converted:
+                    row[index] = prep(row[index])
+                params.append(tuple(row) + constants)
+            with transaction.atomic(using=database), connection.cursor() as cursor:
+                cursor.executemany(sql, params)
+            written += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.total_rows += written
+        self.stdout.write(f'{model._meta.db_table}: {written} rows in {elapsed:.1f}s')
+
+    # Tables, parents first
+
+    def seed_users(self, count):
+        password = make_password('password123')
+        self.users = [self.new_id() for _ in range(count)]
+        # Busiest first for Skewed draws, in a seeded order unrelated to creation
+        ranked = self.users[:]
+        self.rng.shuffle(ranked)
+        self.busy_users = Skewed(self.rng, ranked, exponent=0.8)
+
+        def rows():
+            for index, user_id in enumerate(self.users):
+                joined = self.now - timedelta(seconds=self.span * (1 + self.rng.random()))
+                role = 'SCRUM_MASTER' if self.rng.random() < 0.05 else 'EMPLOYEE'
+                name = f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+                yield (user_id, f'seed{self.seed}-user{index}', self.email(index), name, role, password,
+                       joined, joined)
+        self.insert(User, ['id', 'username', 'email', 'name', 'role', 'password', 'date_joined', 'created_at'],
+                    rows())
+
+    def seed_projects(self, count):
+        self.projects = []  # (id, created_at, team)
+
+        def rows():
+            for index in range(count):
+                # Mostly teams of 2-6, a few departments of dozens
+                size = min(len(self.users), 1 + int(self.rng.paretovariate(1.3) * 2), 200)
+                team = self.rng.sample(self.users, size)
+                created = self.now - timedelta(seconds=self.span * self.rng.random())
+                project_id = self.new_id()
+                self.projects.append((project_id, created, team))
+                yield (project_id, f'Project {index} {self.rng.choice(TASK_OBJECTS)}', 'Generated by seed_scale',
+                       self.choice(PROJECT_STATUSES), created + timedelta(days=self.rng.randint(30, 240)),
+                       team[0], created, self.moment_after(created))
+        self.insert(Project, ['id', 'title', 'description', 'status', 'deadline', 'created_by_id',
+                              'created_at', 'updated_at'], rows())
+
+        self.insert(Project.team_members.through, ['project_id', 'user_id'], (
+            (project_id, user_id) for project_id, _, team in self.projects for user_id in team
+        ))
+
+    def seed_tasks(self, mean_per_project):
+        self.tasks = []  # (id, project_id, created_at, team)
+        transitions = []  # (task_id, from_status, to_status, at, user_id)
+
+        def project_tasks(project_id, project_created, team):
+            # Long-tailed around the mean: mu chosen so exp(mu + sigma^2 / 2) == mean
+            count = max(1, min(20 * mean_per_project,
+                               int(self.rng.lognormvariate(math.log(max(mean_per_project, 1)) - 0.5, 1.0))))
+            assignees = Skewed(self.rng, team, exponent=1.2)
+            columns = {}
+            for _ in range(count):
+                created = self.moment_after(project_created)
+                age_days = (self.now - created).days
+                status = 'done' if self.rng.random() < min(0.9, age_days / 60) else self.choice(OPEN_STATUSES)
+                task_id = self.new_id()
+                self.tasks.append((task_id, project_id, created, team))
+                assignee = assignees.pick() if self.rng.random() < 0.9 else None
+                creator = team[0] if self.rng.random() < 0.6 else self.rng.choice(team)
+                steps = self.status_history(status, created)
+                transitions.append((task_id, None, 'todo', created, creator))
+                transitions.extend((task_id, *step, assignee or creator) for step in steps)
+                columns.setdefault(status, []).append([
+                    task_id,
+                    f'{self.rng.choice(TASK_WORDS)} {self.rng.choice(TASK_OBJECTS)}',
+                    status,
+                    self.choice(PRIORITIES),
+                    project_id,
+                    assignee,
+                    creator,
+                    created + timedelta(days=self.rng.randint(1, 30)) if self.rng.random() < 0.8 else None,
+                    round(self.rng.lognormvariate(math.log(4), 0.7), 1) if self.rng.random() < 0.7 else None,
+                    None,  # rank, below
+                    created,
+                    steps[-1][2] if steps else self.moment_after(created),
+                    steps[-1][2] if status == 'done' else None,
+                ])
+            # Nothing runs Task.save(), so rank each Kanban column here
+            for column in columns.values():
+                for row, rank in zip(column, spread_ranks(len(column))):
+                    row[9] = rank
+                    yield tuple(row)
+
+        self.insert(Task, ['id', 'title', 'status', 'priority', 'project_id', 'assigned_to_id', 'created_by_id',
+                           'due_date', 'estimated_hours', 'rank', 'created_at', 'updated_at', 'completed_at'],
+                    itertools.chain.from_iterable(project_tasks(*project) for project in self.projects))
+        self.insert(TaskStatusTransition, ['task_id', 'from_status', 'to_status', 'at', 'user_id'],
+                    iter(transitions))
+        # Hot tasks draw most comments and time; ranked in a seeded order
+        ranked = self.tasks[:]
+        self.rng.shuffle(ranked)
+        self.busy_tasks = Skewed(self.rng, ranked, exponent=0.7)
+
+    def seed_comments(self, count):
+        def rows():
+            for _ in range(count):
+                task_id, _, created, team = self.busy_tasks.pick()
+                at = self.moment_after(created)
+                yield self.new_id(), task_id, self.rng.choice(team), f'Comment on {task_id.hex[:8]}', at, at
+        self.insert(Comment, ['id', 'task_id', 'user_id', 'content', 'created_at', 'updated_at'], rows())
+
+    def sessions(self, count):
+        """(id, task_id, user_id, start, end) work sessions on busy tasks by their teams"""
+        for _ in range(count):
+            task_id, _, created, team = self.busy_tasks.pick()
+            start = self.moment_after(created)
+            end = min(self.now, start + timedelta(minutes=self.long_tail_minutes()))
+            yield self.new_id(), task_id, self.rng.choice(team), start, end
+
+    def seed_time_entries(self, count):
+        self.insert(TimeEntry, ['id', 'task_id', 'user_id', 'start_time', 'end_time', 'duration_hours', 'created_at'], (
+            (entry_id, task_id, user_id, start, end, (end - start).total_seconds() / 3600, start)
+            for entry_id, task_id, user_id, start, end in self.sessions(count)
+        ))
+
+    def seed_timers(self, count):
+        self.insert(TaskTimer, ['id', 'task_id', 'user_id', 'start_time', 'end_time', 'duration_seconds',
+                                'created_at', 'updated_at'], (
+            (timer_id, task_id, user_id, start, end, int((end - start).total_seconds()), start, end)
+            for timer_id, task_id, user_id, start, end in self.sessions(count)
+        ))
+
+    def seed_notifications(self, count):
+        def rows():
+            for _ in range(count):
+                created = self.now - timedelta(seconds=self.span * self.rng.random() ** 3)
+                age_days = (self.now - created).days
+                kind = self.choice(NOTIFICATION_TYPES)
+                # Recent notifications are the unread ones
+                is_read = self.rng.random() < min(0.98, 0.3 + age_days / 10)
+                yield (self.new_id(), self.busy_users.pick(), kind.replace('_', ' ').capitalize(),
+                       f'{self.rng.choice(TASK_WORDS)} {self.rng.choice(TASK_OBJECTS)}', kind, is_read, created)
+        self.insert(Notification, ['id', 'user_id', 'title', 'message', 'notification_type', 'is_read',
+                                   'created_at'], rows())
+
+    def seed_activity_logs(self, count):
+        def rows():
+            for _ in range(count):
+                task_id, project_id, created, team = self.busy_tasks.pick()
+                action = self.choice(ACTIONS)
+                yield (self.new_id(), self.rng.choice(team), task_id, project_id, action,
+                       f'{action.replace("_", " ").capitalize()} task {task_id.hex[:8]}',
+                       self.moment_after(created))
+        self.insert(ActivityLog, ['id', 'user_id', 'task_id', 'project_id', 'action', 'description',
+                                  'created_at'], rows())
@@ -0,0 +1,28 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api.db_routing import REPLICA, reset_replica_lag
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica file (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.settings:
+            raise CommandError('No replica database is configured (set SQLITE_REPLICA_PATH)')
+        primary = connections['default']
+        if primary.vendor != 'sqlite' or connections[REPLICA].vendor != 'sqlite':
+            raise CommandError('Snapshots are only needed for SQLite; MySQL replicas replicate themselves')
+
+        primary.ensure_connection()
+        # The backup API copies a consistent snapshot into the live replica
+        # file, so readers on the replica never see a half-written database
+        target = sqlite3.connect(connections[REPLICA].settings_dict['NAME'])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        reset_replica_lag()
+        self.stdout.write(self.style.SUCCESS('Replica snapshot updated'))
@@ -0,0 +1,293 @@
+"""
+Per-endpoint request and SQL metrics, exported in Prometheus text format.
+
+RequestMetricsMiddleware times every request and files it under the
+resolved URL name: request count (by method and status), a latency
+histogram, SQL query count and time, and response size. SQL is counted
+by an execute_wrapper installed on every database connection as it is
+created. The wrapper adds to the current request's totals through a
+context variable, so queries that async views run through sync_to_async
+are counted too.
+
+Each process keeps its own counters in memory. When METRICS['DIRECTORY']
+is set it writes them every FLUSH_INTERVAL seconds to its own JSON file
+in that directory. render_metrics() then sums the files of all worker
+processes, including ones that have exited, since their counters are
+cumulative. Without a directory only the serving process is reported.
+
+Streaming responses (exports) are recorded when the response is
+returned: their size counts as zero and queries run while streaming are
+not counted.
+"""
+import atexit
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .connections import connection_stats
+
+DEFAULTS = {
+    'DIRECTORY': None,     # shared directory for per-process files, None keeps metrics in memory only
+    'FLUSH_INTERVAL': 5,   # seconds between writes of this process's file
+    'LATENCY_BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+}
+
+UNMATCHED = 'unmatched'
+
+_request_sql = contextvars.ContextVar('request_sql', default=None)
+
+
+def _config(name):
+    return getattr(settings, 'METRICS', {}).get(name, DEFAULTS[name])
+
+
+class SQLTotals:
+    """Queries and SQL seconds of one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+def record_sql(execute, sql, params, many, context):
+    totals = _request_sql.get()
+    if totals is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        totals.queries += 1
+        totals.seconds += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # The wrapper list outlives reconnects of the same DatabaseWrapper
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+def _empty_view():
+    return {
+        'requests': {},  # "METHOD STATUS" -> count
+        'buckets': [0] * (len(_config('LATENCY_BUCKETS')) + 1),
+        'duration_seconds': 0.0,
+        'queries': 0,
+        'sql_seconds': 0.0,
+        'response_bytes': 0,
+    }
+
+
+class MetricsStore:
+    """This process's counters, with an optional per-process file"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset_locked()
+
+    def _reset_locked(self):
+        self._views = {}
+        self._flushed = 0.0
+        self._name = f'metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        # A forked worker starts from zero rather than from its parent's counters
+        if self._pid != os.getpid():
+            self._reset_locked()
+
+    def reset(self):
+        with self._lock:
+            self._reset_locked()
+
+    def observe(self, view, method, status_code, duration, queries, sql_seconds, size):
+        buckets = _config('LATENCY_BUCKETS')
+        index = next((i for i, bound in enumerate(buckets) if duration <= bound), len(buckets))
+        with self._lock:
+            self._check_fork()
+            entry = self._views.setdefault(view, _empty_view())
+            key = f'{method} {status_code}'
+            entry['requests'][key] = entry['requests'].get(key, 0) + 1
+            entry['buckets'][index] += 1
+            entry['duration_seconds'] += duration
+            entry['queries'] += queries
+            entry['sql_seconds'] += sql_seconds
+            entry['response_bytes'] += size
+            flush = _config('DIRECTORY') and time.monotonic() - self._flushed >= _config('FLUSH_INTERVAL')
+        if flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            self._check_fork()
+            return {
+                'views': json.loads(json.dumps(self._views)),
+                'connections': connection_stats(),
+            }
+
+    def flush(self):
+        directory = _config('DIRECTORY')
+        if not directory:
+            return
+        snapshot = self.snapshot()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self._name)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(temporary, path)
+        with self._lock:
+            self._flushed = time.monotonic()
+
+    def collect(self):
+        """Snapshots of every process: the files in DIRECTORY, this one live"""
+        snapshots = [self.snapshot()]
+        directory = _config('DIRECTORY')
+        if directory:
+            for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+                if os.path.basename(path) == self._name:
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue  # being replaced or removed right now
+        return snapshots
+
+
+metrics_store = MetricsStore()
+atexit.register(metrics_store.flush)
+
+
+def _merge(snapshots):
+    views = {}
+    connections = {}
+    for snapshot in snapshots:
+        for view, entry in snapshot['views'].items():
+            merged = views.setdefault(view, _empty_view())
+            for key, count in entry['requests'].items():
+                merged['requests'][key] = merged['requests'].get(key, 0) + count
+            # Files written with other buckets cannot be added up
+            if len(entry['buckets']) == len(merged['buckets']):
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], entry['buckets'])]
+            for name in ('duration_seconds', 'queries', 'sql_seconds', 'response_bytes'):
+                merged[name] += entry[name]
+        for alias, counters in snapshot['connections'].items():
+            merged = connections.setdefault(alias, {'opened': 0, 'reused': 0})
+            for name, count in counters.items():
+                merged[name] = merged.get(name, 0) + count
+    return views, connections
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """All processes' metrics in the Prometheus text exposition format"""
+    views, connections = _merge(metrics_store.collect())
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family('taskflow_http_requests_total', 'counter', 'Requests handled, by URL name, method and status.')
+    for view, entry in sorted(views.items()):
+        for key, count in sorted(entry['requests'].items()):
+            method, status_code = key.split(' ', 1)
+            lines.append(f'taskflow_http_requests_total{_labels(view=view, method=method, status=status_code)} {count}')
+
+    family('taskflow_http_request_duration_seconds', 'histogram', 'Request latency, by URL name.')
+    bounds = [_number(float(bound)) for bound in _config('LATENCY_BUCKETS')] + ['+Inf']
+    for view, entry in sorted(views.items()):
+        cumulative = 0
+        for bound, count in zip(bounds, entry['buckets']):
+            cumulative += count
+            lines.append(f'taskflow_http_request_duration_seconds_bucket{_labels(view=view, le=bound)} {cumulative}')
+        lines.append(f'taskflow_http_request_duration_seconds_sum{_labels(view=view)} {_number(entry["duration_seconds"])}')
+        lines.append(f'taskflow_http_request_duration_seconds_count{_labels(view=view)} {cumulative}')
+
+    for name, key, kind, help_text in (
+        ('taskflow_db_queries_total', 'queries', 'counter', 'SQL queries run by requests, by URL name.'),
+        ('taskflow_db_query_duration_seconds_total', 'sql_seconds', 'counter', 'Time spent in SQL, by URL name.'),
+        ('taskflow_http_response_size_bytes_total', 'response_bytes', 'counter', 'Response body bytes, by URL name.'),
+    ):
+        family(name, kind, help_text)
+        for view, entry in sorted(views.items()):
+            lines.append(f'{name}{_labels(view=view)} {_number(entry[key])}')
+
+    for name, key, help_text in (
+        ('taskflow_db_connections_opened_total', 'opened', 'Database connections opened, by alias.'),
+        ('taskflow_db_connections_reused_total', 'reused', 'Requests that started on an open connection, by alias.'),
+    ):
+        family(name, 'counter', help_text)
+        for alias, counters in sorted(connections.items()):
+            lines.append(f'{name}{_labels(alias=alias)} {counters.get(key, 0)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL and response size of every request under its URL name.
+
+    Goes first in MIDDLEWARE so the timing covers the whole stack. Works
+    in sync and async stacks.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        totals = SQLTotals()
+        token = _request_sql.set(totals)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_sql.reset(token)
+        self.record(request, response, time.perf_counter() - started, totals)
+        return response
+
+    async def __acall__(self, request):
+        totals = SQLTotals()
+        token = _request_sql.set(totals)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_sql.reset(token)
+        self.record(request, response, time.perf_counter() - started, totals)
+        return response
+
+    def record(self, request, response, duration, totals):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else UNMATCHED
+        size = 0 if response.streaming else len(response.content)
+        metrics_store.observe(view, request.method, response.status_code, duration,
+                              totals.queries, totals.seconds, size)
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+# Frozen copy of api.ranking's alphabet and spread_ranks(), so later changes
+# to the ranking module cannot change what this migration writes
+ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(ALPHABET)
+
+
+def spread_ranks(count):
+    """Return count evenly spaced, increasing ranks of equal width"""
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for position in range(1, count + 1):
+        value = position * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(ALPHABET[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def assign_initial_ranks(apps, schema_editor):
+    """Rank existing cards newest-first, matching the old board order"""
+    Task = apps.get_model('api', 'Task')
+    columns = Task.objects.order_by().values_list('project_id', 'status').distinct()
+    for project_id, status in columns:
+        tasks = list(Task.objects.filter(project_id=project_id, status=status).order_by('-created_at'))
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_tasktimer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(assign_initial_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'rank'], name='task_board_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:40
+#
+# ActivityLog, Notification and TaskTimer may be routed to the events
+# database, so their foreign keys become plain uuid columns. The columns
+# (user_id, task_id, project_id) and their indexes stay as they are; only
+# the foreign key constraints are dropped, so existing rows keep their ids.
+
+from django.db import migrations, models
+
+
+def plain_id(model_name, name, null=False):
+    field = models.UUIDField(db_column=f'{name}_id', db_index=True, null=null, blank=null)
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.AlterField(model_name=model_name, name=name, field=field),
+        ],
+        state_operations=[
+            migrations.RemoveField(model_name=model_name, name=name),
+            migrations.AddField(
+                model_name=model_name,
+                name=f'{name}_id',
+                field=models.UUIDField(db_index=True, null=null, blank=null),
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_revokedtoken'),
+    ]
+
+    operations = [
+        plain_id('activitylog', 'user'),
+        plain_id('activitylog', 'task', null=True),
+        plain_id('activitylog', 'project', null=True),
+        plain_id('notification', 'user'),
+        plain_id('tasktimer', 'task'),
+        plain_id('tasktimer', 'user'),
+    ]
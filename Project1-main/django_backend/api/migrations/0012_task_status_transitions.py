@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-19 11:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Done tasks have no record of when they were completed; their last edit is the best guess"""
+    Task = apps.get_model('api', 'Task')
+    Task.objects.filter(status='done').update(completed_at=F('updated_at'))
+
+
+def backfill_done_transitions(apps, schema_editor):
+    """Give every task already done a synthetic todo -> done move at its completed_at.
+
+    The history before this migration is unknown, so these tasks count
+    towards lead time but, never having entered an active status on
+    record, not towards cycle time.
+    """
+    Task = apps.get_model('api', 'Task')
+    TaskStatusTransition = apps.get_model('api', 'TaskStatusTransition')
+    done = Task.objects.filter(status='done', status_transitions__isnull=True).values_list('id', 'completed_at')
+    TaskStatusTransition.objects.bulk_create(
+        (TaskStatusTransition(task_id=task_id, from_status='todo', to_status='done', at=completed_at)
+         for task_id, completed_at in done.iterator(chunk_size=2000)),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_event_tables_plain_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='TaskStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('from_status', models.CharField(blank=True, choices=[('todo', 'To Do'), ('in_progress', 'In Progress'), ('review', 'Review'), ('done', 'Done')], max_length=20, null=True)),
+                ('to_status', models.CharField(choices=[('todo', 'To Do'), ('in_progress', 'In Progress'), ('review', 'Review'), ('done', 'Done')], max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='api.task')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_transitions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['at', 'id'],
+                'indexes': [models.Index(fields=['task', 'at'], name='transition_task_at_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_done_transitions, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,63 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Max
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 import uuid
 
+from .ranking import rank_between
+
+
+class RelatedById(property):
+    """Object accessor for a plain id column that stands in for a foreign key.
+
+    Used by the event tables, which may live in their own database (see
+    api.db_routing.EventsRouter) where a real foreign key cannot point.
+    Reading loads the row on first access; assigning an object, including
+    through Model(**kwargs), sets the id. load_related() fills the accessor
+    for many rows with one query per relation.
+    """
+
+    def __init__(self, model, id_field):
+        self.model = model
+        self.id_field = id_field
+        self.cache_name = f'_{id_field}_cache'
+        super().__init__(self._get, self._set)
+
+    def _get(self, instance):
+        object_id = getattr(instance, self.id_field)
+        cached = instance.__dict__.get(self.cache_name)
+        if cached is None or cached[0] != object_id:
+            obj = None
+            if object_id is not None:
+                obj = self.model._default_manager.get(pk=object_id)
+            cached = instance.__dict__[self.cache_name] = (object_id, obj)
+        return cached[1]
+
+    def _set(self, instance, obj):
+        object_id = obj.pk if obj is not None else None
+        setattr(instance, self.id_field, object_id)
+        instance.__dict__[self.cache_name] = (object_id, obj)
+
+
+def load_related(instances, *names, **querysets):
+    """Fill RelatedById accessors for many rows: load_related(logs, 'user', task=Task.objects...)"""
+    instances = list(instances)
+    if not instances:
+        return instances
+    wanted = {name: None for name in names}
+    wanted.update(querysets)
+    for name, queryset in wanted.items():
+        accessor = getattr(type(instances[0]), name)
+        ids = {getattr(obj, accessor.id_field) for obj in instances} - {None}
+        if queryset is None:
+            queryset = accessor.model._default_manager.all()
+        rows = queryset.in_bulk(ids) if ids else {}
+        for obj in instances:
+            object_id = getattr(obj, accessor.id_field)
+            obj.__dict__[accessor.cache_name] = (object_id, rows.get(object_id))
+    return instances
+
 
 class User(AbstractUser):
     """Custom User model extending Django's AbstractUser"""
@@ -18,6 +73,9 @@ class User(AbstractUser):
     avatar = models.URLField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped whenever role, activation, password or project membership
+    # change, so tokens carrying older claims are no longer trusted
+    claims_version = models.PositiveIntegerField(default=1)
     
     # Required fields for AbstractUser
     username = models.CharField(max_length=150, unique=True, blank=True)
@@ -87,16 +145,119 @@ class Task(models.Model):
     due_date = models.DateTimeField(blank=True, null=True)
     estimated_hours = models.FloatField(blank=True, null=True, validators=[MinValueValidator(0.1)])
     actual_hours = models.FloatField(default=0.0, validators=[MinValueValidator(0)])
+    rank = models.CharField(max_length=64, blank=True, default='')  # Kanban order within a column, see ranking.py
+    completed_at = models.DateTimeField(blank=True, null=True)  # when the task last moved to done
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # User behind the next save()'s status change, for its TaskStatusTransition
+    status_changed_by = None
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status', 'rank'], name='task_board_rank_idx'),
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            models.Index(fields=['assigned_to', 'due_date'], name='task_assignee_due_idx'),
+        ]
+    
+    @classmethod
+    def last_rank(cls, project_id, status):
+        """Rank of the bottom card in a Kanban column, or None if it is empty"""
+        return cls.objects.filter(project_id=project_id, status=status).aggregate(last=Max('rank'))['last'] or None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # Status, project and rank as stored, so save() can tell whether they changed
+        if 'status' in task.__dict__:
+            task._stored_status = task.status
+        if 'project_id' in task.__dict__:
+            task._stored_project_id = task.project_id
+        if 'rank' in task.__dict__:
+            task._stored_rank = task.rank
+        return task
+    
+    def sync_completed_at(self, now):
+        """Stamp completed_at when the task is done, clear it when it is not"""
+        if self.status != 'done':
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = now
+    
+    def save(self, *args, **kwargs):
+        # New cards go to the bottom of their Kanban column
+        if not self.rank:
+            self.rank = rank_between(Task.last_rank(self.project_id, self.status), None)
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        previous = None if adding else getattr(self, '_stored_status', self.status)
+        changed = previous != self.status and (update_fields is None or 'status' in update_fields)
+        now = timezone.now()
+        moved_project = (
+            not adding and getattr(self, '_stored_project_id', self.project_id) != self.project_id
+            and (update_fields is None or {'project', 'project_id'} & set(update_fields))
+        )
+        extra_fields = set()
+        if changed:
+            self.sync_completed_at(now)
+            extra_fields.add('completed_at')
+        # A card changing column goes to the bottom of the new one, unless the caller placed it
+        if ((changed or moved_project) and not adding
+                and self.rank == getattr(self, '_stored_rank', self.rank)):
+            self.rank = rank_between(Task.last_rank(self.project_id, self.status), None)
+            extra_fields.add('rank')
+        if extra_fields and update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *extra_fields}
+        super().save(*args, **kwargs)
+        if changed:
+            user = self.status_changed_by
+            TaskStatusTransition.record(
+                [(self.pk, previous, self.status)],
+                user_id=user.pk if user else (self.created_by_id if adding else None),
+                at=now,
+            )
+            self._stored_status = self.status
+        self._stored_project_id = self.project_id
+        self._stored_rank = self.rank
     
     def __str__(self):
         return self.title
 
 
+class TaskStatusTransition(models.Model):
+    """One change of a task's status, the history behind lead and cycle times.
+
+    A task's first row has no from_status and records the status it was
+    created in. Task.save() writes rows itself; code paths that write with
+    bulk_create, bulk_update or QuerySet.update() must call record().
+    """
+    id = models.BigAutoField(primary_key=True)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20, choices=Task.TASK_STATUS_CHOICES, blank=True, null=True)
+    to_status = models.CharField(max_length=20, choices=Task.TASK_STATUS_CHOICES)
+    at = models.DateTimeField(default=timezone.now)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='status_transitions', blank=True, null=True)
+    
+    class Meta:
+        ordering = ['at', 'id']
+        indexes = [
+            models.Index(fields=['task', 'at'], name='transition_task_at_idx'),
+        ]
+    
+    @classmethod
+    def record(cls, changes, user_id=None, at=None):
+        """Log every (task_id, from_status, to_status) in changes that is a change of status"""
+        at = at or timezone.now()
+        return cls.objects.bulk_create([
+            cls(task_id=task_id, from_status=from_status, to_status=to_status, at=at, user_id=user_id)
+            for task_id, from_status, to_status in changes if from_status != to_status
+        ])
+    
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status or 'new'} -> {self.to_status}"
+
+
 class TimeEntry(models.Model):
     """Time tracking entries for tasks"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -110,6 +271,9 @@ class TimeEntry(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'start_time'], name='timeentry_user_start_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         # Calculate duration if both start and end times are present
@@ -147,6 +311,7 @@ class Attachment(models.Model):
     file_size = models.PositiveIntegerField()  # in bytes
     file_type = models.CharField(max_length=100)
     file_url = models.URLField()  # For future cloud storage integration
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)  # SHA-256 of the stored blob, see storage.py
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -156,6 +321,30 @@ class Attachment(models.Model):
         return f"{self.file_name} - {self.task.title}"
 
 
+class UploadSession(models.Model):
+    """A resumable chunked attachment upload in progress.
+
+    Chunks are appended to a part file under MEDIA_ROOT; once `received`
+    reaches `total_size` the file is moved into content-addressed storage
+    and an Attachment is created.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='upload_sessions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    file_name = models.CharField(max_length=255)
+    file_type = models.CharField(max_length=100)
+    total_size = models.PositiveIntegerField()  # in bytes
+    received = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.received}/{self.total_size})"
+
+
 class ActivityLog(models.Model):
     """Activity log for tracking changes"""
     ACTION_TYPES = [
@@ -169,9 +358,12 @@ class ActivityLog(models.Model):
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activity_logs')
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='activity_logs', null=True, blank=True)
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='activity_logs', null=True, blank=True)
+    # Plain ids rather than foreign keys so the table can move to the
+    # events database; rows are removed with their user, task or project
+    # by api.events
+    user_id = models.UUIDField(db_index=True)
+    task_id = models.UUIDField(null=True, blank=True, db_index=True)
+    project_id = models.UUIDField(null=True, blank=True, db_index=True)
     action = models.CharField(max_length=20, choices=ACTION_TYPES)
     description = models.TextField()
     metadata = models.JSONField(default=dict, blank=True)  # Store additional data
@@ -183,6 +375,10 @@ class ActivityLog(models.Model):
     def __str__(self):
         return f"{self.user.name} {self.action} - {self.description}"
 
+    user = RelatedById(User, 'user_id')
+    task = RelatedById(Task, 'task_id')
+    project = RelatedById(Project, 'project_id')
+
 
 class Notification(models.Model):
     """Notifications for users"""
@@ -194,7 +390,7 @@ class Notification(models.Model):
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    user_id = models.UUIDField(db_index=True)  # plain id, see ActivityLog
     title = models.CharField(max_length=200)
     message = models.TextField()
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
@@ -207,12 +403,14 @@ class Notification(models.Model):
     def __str__(self):
         return f"{self.title} - {self.user.name}"
 
+    user = RelatedById(User, 'user_id')
+
 
 class TaskTimer(models.Model):
     """Time tracking for tasks with precise start/stop functionality"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='timers')
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_timers')
+    task_id = models.UUIDField(db_index=True)  # plain ids, see ActivityLog
+    user_id = models.UUIDField(db_index=True)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(blank=True, null=True)
     duration_seconds = models.IntegerField(blank=True, null=True)
@@ -231,4 +429,55 @@ class TaskTimer(models.Model):
     
     def __str__(self):
         duration = f"{self.duration_seconds}s" if self.duration_seconds else "In progress"
-        return f"{self.user.name} - {self.task.title} ({duration})"
\ No newline at end of file
+        return f"{self.user.name} - {self.task.title} ({duration})"
+
+    task = RelatedById(Task, 'task_id')
+    user = RelatedById(User, 'user_id')
+
+
+class ChangeLog(models.Model):
+    """Append-only feed of row changes consumed by the /api/changes/ sync endpoint.
+
+    The auto-incrementing id is the sync cursor. Rows with action 'deleted'
+    are tombstones so deletes reach clients that cache data locally.
+    """
+    ACTION_CHOICES = [
+        ('upserted', 'Created or Updated'),
+        ('deleted', 'Deleted'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=20)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['created_at'], name='changelog_created_idx'),
+        ]
+    
+    @classmethod
+    def record(cls, model, object_ids, action='upserted'):
+        """Log a change for every id in object_ids (for writes that bypass signals)"""
+        return cls.objects.bulk_create([
+            cls(model=model, object_id=object_id, action=action) for object_id in object_ids
+        ])
+    
+    def __str__(self):
+        return f"#{self.id} {self.model} {self.object_id} {self.action}"
+
+
+class RevokedToken(models.Model):
+    """Refresh token that may no longer be used, after rotation or logout.
+
+    Rows only matter until the token would have expired anyway, after which
+    api.revocation compacts them away.
+    """
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return self.jti
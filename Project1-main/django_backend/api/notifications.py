@@ -1,5 +1,6 @@
 from django.utils import timezone
 from datetime import timedelta
+import asyncio
 from django.db.models import Q
 from .models import Task, Notification, User
 
@@ -31,7 +32,7 @@ def check_due_tasks():
         if task.assigned_to:
             # Check if notification already exists for this task
             existing_notification = Notification.objects.filter(
-                user=task.assigned_to,
+                user_id=task.assigned_to_id,
                 title__icontains=task.title,
                 notification_type='task_due',
                 created_at__gte=now - timedelta(hours=12)
@@ -60,7 +61,7 @@ def check_overdue_tasks():
         if task.assigned_to:
             # Check if notification already exists for this task today
             existing_notification = Notification.objects.filter(
-                user=task.assigned_to,
+                user_id=task.assigned_to_id,
                 title__icontains=task.title,
                 notification_type='task_due',
                 created_at__gte=now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -125,13 +126,30 @@ def notify_project_update(project, message):
 
 def get_user_notification_summary(user):
     """Get notification summary for a user"""
-    unread_count = Notification.objects.filter(user=user, is_read=False).count()
+    unread_count = Notification.objects.filter(user_id=user.pk, is_read=False).count()
     
     recent_notifications = Notification.objects.filter(
-        user=user
+        user_id=user.pk
     ).order_by('-created_at')[:5]
     
     return {
         'unread_count': unread_count,
         'recent_notifications': recent_notifications
-    }
\ No newline at end of file
+    }
+
+
+async def aget_user_notification_summary(user):
+    """get_user_notification_summary() with both queries run concurrently"""
+    notifications = Notification.objects.filter(user_id=user.pk)
+
+    async def recent():
+        return [notification async for notification in notifications.order_by('-created_at')[:5]]
+
+    unread_count, recent_notifications = await asyncio.gather(
+        notifications.filter(is_read=False).acount(),
+        recent(),
+    )
+    return {
+        'unread_count': unread_count,
+        'recent_notifications': recent_notifications
+    }
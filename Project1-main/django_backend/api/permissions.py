@@ -1,6 +1,21 @@
 from rest_framework import permissions
 
 
+def is_project_member(user, project):
+    """Check membership from the token's project claims when it carries them.
+
+    Claims only reach here while the token's claims version is current
+    (CachedJWTAuthentication.get_claims_user). A membership change is seen
+    by the next request in the worker that made it, and in every other
+    worker at once with a shared cache or within AUTH_USER_CACHE['TTL']
+    without one.
+    """
+    project_ids = getattr(user, 'project_ids', None)
+    if project_ids is not None:
+        return project.pk in project_ids
+    return project.team_members.filter(id=user.pk).exists()
+
+
 class IsScrumMasterOrReadOnly(permissions.BasePermission):
     """
     Custom permission to only allow Scrum Masters to edit objects.
@@ -49,11 +64,11 @@ class IsProjectMemberOrReadOnly(permissions.BasePermission):
         
         # Write permissions only for project members
         if hasattr(obj, 'team_members'):
-            return obj.team_members.filter(id=request.user.id).exists()
+            return is_project_member(request.user, obj)
         
         # For tasks, check if user is a member of the associated project
         if hasattr(obj, 'project') and obj.project:
-            return obj.project.team_members.filter(id=request.user.id).exists()
+            return is_project_member(request.user, obj.project)
         
         # Default to Scrum Master only
         return request.user.role == 'SCRUM_MASTER'
@@ -115,7 +130,7 @@ class CanAccessProject(permissions.BasePermission):
             return True
         
         # Check if user is a team member of the project
-        return obj.team_members.filter(id=request.user.id).exists()
+        return is_project_member(request.user, obj)
 
 
 class CanAccessTask(permissions.BasePermission):
@@ -132,16 +147,9 @@ class CanAccessTask(permissions.BasePermission):
         if request.user.role == 'scrum_master':
             return True
         
-        # Check if user is assigned to the task
-        if obj.assigned_to == request.user:
-            return True
-        
-        # Check if user is in the project team
-        if obj.project and obj.project.team_members.filter(id=request.user.id).exists():
-            return True
-        
-        # Check if user created the task
-        if obj.created_by == request.user:
+        # Check if user is assigned to or created the task
+        if obj.assigned_to_id == request.user.pk or obj.created_by_id == request.user.pk:
             return True
         
-        return False
\ No newline at end of file
+        # Check if user is in the project team; the only check that may query
+        return obj.project_id is not None and is_project_member(request.user, obj.project)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Thumbnail previews for image and PDF attachments.
+
+Previews are rendered off the request path by a process pool and cached
+under MEDIA_ROOT/previews/<aa>/<bb>/<sha256>.png. They are keyed by the
+attachment's content hash, so every attachment sharing a blob shares one
+preview and rendering the same content twice is a no-op.
+
+Pillow renders images; PDFs additionally need PyMuPDF (`fitz`). Without
+them the attachment simply has no preview.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from .storage import blob_path, preview_path
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+try:
+    import fitz
+except ImportError:  # pragma: no cover - PyMuPDF is optional
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SIZE = (320, 320)
+
+_executor = None
+_pending = {}
+_lock = threading.Lock()
+
+
+def has_preview(content_hash):
+    return bool(content_hash) and os.path.exists(preview_path(content_hash))
+
+
+def can_preview(file_type):
+    if file_type.startswith('image/'):
+        return Image is not None
+    if file_type == 'application/pdf':
+        return Image is not None and fitz is not None
+    return False
+
+
+def render_preview(content_hash, file_type):
+    """Render the preview of one blob; runs inside a worker process.
+
+    Writes to a temporary name and renames it into place, so readers never
+    see a half-written file and concurrent renders of the same hash are
+    harmless.
+    """
+    destination = preview_path(content_hash)
+    if os.path.exists(destination):
+        return destination
+
+    source = blob_path(content_hash)
+    if file_type == 'application/pdf':
+        with fitz.open(source) as document:
+            pixmap = document[0].get_pixmap()
+            image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+        image.thumbnail(PREVIEW_SIZE)
+    else:
+        with Image.open(source) as image:
+            image.draft('RGB', PREVIEW_SIZE)  # lets JPEG decode at reduced size
+            image.thumbnail(PREVIEW_SIZE)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temporary = f'{destination}.{os.getpid()}.tmp'
+    image.save(temporary, 'PNG', optimize=True)
+    os.replace(temporary, destination)
+    return destination
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PREVIEW_WORKERS)
+    return _executor
+
+
+def _done(content_hash, future):
+    with _lock:
+        _pending.pop(content_hash, None)
+    if future.exception() is not None:
+        logger.warning('Preview generation failed for %s: %s', content_hash, future.exception())
+
+
+def _submit(content_hash, file_type):
+    if settings.PREVIEW_WORKERS == 0:
+        # Inline mode, used by tests and single-process setups
+        try:
+            render_preview(content_hash, file_type)
+        except Exception as exc:
+            logger.warning('Preview generation failed for %s: %s', content_hash, exc)
+        return
+
+    with _lock:
+        if content_hash in _pending:
+            return
+        future = _get_executor().submit(render_preview, content_hash, file_type)
+        _pending[content_hash] = future
+    future.add_done_callback(lambda future: _done(content_hash, future))
+
+
+def schedule_preview(attachment):
+    """Queue preview rendering for an attachment once the current transaction commits"""
+    content_hash = attachment.content_hash
+    if not content_hash or not can_preview(attachment.file_type) or has_preview(content_hash):
+        return
+    transaction.on_commit(lambda: _submit(content_hash, attachment.file_type))
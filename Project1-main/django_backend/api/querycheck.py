@@ -0,0 +1,212 @@
+"""
+N+1 query detection and per-view query budgets.
+
+Every SQL statement is reduced to a fingerprint: string and number
+literals, parameters and IN lists are replaced with placeholders, so the
+query a serializer runs once per row has the same fingerprint each time.
+QueryCheckMiddleware counts fingerprints per request through an
+execute_wrapper installed on every connection, like the metrics one, and
+reports any statement shape run more than N_PLUS_ONE_THRESHOLD times.
+
+@query_budget(n) caps the total number of queries a view may run. It
+works on function views (above @api_view), async views and view classes,
+where it wraps dispatch().
+
+QUERY_CHECKS['ACTION'] decides what a violation does: 'log' writes a
+warning to the api.querycheck logger, 'raise' raises QueryCheckError and
+'off' skips counting altogether. QueryCheckTestRunner switches it to
+'raise' for the test suite.
+"""
+import contextvars
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ACTION': 'off',               # 'log', 'raise' or 'off'
+    'N_PLUS_ONE_THRESHOLD': 10,    # runs of one statement shape per request before it is reported
+}
+
+_counters = contextvars.ContextVar('query_counters', default=())
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+class QueryCheckError(Exception):
+    """A request repeated a query shape too often or a view went over budget"""
+
+
+def _config(name):
+    return getattr(settings, 'QUERY_CHECKS', {}).get(name, DEFAULTS[name])
+
+
+def fingerprint(sql):
+    """Statement shape of `sql`: literals, parameters and IN lists as placeholders"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryCounter:
+    """Queries run inside one request or view, by fingerprint"""
+
+    def __init__(self):
+        self.total = 0
+        self.shapes = Counter()
+
+    def add(self, sql):
+        self.total += 1
+        self.shapes[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+def count_queries(execute, sql, params, many, context):
+    for counter in _counters.get():
+        counter.add(sql)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@contextmanager
+def counting(counter):
+    """Add the queries run in this block (and in sync_to_async calls from it) to `counter`"""
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+
+def report(message):
+    if _config('ACTION') == 'raise':
+        raise QueryCheckError(message)
+    logger.warning(message)
+
+
+def check_repeated(counter, label):
+    threshold = _config('N_PLUS_ONE_THRESHOLD')
+    for shape, count in counter.repeated(threshold):
+        report(f'Possible N+1 in {label}: {count} runs of {shape}')
+
+
+def query_budget(limit):
+    """Report a view that runs more than `limit` queries in one call"""
+    def decorator(view, label=None):
+        if isinstance(view, type):
+            view.dispatch = decorator(view.dispatch, label=view.__qualname__)
+            return view
+
+        # @api_view functions are named after the function they wrap on .cls
+        label = label or getattr(getattr(view, 'cls', None), '__name__', view.__qualname__)
+
+        def check(counter):
+            if counter.total > limit:
+                shapes = '; '.join(f'{count}x {shape}' for shape, count in counter.shapes.most_common(3))
+                report(f'{label} ran {counter.total} queries, over its budget of {limit}: {shapes}')
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                if _config('ACTION') == 'off':
+                    return await view(*args, **kwargs)
+                with counting(QueryCounter()) as counter:
+                    response = await view(*args, **kwargs)
+                check(counter)
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if _config('ACTION') == 'off':
+                return view(*args, **kwargs)
+            with counting(QueryCounter()) as counter:
+                response = view(*args, **kwargs)
+            check(counter)
+            return response
+        return wrapper
+    return decorator
+
+
+class QueryCheckMiddleware:
+    """Report statement shapes a request runs more than N_PLUS_ONE_THRESHOLD times.
+
+    Works in sync and async stacks. Queries run while a streaming
+    response is consumed are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if _config('ACTION') == 'off':
+            return self.get_response(request)
+        with counting(QueryCounter()) as counter:
+            response = self.get_response(request)
+        check_repeated(counter, self.label(request))
+        return response
+
+    async def __acall__(self, request):
+        if _config('ACTION') == 'off':
+            return await self.get_response(request)
+        with counting(QueryCounter()) as counter:
+            response = await self.get_response(request)
+        check_repeated(counter, self.label(request))
+        return response
+
+    def label(self, request):
+        match = getattr(request, 'resolver_match', None)
+        name = (match.url_name or match.view_name) if match else request.path
+        return f'{request.method} {name}'
+
+
+class QueryCheckTestRunner(DiscoverRunner):
+    """Test runner that turns query check warnings into errors.
+
+    Tests tagged 'benchmark' only run when asked for with --tag benchmark.
+    """
+
+    def __init__(self, *args, tags=None, exclude_tags=None, **kwargs):
+        if not tags:
+            exclude_tags = [*(exclude_tags or []), 'benchmark']
+        super().__init__(*args, tags=tags, exclude_tags=exclude_tags, **kwargs)
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._query_checks = override_settings(
+            QUERY_CHECKS={**getattr(settings, 'QUERY_CHECKS', {}), 'ACTION': 'raise'}
+        )
+        self._query_checks.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._query_checks.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,159 @@
+"""
+Fractional (LexoRank-style) ordering keys for Kanban cards.
+
+A rank is a base-36 string read as the digits of a fraction in [0, 1), so
+a key can always be generated between any two neighbours and a drag only
+rewrites the moved row. Only lowercase letters are used so the ordering is
+the same under MySQL's case-insensitive collations, and ranks never end in
+'0' so that string order matches numeric order.
+"""
+import threading
+
+from django.db import connections, transaction
+from django.db.models import Max, Q
+
+ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(ALPHABET)
+_VALUES = {char: value for value, char in enumerate(ALPHABET)}
+
+# Columns whose keys grow past this length get renumbered in the background
+REBALANCE_LENGTH = 16
+
+# Keys longer than this are never written; the column is renumbered first.
+# Repeated inserts at one spot grow keys by a character each, faster than a
+# background rebalance may catch up, and Task.rank holds 64 at most.
+MAX_RANK_LENGTH = 48
+
+
+def rank_between(before=None, after=None):
+    """Return a rank sorting strictly between before and after.
+
+    None means the column boundary. Appending steps just past the last key
+    and prepending steps just below the first one, so repeated adds at
+    either end only grow keys by one character every ~35 cards.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f'{before!r} does not sort before {after!r}')
+    if before is None and after is None:
+        return ALPHABET[BASE // 2]
+
+    append = after is None
+    prepend = before is None
+    lower = before or ''
+    upper = after
+    prefix = ''
+    i = 0
+
+    while True:
+        lo = _VALUES[lower[i]] if i < len(lower) else 0
+        hi = _VALUES[upper[i]] if upper is not None and i < len(upper) else BASE
+
+        if lo == hi:
+            prefix += ALPHABET[lo]
+            i += 1
+            continue
+
+        if hi - lo > 1:
+            if append:
+                digit = lo + 1
+            elif prepend:
+                digit = hi - 1
+            else:
+                digit = (lo + hi) // 2
+            return prefix + ALPHABET[digit]
+
+        # Adjacent digits: keep the lower one, the rest only has to beat `before`
+        prefix += ALPHABET[lo]
+        upper = None
+        i += 1
+
+
+def spread_ranks(count):
+    """Return count evenly spaced, increasing ranks of equal width"""
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for position in range(1, count + 1):
+        value = position * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(ALPHABET[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def assign_bottom_ranks(tasks):
+    """Give tasks without a rank places at the bottom of their columns.
+
+    Used before bulk_create and for bulk status changes. Task.save() does
+    this one row at a time; here the current bottom of every affected
+    column is read with a single grouped query.
+    """
+    from .models import Task
+
+    columns = {(task.project_id, task.status) for task in tasks if not task.rank}
+    if not columns:
+        return
+
+    column_filter = Q()
+    for project_id, status in columns:
+        column_filter |= Q(project_id=project_id, status=status)
+    tails = {
+        (row['project_id'], row['status']): row['last']
+        for row in Task.objects.filter(column_filter).order_by()
+        .values('project_id', 'status').annotate(last=Max('rank'))
+    }
+
+    pending = {}
+    for task in tasks:
+        if not task.rank:
+            pending.setdefault((task.project_id, task.status), []).append(task)
+
+    for column, column_tasks in pending.items():
+        tail = rank_between(tails.get(column) or None, None)
+        if len(column_tasks) == 1:
+            column_tasks[0].rank = tail
+        else:
+            # Spread large batches under one new key so ranks stay short
+            for task, suffix in zip(column_tasks, spread_ranks(len(column_tasks))):
+                task.rank = tail + suffix
+
+
+def needs_rebalance(rank):
+    return len(rank) > REBALANCE_LENGTH
+
+
+def rebalance_column(project_id, status):
+    """Renumber every card of one Kanban column with evenly spaced ranks"""
+    from .models import Task, ChangeLog
+
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(project_id=project_id, status=status)
+            .order_by('rank', '-created_at')
+            .only('id', 'rank')
+        )
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+        ChangeLog.record('tasks', [task.id for task in tasks])
+    return len(tasks)
+
+
+def _rebalance_in_background(project_id, status):
+    try:
+        rebalance_column(project_id, status)
+    finally:
+        connections.close_all()
+
+
+def schedule_rebalance(project_id, status):
+    """Rebalance a column on a background thread once the current transaction commits"""
+    transaction.on_commit(lambda: threading.Thread(
+        target=_rebalance_in_background, args=(project_id, status), daemon=True
+    ).start())
@@ -0,0 +1,71 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson else 0
+)
+
+
+def has_non_finite_float(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that serializes with orjson when it is installed.
+
+    orjson handles UUIDs, dates and datetimes natively; anything else
+    (Decimal, timedelta, lazy strings, querysets...) goes through DRF's own
+    encoder. Datetimes and times keep all six microsecond digits and a UTC
+    offset becomes "Z", exactly as DRF's encoder writes them (it is Django's
+    DjangoJSONEncoder, not DRF's, that cuts them to milliseconds). The only
+    difference in the bytes is float exponents, which orjson writes without
+    a sign or padding (1e16, 1e-7 where the stdlib writes 1e+16, 1e-07);
+    they decode to the same numbers.
+
+    Anything orjson rejects, such as integers wider than 64 bits, is
+    rendered by JSONRenderer instead, and so is data holding NaN or
+    infinity, which orjson would silently turn into null while JSONRenderer
+    refuses it. Pretty-printing (indent) and ASCII-only output also use the
+    stdlib implementation.
+    """
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if (orjson is None or self.ensure_ascii or not self.compact or
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinity as null, so only output with a null can hide one
+        if b'null' in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, like JSONRenderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,178 @@
+"""
+Revocation store for refresh tokens.
+
+Rotated and logged-out refresh tokens are recorded in RevokedToken. Each
+process also keeps a Bloom filter of the revoked JTIs, so checking a token
+that was never revoked (the common case) costs no query; only a positive
+filter hit is confirmed against the table.
+
+The filter is built from the table on first use, extended by revocations
+made in this process and caught up with those made by other processes at
+most TOKEN_REVOCATION['SYNC_INTERVAL'] seconds apart.
+
+Revoking is an INSERT on the JTI primary key, and it doubles as the check
+that the token was still live: when two requests rotate the same refresh
+token at once, only one insert succeeds and the other refresh fails.
+
+Compaction deletes rows of tokens that have expired anyway and rebuilds
+the filter, so both stay bounded by the number of live revoked tokens. It
+is not run on the request path; schedule the compact_revoked_tokens
+command (e.g. hourly from cron).
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+DEFAULTS = {
+    'CAPACITY': 100000,       # JTIs the filter holds before it is rebuilt larger
+    'ERROR_RATE': 0.001,      # false positive rate at capacity
+    'SYNC_INTERVAL': 5,       # seconds between catching up with other processes
+}
+
+
+def _config(name):
+    return getattr(settings, 'TOKEN_REVOCATION', {}).get(name, DEFAULTS[name])
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * step) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationStore:
+    """Revoked refresh-token JTIs: the RevokedToken table behind a Bloom filter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the filter and counters; the filter is rebuilt from the table on next use"""
+        with self._lock:
+            self.counters = {'filter_negatives': 0, 'db_checks': 0, 'false_positives': 0,
+                             'revocations': 0, 'rebuilds': 0}
+            self._filter = None
+            self._synced_at = None
+            self._next_sync = 0.0
+
+    def _rebuild(self):
+        now = timezone.now()
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', flat=True))
+        bloom = BloomFilter(max(_config('CAPACITY'), 2 * len(jtis)), _config('ERROR_RATE'))
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._synced_at = now
+        self._next_sync = time.monotonic() + _config('SYNC_INTERVAL')
+        self.counters['rebuilds'] += 1
+
+    def _add(self, jti):
+        self._filter.add(jti)
+        if self._filter.count > self._filter.capacity:
+            self._rebuild()
+
+    def _sync(self):
+        """Build the filter on first use, then pick up other processes' revocations"""
+        with self._lock:
+            if self._filter is None:
+                self._rebuild()
+                return
+            if time.monotonic() < self._next_sync:
+                return
+            now = timezone.now()
+            # Overlap the previous window so rows committed late are not missed
+            since = self._synced_at - timedelta(seconds=_config('SYNC_INTERVAL'))
+            for jti in RevokedToken.objects.filter(revoked_at__gte=since).values_list('jti', flat=True):
+                self._add(jti)
+            self._synced_at = now
+            self._next_sync = time.monotonic() + _config('SYNC_INTERVAL')
+
+    def revoke(self, jti, expires_at):
+        """Record jti as revoked; False if it already was"""
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        with self._lock:
+            self.counters['revocations'] += 1
+            if self._filter is not None:
+                self._add(jti)
+        return True
+
+    def is_revoked(self, jti):
+        self._sync()
+        with self._lock:
+            if jti not in self._filter:
+                self.counters['filter_negatives'] += 1
+                return False
+            self.counters['db_checks'] += 1
+
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        if not revoked:
+            with self._lock:
+                self.counters['false_positives'] += 1
+        return revoked
+
+    def compact(self):
+        """Delete JTIs of expired tokens and rebuild the filter without them"""
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        with self._lock:
+            self._rebuild()
+        return deleted
+
+    def stats(self):
+        with self._lock:
+            size = self._filter.count if self._filter is not None else 0
+            return dict(self.counters, size=size)
+
+
+revocation_store = RevocationStore()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """RefreshToken checked against and revoked through revocation_store"""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if revocation_store.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        # A lost insert race means another request rotated or revoked this token first
+        if not revocation_store.revoke(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp'])):
+            raise TokenError(_("Token is blacklisted"))
@@ -1,7 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
-from .models import User, Project, Task, TimeEntry, Comment, Notification, Attachment, ActivityLog
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.manager import BaseManager
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from .models import User, Project, Task, TimeEntry, Comment, Notification, Attachment, ActivityLog, load_related
+from .previews import has_preview
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -71,10 +76,18 @@ class UserLoginSerializer(serializers.Serializer):
         return attrs
 
 
+class TeamMemberListSerializer(serializers.ListSerializer):
+    """Project members in user id order, prefetched or not, as FastProjectSerializer reads them"""
+
+    def to_representation(self, data):
+        members = data.all() if isinstance(data, BaseManager) else data
+        return super().to_representation(sorted(members, key=lambda user: user.pk))
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     """Serializer for Project model"""
     created_by = UserSerializer(read_only=True)
-    team_members = UserSerializer(many=True, read_only=True)
+    team_members = TeamMemberListSerializer(child=UserSerializer(), read_only=True)
     team_member_ids = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), many=True, write_only=True, required=False
     )
@@ -86,7 +99,23 @@ class ProjectSerializer(serializers.ModelSerializer):
                  'team_members', 'team_member_ids', 'task_count', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load everything this serializer reads for a list of projects in a fixed number of queries"""
+        # A correlated count rather than a GROUP BY, which would drop the default ordering
+        task_count = Task.objects.filter(project=OuterRef('pk')).order_by().values('project').annotate(
+            count=Count('pk')
+        ).values('count')
+        return queryset.select_related('created_by').prefetch_related(
+            Prefetch('team_members', queryset=User.objects.order_by('id'))
+        ).annotate(
+            task_count=Coalesce(Subquery(task_count), 0)
+        )
+    
     def get_task_count(self, obj):
+        # Annotated by setup_eager_loading; counted one project at a time otherwise
+        if hasattr(obj, 'task_count'):
+            return obj.task_count
         return obj.tasks.count()
     
     def create(self, validated_data):
@@ -121,8 +150,20 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'title', 'description', 'status', 'priority', 'project', 'project_id',
                  'assigned_to', 'assigned_to_id', 'created_by', 'due_date', 'estimated_hours',
-                 'actual_hours', 'time_spent', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+                 'actual_hours', 'time_spent', 'rank', 'completed_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_by', 'rank', 'completed_at', 'created_at', 'updated_at']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load everything this serializer reads for a list of tasks in a fixed number of queries.
+
+        The project is prefetched rather than joined so it can carry the
+        annotations of ProjectSerializer.setup_eager_loading.
+        """
+        return queryset.select_related('assigned_to', 'created_by').prefetch_related(
+            'time_entries',
+            Prefetch('project', queryset=ProjectSerializer.setup_eager_loading(Project.objects.all())),
+        )
     
     def get_time_spent(self, obj):
         return sum(entry.duration_hours or 0 for entry in obj.time_entries.all())
@@ -131,29 +172,25 @@ class TaskSerializer(serializers.ModelSerializer):
         assigned_to_id = validated_data.pop('assigned_to_id', None)
         project_id = validated_data.pop('project_id', None)
         
-        task = Task.objects.create(**validated_data)
-        
+        # Resolve relations before the INSERT so the row is written once
         if assigned_to_id:
-            task.assigned_to = assigned_to_id
+            validated_data['assigned_to'] = assigned_to_id
         if project_id:
-            task.project = project_id
+            validated_data['project'] = project_id
         
-        task.save()
-        return task
+        return Task.objects.create(**validated_data)
     
     def update(self, instance, validated_data):
         assigned_to_id = validated_data.pop('assigned_to_id', None)
         project_id = validated_data.pop('project_id', None)
         
-        instance = super().update(instance, validated_data)
-        
+        # Fold relation changes into the single save done by super().update
         if assigned_to_id is not None:
-            instance.assigned_to = assigned_to_id
+            validated_data['assigned_to'] = assigned_to_id
         if project_id is not None:
-            instance.project = project_id
+            validated_data['project'] = project_id
         
-        instance.save()
-        return instance
+        return super().update(instance, validated_data)
 
 
 class TimeEntrySerializer(serializers.ModelSerializer):
@@ -168,6 +205,13 @@ class TimeEntrySerializer(serializers.ModelSerializer):
                  'duration_hours', 'description', 'created_at']
         read_only_fields = ['id', 'user', 'duration_hours', 'created_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the user and the serialized task of every row up front"""
+        return queryset.select_related('user').prefetch_related(
+            Prefetch('task', queryset=TaskSerializer.setup_eager_loading(Task.objects.all()))
+        )
+    
     def create(self, validated_data):
         task_id = validated_data.pop('task_id')
         time_entry = TimeEntry.objects.create(task=task_id, **validated_data)
@@ -185,6 +229,13 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'task', 'task_id', 'user', 'content', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the user and the serialized task of every row up front"""
+        return queryset.select_related('user').prefetch_related(
+            Prefetch('task', queryset=TaskSerializer.setup_eager_loading(Task.objects.all()))
+        )
+    
     def create(self, validated_data):
         task_id = validated_data.pop('task_id')
         comment = Comment.objects.create(task=task_id, **validated_data)
@@ -203,12 +254,21 @@ class AttachmentSerializer(serializers.ModelSerializer):
     """Serializer for Attachment model"""
     uploaded_by = UserSerializer(read_only=True)
     task_id = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), write_only=True)
+    preview_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Attachment
         fields = ['id', 'task_id', 'uploaded_by', 'file_name', 'file_size', 
-                 'file_type', 'file_url', 'uploaded_at']
-        read_only_fields = ['id', 'uploaded_by', 'uploaded_at']
+                 'file_type', 'file_url', 'content_hash', 'preview_url', 'uploaded_at']
+        read_only_fields = ['id', 'uploaded_by', 'content_hash', 'uploaded_at']
+    
+    def get_preview_url(self, obj):
+        # None until the background worker has rendered the preview
+        if not has_preview(obj.content_hash):
+            return None
+        url = reverse('attachment-preview', kwargs={'pk': obj.id})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
     
     def create(self, validated_data):
         task_id = validated_data.pop('task_id')
@@ -216,6 +276,21 @@ class AttachmentSerializer(serializers.ModelSerializer):
         return attachment
 
 
+class ActivityLogListSerializer(serializers.ListSerializer):
+    """Loads the users, tasks and projects of a page of logs with one query each.
+
+    Log rows hold plain ids (they may be in another database), so
+    select_related cannot be used on them.
+    """
+    def to_representation(self, data):
+        logs = load_related(
+            data, 'user',
+            task=TaskSerializer.setup_eager_loading(Task.objects.all()),
+            project=ProjectSerializer.setup_eager_loading(Project.objects.all()),
+        )
+        return super().to_representation(logs)
+
+
 class ActivityLogSerializer(serializers.ModelSerializer):
     """Serializer for ActivityLog model"""
     user = UserSerializer(read_only=True)
@@ -224,6 +299,7 @@ class ActivityLogSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ActivityLog
+        list_serializer_class = ActivityLogListSerializer
         fields = ['id', 'user', 'task', 'project', 'action', 'description', 
                  'metadata', 'created_at']
         read_only_fields = ['id', 'user', 'created_at']
@@ -0,0 +1,87 @@
+from rest_framework import serializers
+from .models import Task
+
+
+class BulkTaskFieldsSerializer(serializers.Serializer):
+    """Task fields accepted by bulk create/update operations.
+
+    References are plain UUIDs so a whole batch can be resolved with one
+    query per model instead of one PrimaryKeyRelatedField lookup per row.
+    """
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    status = serializers.ChoiceField(choices=Task.TASK_STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    project_id = serializers.UUIDField(required=False, allow_null=True)
+    assigned_to_id = serializers.UUIDField(required=False, allow_null=True)
+    due_date = serializers.DateTimeField(required=False, allow_null=True)
+    estimated_hours = serializers.FloatField(required=False, allow_null=True, min_value=0.1)
+    actual_hours = serializers.FloatField(required=False, min_value=0)
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    """A single operation inside a bulk task request"""
+    OPERATION_CHOICES = ['create', 'update', 'delete', 'status']
+
+    op = serializers.ChoiceField(choices=OPERATION_CHOICES)
+    id = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(choices=Task.TASK_STATUS_CHOICES, required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        op = attrs['op']
+
+        if op != 'create' and not attrs.get('id'):
+            raise serializers.ValidationError({'id': f'id is required for {op} operations'})
+        if op == 'status' and not attrs.get('status'):
+            raise serializers.ValidationError({'status': 'status is required for status operations'})
+
+        if op in ('create', 'update'):
+            fields = BulkTaskFieldsSerializer(data=attrs.get('data') or {}, partial=(op == 'update'))
+            if not fields.is_valid():
+                raise serializers.ValidationError({'data': fields.errors})
+            attrs['data'] = fields.validated_data
+        else:
+            attrs['data'] = {}
+
+        return attrs
+
+
+class BulkTaskRequestSerializer(serializers.Serializer):
+    """Envelope for POST /api/tasks/bulk/"""
+    MAX_OPERATIONS = 500
+
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_OPERATIONS
+    )
+
+
+class TaskImportRowSerializer(serializers.Serializer):
+    """One row of a task import file.
+
+    The project is given by title and the assignee by email; both are
+    resolved for a whole batch at once by api.importer.
+    """
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True)
+    status = serializers.ChoiceField(choices=Task.TASK_STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    project = serializers.CharField(max_length=200, required=False)
+    assigned_to = serializers.EmailField(required=False)
+    due_date = serializers.DateTimeField(required=False)
+    estimated_hours = serializers.FloatField(required=False, min_value=0.1)
+    actual_hours = serializers.FloatField(required=False, min_value=0)
+
+
+class TimeEntryImportRowSerializer(serializers.Serializer):
+    """One row of a time entry import file (user defaults to the importer)"""
+    task_id = serializers.UUIDField()
+    user = serializers.EmailField(required=False)
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField(required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if attrs.get('end_time') and attrs['end_time'] < attrs['start_time']:
+            raise serializers.ValidationError({'end_time': 'end_time must be after start_time'})
+        return attrs
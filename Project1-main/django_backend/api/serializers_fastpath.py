@@ -0,0 +1,235 @@
+"""
+Read-only fast-path serializers for hot list endpoints.
+
+Each fast serializer mirrors a ModelSerializer in serializers.py. The field
+list is compiled once into a flat values_list() column list, so a page of
+rows is read with a single query (plus one batched query per computed
+field) and turned into dicts without instantiating a serializer per row.
+
+The output must stay identical to the ModelSerializer it mirrors;
+api/tests/test_fastpath.py enforces that contract.
+"""
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import User, Project, Task, TimeEntry, Notification
+
+
+# Converters replicating the to_representation of the matching DRF fields.
+# None is handled before a converter is called.
+def text(value):
+    return str(value)
+
+
+def raw(value):
+    return value
+
+
+def uuid_str(value):
+    return str(value)
+
+
+def boolean(value):
+    return bool(value)
+
+
+def floating(value):
+    return float(value)
+
+
+def iso_datetime(value):
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    else:
+        value = timezone.make_aware(value, timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class Column:
+    """A model column read through values_list()"""
+    def __init__(self, convert=raw, source=None):
+        self.convert = convert
+        self.source = source
+
+
+class Nested:
+    """A foreign key rendered by another fast serializer (None when the key is null)"""
+    def __init__(self, serializer_class, source=None):
+        self.serializer_class = serializer_class
+        self.source = source
+
+
+class Computed:
+    """A value loaded for a batch of object ids by the named serializer method"""
+    def __init__(self, loader, default=None):
+        self.loader = loader
+        self.default = default
+
+
+class FastSerializer:
+    """Base class; subclasses declare `fields` as (name, Column|Nested|Computed) pairs"""
+    model = None
+    fields = ()
+
+    def __init__(self, prefix=''):
+        self.columns = []
+        self.plan = []
+        for name, spec in self.fields:
+            if isinstance(spec, Nested):
+                child = spec.serializer_class(prefix + (spec.source or name) + '__')
+                self.plan.append((name, 'nested', (len(self.columns), child)))
+                self.columns += child.columns
+            elif isinstance(spec, Computed):
+                self.plan.append((name, 'computed', spec))
+            else:
+                self.plan.append((name, 'column', (len(self.columns), spec.convert)))
+                self.columns.append(prefix + (spec.source or name))
+        self.id_index = self.columns.index(prefix + 'id')
+
+    def rows(self, queryset):
+        """values_list() queryset holding exactly the columns this serializer reads"""
+        return queryset.values_list(*self.columns)
+
+    def serialize(self, rows):
+        """Turn values_list() rows into representation dicts"""
+        pending = {}
+        data = [self._build(row, 0, pending) for row in rows]
+
+        for (serializer, name, spec), targets in pending.items():
+            values = getattr(serializer, spec.loader)({object_id for _, object_id in targets})
+            for item, object_id in targets:
+                item[name] = values.get(object_id, spec.default)
+        return data
+
+    def _build(self, row, offset, pending):
+        item = {}
+        for name, kind, payload in self.plan:
+            if kind == 'column':
+                index, convert = payload
+                value = row[offset + index]
+                item[name] = None if value is None else convert(value)
+            elif kind == 'nested':
+                index, child = payload
+                if row[offset + index + child.id_index] is None:
+                    item[name] = None
+                else:
+                    item[name] = child._build(row, offset + index, pending)
+            else:
+                item[name] = payload.default
+                object_id = row[offset + self.id_index]
+                pending.setdefault((self, name, payload), []).append((item, object_id))
+        return item
+
+
+class FastUserSerializer(FastSerializer):
+    """Mirrors UserSerializer"""
+    model = User
+    fields = (
+        ('id', Column(uuid_str)),
+        ('email', Column(text)),
+        ('name', Column(text)),
+        ('role', Column(raw)),
+        ('avatar', Column(text)),
+        ('is_active', Column(boolean)),
+        ('created_at', Column(iso_datetime)),
+    )
+
+
+class FastProjectSerializer(FastSerializer):
+    """Mirrors ProjectSerializer"""
+    model = Project
+    fields = (
+        ('id', Column(uuid_str)),
+        ('title', Column(text)),
+        ('description', Column(text)),
+        ('status', Column(raw)),
+        ('deadline', Column(iso_datetime)),
+        ('created_by', Nested(FastUserSerializer)),
+        ('team_members', Computed('load_team_members', default=())),
+        ('task_count', Computed('load_task_count', default=0)),
+        ('created_at', Column(iso_datetime)),
+        ('updated_at', Column(iso_datetime)),
+    )
+
+    def load_team_members(self, project_ids):
+        members = FastUserSerializer('user__')
+        rows = (
+            Project.team_members.through.objects
+            .filter(project_id__in=project_ids)
+            # Same member order as ProjectSerializer's TeamMemberListSerializer
+            .order_by('project_id', 'user_id')
+            .values_list('project_id', *members.columns)
+        )
+        result = {}
+        for row in rows:
+            result.setdefault(row[0], []).append(members._build(row, 1, {}))
+        return result
+
+    def load_task_count(self, project_ids):
+        return dict(
+            Task.objects.filter(project_id__in=project_ids).order_by()
+            .values('project_id').annotate(count=Count('id'))
+            .values_list('project_id', 'count')
+        )
+
+
+class FastTaskSerializer(FastSerializer):
+    """Mirrors TaskSerializer"""
+    model = Task
+    fields = (
+        ('id', Column(uuid_str)),
+        ('title', Column(text)),
+        ('description', Column(text)),
+        ('status', Column(raw)),
+        ('priority', Column(raw)),
+        ('project', Nested(FastProjectSerializer)),
+        ('assigned_to', Nested(FastUserSerializer)),
+        ('created_by', Nested(FastUserSerializer)),
+        ('due_date', Column(iso_datetime)),
+        ('estimated_hours', Column(floating)),
+        ('actual_hours', Column(floating)),
+        ('time_spent', Computed('load_time_spent', default=0)),
+        ('rank', Column(text)),
+        ('completed_at', Column(iso_datetime)),
+        ('created_at', Column(iso_datetime)),
+        ('updated_at', Column(iso_datetime)),
+    )
+
+    def load_time_spent(self, task_ids):
+        # Same entry order and summation as TaskSerializer.get_time_spent
+        durations = {}
+        rows = TimeEntry.objects.filter(task_id__in=task_ids).values_list('task_id', 'duration_hours')
+        for task_id, duration in rows:
+            durations.setdefault(task_id, []).append(duration or 0)
+        return {task_id: sum(values) for task_id, values in durations.items()}
+
+
+class FastTimeEntrySerializer(FastSerializer):
+    """Mirrors TimeEntrySerializer"""
+    model = TimeEntry
+    fields = (
+        ('id', Column(uuid_str)),
+        ('task', Nested(FastTaskSerializer)),
+        ('user', Nested(FastUserSerializer)),
+        ('start_time', Column(iso_datetime)),
+        ('end_time', Column(iso_datetime)),
+        ('duration_hours', Column(floating)),
+        ('description', Column(text)),
+        ('created_at', Column(iso_datetime)),
+    )
+
+
+class FastNotificationSerializer(FastSerializer):
+    """Mirrors NotificationSerializer"""
+    model = Notification
+    fields = (
+        ('id', Column(uuid_str)),
+        ('title', Column(text)),
+        ('message', Column(text)),
+        ('notification_type', Column(raw)),
+        ('is_read', Column(boolean)),
+        ('created_at', Column(iso_datetime)),
+    )
@@ -6,6 +6,8 @@ import datetime
 
 class TaskTimerSerializer(serializers.ModelSerializer):
     """Serializer for TaskTimer model"""
+    task = serializers.UUIDField(source='task_id', read_only=True)
+    user = serializers.UUIDField(source='user_id', read_only=True)
     task_title = serializers.CharField(source='task.title', read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
     
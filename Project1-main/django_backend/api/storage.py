@@ -0,0 +1,188 @@
+"""
+Local content-addressed storage for attachment files.
+
+Finished uploads are stored once per distinct content under
+MEDIA_ROOT/attachments/<aa>/<bb>/<sha256>, so the same file attached to
+several tasks takes the disk space of one, and so does its preview under
+MEDIA_ROOT/previews (see api.previews). Uploads in progress live in
+MEDIA_ROOT/uploads/<session id>.part until their last chunk arrives.
+Every read and write goes through fixed-size blocks; no file is ever held
+in memory as a whole.
+
+A blob is only moved into place once the Attachment referring to it has
+committed, and release_blob() renames a blob aside before re-checking for
+references. Between them, an upload and the deletion of the last other
+attachment with the same content can interleave in any order and the blob
+still ends up present. Blobs are released after every Attachment delete
+has committed, including deletes cascaded from a task or project.
+"""
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+BLOCK_SIZE = 64 * 1024
+
+# Largest attachment accepted by the upload endpoints
+MAX_ATTACHMENT_SIZE = 100 * 1024 * 1024
+
+
+def _root(*parts):
+    return os.path.join(settings.MEDIA_ROOT, *parts)
+
+
+def blob_path(content_hash):
+    return _root('attachments', content_hash[:2], content_hash[2:4], content_hash)
+
+
+def preview_path(content_hash):
+    return _root('previews', content_hash[:2], content_hash[2:4], f'{content_hash}.png')
+
+
+def part_path(session_id):
+    return _root('uploads', f'{session_id}.part')
+
+
+def write_chunk(session_id, offset, stream, length):
+    """Copy `length` bytes from stream into the part file at offset.
+
+    Returns the number of bytes written. Only bytes below the session's
+    `received` count, which the caller advances afterwards, are trusted, so
+    a short read (client went away) leaves nothing that matters behind.
+    """
+    path = part_path(session_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # O_CREAT without O_TRUNC: concurrent requests each write their own range
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT, 0o644), 'wb') as part:
+        part.seek(offset)
+        written = 0
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            part.write(block)
+            written += len(block)
+    return written
+
+
+def discard_part(session_id):
+    try:
+        os.remove(part_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def hash_part(session_id, size):
+    """SHA-256 of the first `size` bytes of a part file, which is cut to that length"""
+    path = part_path(session_id)
+    digest = hashlib.sha256()
+    with open(path, 'r+b') as part:
+        part.truncate(size)
+        for block in iter(lambda: part.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def commit_part(session_id, content_hash):
+    """Move a hashed part file into blob storage once the current transaction commits.
+
+    An existing blob with the same content is replaced rather than reused:
+    release_blob() may be removing it at this very moment.
+    """
+    path = part_path(session_id)
+    destination = blob_path(content_hash)
+
+    def store():
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(path, destination)
+    transaction.on_commit(store)
+
+
+def release_blob(content_hash):
+    """Delete a blob and its preview once no attachment refers to them any more.
+
+    A preview deleted just as an upload of the same content commits is
+    missing until the generate_previews command renders it again.
+    """
+    from .models import Attachment
+
+    references = Attachment.objects.filter(content_hash=content_hash)
+    if not content_hash or references.exists():
+        return
+    path = blob_path(content_hash)
+    doomed = f'{path}.{uuid.uuid4().hex}.deleting'
+    try:
+        os.replace(path, doomed)
+    except FileNotFoundError:
+        return
+    # An upload of the same content may have committed since the first check
+    if references.exists():
+        os.replace(doomed, path)
+        return
+    os.remove(doomed)
+    try:
+        os.remove(preview_path(content_hash))
+    except FileNotFoundError:
+        pass
+
+
+@receiver(post_delete, sender='api.Attachment')
+def release_deleted_blob(sender, instance, **kwargs):
+    # After commit, so a rolled back delete keeps its file and the re-check sees committed rows
+    content_hash = instance.content_hash
+    if content_hash:
+        transaction.on_commit(lambda: release_blob(content_hash))
+
+
+class FileRange:
+    """Read-only view of `length` bytes of an open file starting at `start`.
+
+    Wrapped in a FileResponse for 206 responses. It deliberately has no
+    fileno(), so WSGI servers copy just this slice instead of sendfile()ing
+    the file to its end.
+    """
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single `bytes=` range header.
+
+    Returns None when the header is absent or not a single byte range (the
+    whole file is then sent) and raises ValueError when the range cannot be
+    satisfied.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
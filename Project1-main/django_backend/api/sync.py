@@ -0,0 +1,185 @@
+"""
+Change tracking for incremental client sync.
+
+Every save/delete of a synced model appends a ChangeLog row through the
+signal handlers below. Code paths that write with bulk_create, bulk_update
+or QuerySet.update() bypass signals and must call ChangeLog.record().
+
+ChangeLog ids are handed out when a row is inserted, not when its
+transaction commits, so a slow transaction can commit id 10 after id 11 is
+already visible. A client whose cursor had moved to 11 would never see 10.
+Cursors therefore only advance over entries older than
+CHANGE_SYNC['SETTLE_WINDOW'] seconds, by which time every transaction that
+took an earlier id is assumed to have committed. Newer entries are still
+returned and come again in the next response, which is harmless since
+applying an upsert or tombstone twice is a no-op for the client.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ChangeLog, Project, Task, Comment, TimeEntry, Notification
+from .serializers import (
+    ProjectSerializer, TaskSerializer, CommentSerializer,
+    TimeEntrySerializer, NotificationSerializer
+)
+from .views_calendar import visible_tasks
+
+# Feed key -> model class
+SYNC_MODELS = {
+    'tasks': Task,
+    'projects': Project,
+    'comments': Comment,
+    'time_entries': TimeEntry,
+    'notifications': Notification,
+}
+MODEL_KEYS = {model: key for key, model in SYNC_MODELS.items()}
+
+DEFAULTS = {
+    'SETTLE_WINDOW': 5,  # seconds a change-log entry must age before a cursor passes it
+}
+
+
+def _config(name):
+    return getattr(settings, 'CHANGE_SYNC', {}).get(name, DEFAULTS[name])
+
+
+def _settled_before():
+    return timezone.now() - timedelta(seconds=_config('SETTLE_WINDOW'))
+
+
+@receiver(post_save)
+def log_save(sender, instance, **kwargs):
+    key = MODEL_KEYS.get(sender)
+    if key and not kwargs.get('raw'):
+        ChangeLog.objects.create(model=key, object_id=instance.pk, action='upserted')
+
+
+@receiver(post_delete)
+def log_delete(sender, instance, **kwargs):
+    key = MODEL_KEYS.get(sender)
+    if key:
+        ChangeLog.objects.create(model=key, object_id=instance.pk, action='deleted')
+
+
+def log_project_resync(project_ids):
+    """Log an upsert for the projects and everything in them.
+
+    Membership decides who may see a project's tasks, comments and time
+    entries, so all of them must reach clients that just gained access and
+    turn into tombstones for those that lost it.
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+    task_ids = list(Task.objects.filter(project_id__in=project_ids).values_list('id', flat=True))
+    ChangeLog.record('projects', project_ids)
+    ChangeLog.record('tasks', task_ids)
+    ChangeLog.record('comments', Comment.objects.filter(task_id__in=task_ids).values_list('id', flat=True))
+    ChangeLog.record('time_entries', TimeEntry.objects.filter(task_id__in=task_ids).values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def log_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.projects.add(...) and friends; clear() has to be caught before it runs
+        if action == 'pre_clear':
+            instance._cleared_project_ids = list(instance.projects.values_list('id', flat=True))
+        elif action == 'post_clear':
+            log_project_resync(instance.__dict__.pop('_cleared_project_ids', []))
+        elif action in ('post_add', 'post_remove'):
+            log_project_resync(pk_set)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        log_project_resync([instance.pk])
+
+
+def visible_rows(user, key):
+    """Queryset of rows of one synced model the user may see, ready to serialize"""
+    is_scrum_master = user.role == 'SCRUM_MASTER'
+
+    if key == 'tasks':
+        return TaskSerializer.setup_eager_loading(visible_tasks(user))
+    if key == 'projects':
+        queryset = Project.objects.all() if is_scrum_master else Project.objects.filter(team_members=user)
+        return ProjectSerializer.setup_eager_loading(queryset)
+    if key == 'comments':
+        return CommentSerializer.setup_eager_loading(Comment.objects.filter(
+            task__in=visible_tasks(user).values('id')
+        ))
+    if key == 'time_entries':
+        queryset = TimeEntry.objects.all() if is_scrum_master else TimeEntry.objects.filter(user=user)
+        return TimeEntrySerializer.setup_eager_loading(queryset)
+    if key == 'notifications':
+        return Notification.objects.filter(user_id=user.pk)
+    raise KeyError(key)
+
+
+SERIALIZERS = {
+    'tasks': TaskSerializer,
+    'projects': ProjectSerializer,
+    'comments': CommentSerializer,
+    'time_entries': TimeEntrySerializer,
+    'notifications': NotificationSerializer,
+}
+
+
+def changes_since(user, since, limit):
+    """Collapse the change log after `since` into current rows and tombstones.
+
+    Returns (cursor, has_more, changes, deleted). Rows that changed but are
+    no longer visible to the user are reported as deleted for this client.
+    The cursor stops before the first entry still inside the settle window.
+    """
+    entries = list(
+        ChangeLog.objects.filter(id__gt=since)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'action', 'created_at')[:limit]
+    )
+    settled_before = _settled_before()
+    cursor = since
+    for entry_id, _, _, _, created_at in entries:
+        if created_at > settled_before:
+            break
+        cursor = entry_id
+
+    # Last action per object wins
+    latest = {}
+    for _, model, object_id, action, _ in entries:
+        latest[(model, object_id)] = action
+
+    changes = {key: [] for key in SYNC_MODELS}
+    deleted = {key: [] for key in SYNC_MODELS}
+    for key in SYNC_MODELS:
+        upserted = [object_id for (model, object_id), action in latest.items()
+                    if model == key and action == 'upserted']
+        removed = [object_id for (model, object_id), action in latest.items()
+                   if model == key and action == 'deleted']
+
+        if upserted:
+            rows = list(visible_rows(user, key).filter(pk__in=upserted))
+            changes[key] = SERIALIZERS[key](rows, many=True).data
+            found = {row.pk for row in rows}
+            removed += [object_id for object_id in upserted if object_id not in found]
+
+        deleted[key] = removed
+
+    # A full page that could not move the cursor only settles with time, not by asking again
+    return cursor, len(entries) == limit and cursor > since, changes, deleted
+
+
+def settled_cursor():
+    """Newest cursor a client may start from after loading its collections in full"""
+    fresh = ChangeLog.objects.filter(created_at__gt=_settled_before()).aggregate(first=Min('id'))['first']
+    if fresh is not None:
+        return fresh - 1
+    return ChangeLog.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+
+def oldest_cursor():
+    """Lowest cursor still covered by the (pruned) change log"""
+    first = ChangeLog.objects.order_by('id').values_list('id', flat=True).first()
+    return (first - 1) if first else None
@@ -0,0 +1,88 @@
+import json
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, AsyncRequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import views_async
+from api.authentication import user_cache
+from api.models import User, Project, Task, TimeEntry, ActivityLog, Notification
+
+
+class AsyncReadViewTests(TestCase):
+    """Tests for the async variants of the read-heavy endpoints"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        project = Project.objects.create(title='Project', created_by=self.user)
+        project.team_members.add(self.user)
+        task = Task.objects.create(title='Task', project=project, created_by=self.user,
+                                   assigned_to=self.user, due_date=timezone.now() - timedelta(days=1))
+        Task.objects.create(title='Done', project=project, created_by=self.user, status='done')
+
+        now = timezone.now()
+        TimeEntry.objects.create(task=task, user=self.user, start_time=now - timedelta(hours=3),
+                                 end_time=now - timedelta(hours=1))
+        TimeEntry.objects.create(task=task, user=self.user, start_time=now)
+        Notification.objects.create(user=self.user, title='Ping', message='Hello',
+                                    notification_type='task_assigned')
+        ActivityLog.objects.create(user=self.user, task=task, project=project,
+                                   action='created', description='Created task')
+
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.factory = AsyncRequestFactory()
+
+    def call(self, view, method='get', token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        request = getattr(self.factory, method)('/api/', headers=headers)
+        return async_to_sync(view)(request)
+
+    def test_responses_match_sync_views(self):
+        """Test that each async view returns the same body as its sync view"""
+        for name, view in (('auth-me', views_async.me_view),
+                           ('dashboard-stats', views_async.dashboard_stats),
+                           ('active-timer', views_async.active_timer),
+                           ('notification-summary', views_async.notification_summary),
+                           ('recent-activity', views_async.recent_activity)):
+            expected = self.client.get(reverse(name))
+            self.assertEqual(expected.status_code, status.HTTP_200_OK, name)
+
+            response = self.call(view, token=self.token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content), name)
+
+    def test_authentication_is_required(self):
+        """Test the 401 and 405 responses of the async views"""
+        response = self.call(views_async.me_view)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+        response = self.call(views_async.me_view, token='not-a-token')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(json.loads(response.content)['code'], 'token_not_valid')
+
+        response = self.call(views_async.me_view, method='post', token=self.token)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_cached_user_skips_database(self):
+        """Test that async authentication goes through the user cache"""
+        self.call(views_async.me_view, token=self.token)
+        with self.assertNumQueries(0):
+            response = self.call(views_async.me_view, token=self.token)
+        self.assertEqual(json.loads(response.content)['email'], 'employee@example.com')
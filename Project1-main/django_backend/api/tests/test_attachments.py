@@ -0,0 +1,267 @@
+from django.test import TestCase, override_settings
+from unittest import mock, skipUnless
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from api.models import User, Project, Task, Attachment, UploadSession
+from api import previews
+from api.previews import Image, has_preview
+from api.storage import blob_path, release_blob, write_chunk
+
+
+class AttachmentTestCase(TestCase):
+    """Users, tasks and upload helpers shared by the attachment tests"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, PREVIEW_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@example.com',
+            password='password123',
+            name='Outsider',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Files', created_by=self.user)
+        self.project.team_members.add(self.user)
+        self.task = Task.objects.create(title='With files', project=self.project, created_by=self.user)
+        self.other_task = Task.objects.create(title='Also files', project=self.project, created_by=self.user)
+
+        self.content = bytes(range(256)) * 40
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def start(self, task=None, file_type='application/octet-stream'):
+        response = self.client.post(reverse('attachment-upload-create'), {
+            'task_id': str((task or self.task).id),
+            'file_name': 'data.bin',
+            'file_type': file_type,
+            'file_size': len(self.content),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return reverse('attachment-upload', kwargs={'pk': response.data['id']})
+
+    def send(self, url, start, end):
+        # The blob is moved into place, and previews queued, once the upload commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.generic('PUT', url, self.content[start:end + 1],
+                                       content_type='application/octet-stream',
+                                       HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}')
+
+    def upload(self, task=None):
+        url = self.start(task)
+        self.send(url, 0, 4095)
+        return self.send(url, 4096, len(self.content) - 1)
+
+
+class AttachmentStorageTests(AttachmentTestCase):
+    """Tests for chunked uploads, content-addressed storage and ranged downloads"""
+
+    def test_chunked_upload_can_resume(self):
+        """Test that chunks are appended in order and a session reports its progress"""
+        url = self.start()
+        self.assertEqual(self.send(url, 0, 4095).data['received'], 4096)
+
+        # Resending from the wrong offset is refused with the current progress
+        response = self.send(url, 0, 4095)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.get(url).data['received'], 4096)
+
+        response = self.send(url, 4096, len(self.content) - 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        digest = hashlib.sha256(self.content).hexdigest()
+        attachment = Attachment.objects.get()
+        self.assertEqual((attachment.content_hash, attachment.file_size), (digest, len(self.content)))
+        with open(blob_path(digest), 'rb') as blob:
+            self.assertEqual(blob.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_identical_files_are_stored_once(self):
+        """Test that the same content on two tasks shares one blob, kept until the last reference goes"""
+        first = self.upload().data
+        second = self.upload(self.other_task).data
+        self.assertEqual(first['content_hash'], second['content_hash'])
+
+        blob_dir = os.path.join(self.media_root, 'attachments')
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(blob_dir)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('attachment-detail', kwargs={'pk': first['id']}))
+        self.assertTrue(os.path.exists(blob_path(first['content_hash'])))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('attachment-detail', kwargs={'pk': second['id']}))
+        self.assertFalse(os.path.exists(blob_path(first['content_hash'])))
+
+    def test_cascaded_deletes_release_blobs(self):
+        """Test that deleting a task or project removes the blobs only its attachments used"""
+        digest = self.upload().data['content_hash']
+        self.upload(self.other_task)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertTrue(os.path.exists(blob_path(digest)))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertFalse(Attachment.objects.exists())
+        self.assertFalse(os.path.exists(blob_path(digest)))
+
+    def test_concurrent_chunk_for_the_same_offset_conflicts(self):
+        """Test that a chunk whose offset was taken while it was being written gets 409"""
+        url = self.start()
+
+        def racing_write(session_id, offset, stream, length):
+            written = write_chunk(session_id, offset, stream, length)
+            UploadSession.objects.filter(pk=session_id).update(received=offset + length)
+            return written
+
+        with mock.patch('api.views_attachments.write_chunk', side_effect=racing_write):
+            response = self.send(url, 0, 4095)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['received'], 4096)
+        self.assertEqual(self.send(url, 4096, len(self.content) - 1).status_code, status.HTTP_201_CREATED)
+
+    def test_release_keeps_blob_an_upload_committed_meanwhile(self):
+        """Test that a blob released while an upload of the same content commits stays in place"""
+        attachment = Attachment.objects.get(pk=self.upload().data['id'])
+        digest = attachment.content_hash
+        Attachment.objects.filter(pk=attachment.pk).delete()
+        real_replace = os.replace
+
+        def replace(source, destination):
+            real_replace(source, destination)
+            if destination.endswith('.deleting'):
+                # The other upload commits between the release's two checks
+                Attachment.objects.create(task=self.other_task, uploaded_by=self.user, file_name='data.bin',
+                                          file_size=len(self.content), content_hash=digest)
+
+        with mock.patch('api.storage.os.replace', side_effect=replace):
+            release_blob(digest)
+        with open(blob_path(digest), 'rb') as blob:
+            self.assertEqual(blob.read(), self.content)
+
+    def test_download_supports_ranges_and_etags(self):
+        """Test full, partial and conditional downloads"""
+        attachment = self.upload().data
+        url = reverse('attachment-download', kwargs={'pk': attachment['id']})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{attachment["content_hash"]}"')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+
+        response = self.client.get(url, HTTP_RANGE='bytes=100-199', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response.close()
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_outsiders_cannot_upload_or_download(self):
+        """Test that uploads and downloads require access to the task"""
+        attachment = self.upload().data
+
+        client = APIClient()
+        client.force_authenticate(user=self.outsider)
+        response = client.get(reverse('attachment-download', kwargs={'pk': attachment['id']}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = client.post(reverse('attachment-upload-create'), {
+            'task_id': str(self.task.id), 'file_name': 'x', 'file_size': 1
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@skipUnless(Image, 'Pillow is not installed')
+class AttachmentPreviewTests(AttachmentTestCase):
+    """Tests for background preview rendering"""
+
+    def setUp(self):
+        super().setUp()
+        buffer = io.BytesIO()
+        Image.new('RGB', (1200, 600), (200, 30, 30)).save(buffer, 'JPEG')
+        self.content = buffer.getvalue()
+
+    def upload_image(self, task=None):
+        url = self.start(task, file_type='image/jpeg')
+        response = self.send(url, 0, len(self.content) - 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def test_preview_is_rendered_and_served(self):
+        """Test that an uploaded image gets a thumbnail and a preview_url"""
+        attachment = self.upload_image()
+
+        response = self.client.get(reverse('attachment-preview', kwargs={'pk': attachment['id']}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with Image.open(io.BytesIO(b''.join(response.streaming_content))) as preview:
+            self.assertEqual(preview.size, (320, 160))
+
+        listed = self.client.get(reverse('attachment-list-create', kwargs={'task_id': self.task.id}))
+        self.assertTrue(listed.data['results'][0]['preview_url'].endswith('/preview/'))
+
+    def test_previews_are_shared_by_content(self):
+        """Test that a second upload of the same image does not queue another render"""
+        first = self.upload_image()
+
+        url = self.start(self.other_task, file_type='image/jpeg')
+        with mock.patch.object(previews, '_submit') as submit:
+            second = self.send(url, 0, len(self.content) - 1).data
+        submit.assert_not_called()
+        self.assertEqual(second['content_hash'], first['content_hash'])
+        self.assertIsNotNone(second['preview_url'])
+
+    def test_preview_is_removed_with_the_last_attachment(self):
+        """Test that releasing a blob also deletes its preview"""
+        attachment = self.upload_image()
+        self.assertTrue(has_preview(attachment['content_hash']))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertFalse(has_preview(attachment['content_hash']))
+
+    def test_process_pool_renders_preview(self):
+        """Test that previews are rendered by the worker pool when it is enabled"""
+        self.addCleanup(setattr, previews, '_executor', None)
+        with self.settings(PREVIEW_WORKERS=1):
+            attachment = self.upload_image()
+            previews._executor.shutdown(wait=True)
+        self.assertTrue(has_preview(attachment['content_hash']))
+
+    def test_unsupported_files_have_no_preview(self):
+        """Test that non-image attachments never get a preview"""
+        attachment = Attachment.objects.create(task=self.task, uploaded_by=self.user, file_name='a.txt',
+                                               file_size=1, file_type='text/plain',
+                                               file_url='https://example.com/a.txt')
+        response = self.client.get(reverse('attachment-preview', kwargs={'pk': attachment.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
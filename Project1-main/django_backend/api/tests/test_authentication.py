@@ -0,0 +1,255 @@
+from unittest import mock
+import time
+
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from api.auth import add_claims
+from api.authentication import CachedJWTAuthentication, check_shared_cache, user_cache
+from api.models import User, Project, Task
+from api.views import TaskListCreateView
+
+
+class CachedAuthenticationTests(TestCase):
+    """Tests for JWT authentication through the per-process user cache"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.url = reverse('user-profile')
+
+    def user_queries(self):
+        """Run one authenticated request and return the queries reading the user table"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = User._meta.db_table
+        return [query for query in queries if f'FROM "{table}"' in query['sql']]
+
+    def test_user_is_loaded_once(self):
+        """Test that only the first request resolves the user from the database"""
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+        self.assertEqual(self.user_queries(), [])
+
+        stats = user_cache.stats()
+        self.assertEqual((stats['hits'], stats['db_fallbacks'], stats['size']), (2, 1, 1))
+
+    def test_saving_user_invalidates_cache(self):
+        """Test that profile changes are visible on the next request"""
+        self.client.get(self.url)
+        response = self.client.post(reverse('update-profile'), {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.client.get(self.url).data['name'], 'Renamed')
+        self.assertGreaterEqual(user_cache.stats()['invalidations'], 1)
+
+    def test_change_password_invalidates_cache(self):
+        """Test that changing the password drops the cached user"""
+        self.client.get(self.url)
+        response = self.client.post(reverse('change-password'), {
+            'old_password': 'password123', 'new_password': 'A-much-better-passw0rd'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_cache.stats()['size'], 0)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that a deactivated user loses access even after being cached"""
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_is_not_shared(self):
+        """Test that each request receives its own copy of the cached user"""
+        self.client.get(self.url)
+        first = user_cache.get(self.user.pk)
+        first.name = 'Changed in a view'
+        self.assertEqual(user_cache.get(self.user.pk).name, 'Employee')
+
+
+# The test process has one worker, so its local 'default' cache stands in for a shared one
+@override_settings(AUTH_USER_CACHE={'TTL': 30, 'MAX_SIZE': 4096, 'SHARED_CACHE': 'default'})
+class ClaimsAuthorizationTests(TestCase):
+    """Tests for read requests authorized from token claims"""
+
+    def setUp(self):
+        user_cache.clear()
+        caches['default'].clear()
+        self.addCleanup(user_cache.clear)
+        self.addCleanup(caches['default'].clear)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.project = Project.objects.create(title='Claims', created_by=self.user)
+        self.project.team_members.add(self.user)
+        self.user.refresh_from_db()
+        Task.objects.create(title='Visible', project=self.project, created_by=self.user)
+
+        self.client = APIClient()
+        self.authorize()
+        self.url = reverse('task-list-create')
+
+    def authorize(self):
+        token = add_claims(RefreshToken.for_user(self.user), self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def user_queries(self, method='get', data=None):
+        """Run one request and return the queries reading the user table"""
+        with CaptureQueriesContext(connection) as queries:
+            self.response = getattr(self.client, method)(self.url, data, format='json')
+        table = User._meta.db_table
+        return [query for query in queries if f'FROM "{table}"' in query['sql']]
+
+    def test_token_carries_claims(self):
+        """Test that issued tokens carry the claims version and project ids"""
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'employee@example.com', 'password': 'password123'
+        }, format='json')
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['cv'], self.user.claims_version)
+        self.assertEqual(token['projects'], [str(self.project.id)])
+        self.assertEqual(token['role'], 'EMPLOYEE')
+
+    def test_read_requests_skip_user_lookup(self):
+        """Test that read requests are authorized without loading the user row"""
+        self.user_queries()
+        self.assertEqual(self.user_queries(), [])
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.response.data['count'], 1)
+        self.assertEqual(user_cache.stats()['claims_hits'], 2)
+        self.assertEqual(user_cache.stats()['db_fallbacks'], 0)
+
+    def test_writes_use_stored_user(self):
+        """Test that write requests still authenticate against the database"""
+        self.user_queries()
+        queries = self.user_queries('post', {'title': 'New', 'project': str(self.project.id)})
+        self.assertNotEqual(queries, [])
+        self.assertEqual(Task.objects.get(title='New').created_by, self.user)
+
+    def test_role_change_makes_claims_stale(self):
+        """Test that changing the role falls back to the database until the token is refreshed"""
+        version = self.user.claims_version
+        self.user.role = 'SCRUM_MASTER'
+        self.user.save()
+        self.assertEqual(self.user.claims_version, version + 1)
+
+        self.assertNotEqual(self.user_queries(), [])
+        self.assertEqual(user_cache.stats()['stale_claims'], 1)
+
+        self.authorize()
+        self.user_queries()
+        self.assertEqual(self.user_queries(), [])
+
+    def test_profile_edit_keeps_claims(self):
+        """Test that changes to unclaimed fields do not invalidate tokens"""
+        version = self.user.claims_version
+        self.user.name = 'Renamed'
+        self.user.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).claims_version, version)
+
+    def test_membership_change_refreshes_project_claims(self):
+        """Test that joining a project invalidates claims and refresh issues the new project list"""
+        refresh = add_claims(RefreshToken.for_user(self.user), self.user)
+        other = Project.objects.create(title='Other', created_by=self.user)
+        other.team_members.add(self.user)
+
+        self.assertNotEqual(self.user_queries(), [])
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(refresh)}, format='json')
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['cv'], User.objects.get(pk=self.user.pk).claims_version)
+        self.assertEqual(set(token['projects']), {str(self.project.id), str(other.id)})
+
+    def test_project_access_uses_project_claims(self):
+        """Test that object permissions check membership from the token"""
+        # Neither created by nor assigned to the user, so membership decides
+        colleague = User.objects.create_user(
+            username='colleague',
+            email='colleague@example.com',
+            password='password123',
+            name='Colleague',
+            role='EMPLOYEE'
+        )
+        task = Task.objects.create(title='Shared', project=self.project, created_by=colleague)
+        url = reverse('task-detail', kwargs={'pk': task.id})
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as claims_queries:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as stored_user_queries:
+            client.get(url)
+        self.assertEqual(len(claims_queries), len(stored_user_queries) - 1)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that deactivation revokes claims-based access"""
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_without_shared_cache_reads_need_no_queries(self):
+        """Test that without a shared cache claims-authorized reads run no user query once cached"""
+        with self.settings(AUTH_USER_CACHE={'TTL': 30, 'SHARED_CACHE': None}):
+            self.user_queries()
+            self.assertEqual(self.user_queries(), [])
+
+            token = add_claims(RefreshToken.for_user(self.user), self.user).access_token
+            request = Request(APIRequestFactory().get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}'),
+                              parser_context={'view': TaskListCreateView()})
+            with self.assertNumQueries(0):
+                user, _ = CachedJWTAuthentication().authenticate(request)
+            self.assertEqual(user.id, self.user.pk)
+            self.assertEqual(user_cache.stats()['claims_hits'], 3)
+
+            # A bump in this process applies at once
+            self.user.role = 'SCRUM_MASTER'
+            self.user.save()
+            self.client.get(self.url)
+            self.assertEqual(user_cache.stats()['stale_claims'], 1)
+
+    def test_without_shared_cache_other_workers_bumps_apply_after_ttl(self):
+        """Test that another worker's version bump applies once the local version expires"""
+        with self.settings(AUTH_USER_CACHE={'TTL': 30, 'SHARED_CACHE': None}):
+            self.user_queries()
+            # Another worker's bump: no signal reaches this process
+            User.objects.filter(pk=self.user.pk).update(claims_version=F('claims_version') + 1)
+            self.client.get(self.url)
+            self.assertEqual(user_cache.stats()['stale_claims'], 0)
+
+            with mock.patch('api.authentication.time.monotonic', return_value=time.monotonic() + 31):
+                self.client.get(self.url)
+            self.assertEqual(user_cache.stats()['stale_claims'], 1)
+
+    def test_per_process_shared_cache_is_reported(self):
+        """Test that a process-local cache configured as the shared cache is reported by the system check"""
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['api.W001'])
+        with self.settings(AUTH_USER_CACHE={'SHARED_CACHE': None}):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,163 @@
+"""
+Timing and query-count regression checks for the API hot paths.
+
+A fixed seed_scale dataset is loaded once and every endpoint below is
+called in-process through the DRF test client. Each endpoint's query
+count is compared with benchmark_baseline.json next to this file, and
+any query beyond BENCHMARK_QUERY_TOLERANCE fails the test.
+
+Timings are only reported by default. The median of BENCHMARK_ROUNDS
+calls is divided by the median of a fixed calibration workload run in
+the same process, so the figure does not depend much on how fast or how
+busy the machine is. The timing check only runs when
+BENCHMARK_TIME_TOLERANCE is set (e.g. 0.5). A test then fails if a
+relative time grows by more than that fraction over its baseline.
+
+The suite is tagged 'benchmark' and left out of normal test runs:
+
+    python manage.py test api.tests --tag benchmark
+    BENCHMARK_SAVE=1 python manage.py test api.tests --tag benchmark   # record a new baseline
+
+Relative times still vary between machines and Python versions. Record
+the baseline where the timing check runs.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase, tag
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import User, Task, TaskTimer
+from api.querycheck import QueryCounter, counting
+
+BASELINE = Path(os.getenv('BENCHMARK_BASELINE', Path(__file__).with_name('benchmark_baseline.json')))
+ROUNDS = int(os.getenv('BENCHMARK_ROUNDS', '15'))
+WARMUP = 2
+TIME_TOLERANCE = float(os.getenv('BENCHMARK_TIME_TOLERANCE')) if os.getenv('BENCHMARK_TIME_TOLERANCE') else None
+QUERY_TOLERANCE = int(os.getenv('BENCHMARK_QUERY_TOLERANCE', '0'))
+CALIBRATION_ROUNDS = 15
+
+DATASET = {
+    'seed': 49,
+    'users': 300,
+    'projects': 60,
+    'tasks_per_project': 30,
+    'comments': 3000,
+    'time_entries': 4000,
+    'timers': 3000,
+    'notifications': 4000,
+    'activity_logs': 6000,
+}
+
+ENDPOINTS = [
+    'task-list-create',
+    'dashboard-stats',
+    'analytics-productivity',
+    'analytics-team',
+    'analytics-distribution',
+    'analytics-lead-time',
+    'analytics-cycle-time',
+    'timesheet-daily',
+    'timesheet-weekly',
+    'recent-activity',
+    'notification-summary',
+]
+
+
+@tag('benchmark')
+class HotPathBenchmarks(TestCase):
+    """Test that the hot-path endpoints run no more queries, and report how long they take, against the baseline"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_scale', stdout=StringIO(), **DATASET)
+        # The busiest assignee, and the last day they tracked time, so the reports have rows to build
+        cls.user = User.objects.annotate(task_count=Count('assigned_tasks')).order_by('-task_count', 'email')[0]
+        timers = TaskTimer.objects.filter(user_id=cls.user.pk, end_time__isnull=False)
+        day = timers.latest('start_time').start_time.date()
+        cls.params = {
+            'timesheet-daily': {'date': day.isoformat()},
+            'timesheet-weekly': {'week_start': (day - timedelta(days=day.weekday())).isoformat()},
+        }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def calibrate(self):
+        """Median ms of a fixed mix of Python work and small queries, the unit for relative times"""
+        def workload():
+            sorted(str(i * 7919 % 10007) for i in range(20000))
+            for _ in range(20):
+                list(Task.objects.order_by('id').values_list('id', 'title')[:50])
+
+        workload()
+        timings = []
+        for _ in range(CALIBRATION_ROUNDS):
+            started = time.perf_counter()
+            workload()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def measure(self, name):
+        url = reverse(name)
+        params = self.params.get(name, {})
+        with counting(QueryCounter()) as counter:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+        for _ in range(WARMUP - 1):
+            self.client.get(url, params)
+
+        timings = []
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            self.client.get(url, params)
+            timings.append((time.perf_counter() - started) * 1000)
+        return {'median_ms': round(statistics.median(timings), 2), 'queries': counter.total}
+
+    def test_hot_paths_against_baseline(self):
+        """Test that no endpoint runs more queries, or (when asked) takes longer, than its baseline"""
+        # Calibrating before and after evens out drift in machine load during the run
+        before = self.calibrate()
+        results = {name: self.measure(name) for name in ENDPOINTS}
+        unit_ms = (before + self.calibrate()) / 2
+        for result in results.values():
+            result['relative'] = round(result['median_ms'] / unit_ms, 3)
+
+        if os.getenv('BENCHMARK_SAVE'):
+            with open(BASELINE, 'w') as f:
+                json.dump({'dataset': DATASET, 'rounds': ROUNDS, 'endpoints': results}, f, indent=2)
+                f.write('\n')
+            return
+
+        if not BASELINE.exists():
+            self.skipTest(f'No baseline at {BASELINE}; record one with BENCHMARK_SAVE=1')
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+        self.assertEqual(baseline['dataset'], DATASET, 'Baseline was recorded on another dataset')
+
+        regressions = []
+        for name, result in results.items():
+            expected = baseline['endpoints'].get(name)
+            if expected is None:
+                continue
+            sys.stderr.write(
+                f"\n{name}: {result['median_ms']} ms, {result['relative']}x calibration "
+                f"(baseline {expected.get('relative')}x), {result['queries']} queries"
+            )
+            if TIME_TOLERANCE is not None and expected.get('relative'):
+                if result['relative'] > expected['relative'] * (1 + TIME_TOLERANCE):
+                    regressions.append(f"{name}: {result['relative']}x calibration, baseline {expected['relative']}x")
+            if result['queries'] > expected['queries'] + QUERY_TOLERANCE:
+                regressions.append(f"{name}: {result['queries']} queries, baseline {expected['queries']}")
+        self.assertFalse(regressions, 'Regressed against the baseline:\n' + '\n'.join(regressions))
@@ -0,0 +1,182 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from api.models import User, Project, Task
+from api.ranking import MAX_RANK_LENGTH, rank_between, spread_ranks
+
+
+class ProjectBoardTests(TestCase):
+    """Tests for GET /api/projects/<id>/board/"""
+
+    def setUp(self):
+        self.employee = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@example.com',
+            password='password123',
+            name='Outsider',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(
+            title='Board Project',
+            created_by=self.employee,
+            status='active'
+        )
+        self.project.team_members.add(self.employee)
+
+        for i in range(5):
+            Task.objects.create(title=f'Todo {i}', status='todo',
+                                project=self.project, created_by=self.employee)
+        for i in range(2):
+            Task.objects.create(title=f'Done {i}', status='done', project=self.project,
+                                created_by=self.employee, assigned_to=self.employee)
+
+        self.url = reverse('project-board', kwargs={'pk': self.project.id})
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.employee)
+
+    def test_board_groups_tasks_by_status(self):
+        """Test that every status column is returned with its count and first cards"""
+        with self.assertNumQueries(3):  # project, membership check, board
+            response = self.client.get(self.url, {'limit': 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        columns = {column['status']: column for column in response.data['columns']}
+        self.assertEqual(list(columns), [value for value, _ in Task.TASK_STATUS_CHOICES])
+
+        self.assertEqual(columns['todo']['count'], 5)
+        self.assertEqual(len(columns['todo']['cards']), 3)
+        self.assertEqual(columns['todo']['next_cursor'], '3')
+        self.assertEqual(columns['done']['count'], 2)
+        self.assertIsNone(columns['done']['next_cursor'])
+        self.assertEqual(columns['done']['cards'][0]['assigned_to']['name'], 'Employee')
+        self.assertEqual(columns['review']['cards'], [])
+
+    def test_column_cursor_returns_next_page(self):
+        """Test that a column can be paged with its cursor"""
+        response = self.client.get(self.url, {'limit': 3, 'status': 'todo', 'cursor': '3'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['columns']), 1)
+        column = response.data['columns'][0]
+        self.assertEqual([card['title'] for card in column['cards']], ['Todo 3', 'Todo 4'])
+        self.assertIsNone(column['next_cursor'])
+
+    def test_column_count_past_the_last_card(self):
+        """Test that a cursor beyond the end still reports the column total and no next cursor"""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'limit': 3, 'status': 'todo', 'cursor': '9'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        column = response.data['columns'][0]
+        self.assertEqual((column['count'], column['cards'], column['next_cursor']), (5, [], None))
+
+    def test_non_member_cannot_view_board(self):
+        """Test that employees outside the project cannot open its board"""
+        client = APIClient()
+        client.force_authenticate(user=self.outsider)
+
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TaskRankTests(TestCase):
+    """Tests for fractional card ranks and POST /api/tasks/<id>/move/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Rank Project', created_by=self.user)
+        self.project.team_members.add(self.user)
+
+        self.tasks = [
+            Task.objects.create(title=f'Card {i}', project=self.project, created_by=self.user)
+            for i in range(3)
+        ]
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def column(self, status_value='todo'):
+        return list(
+            Task.objects.filter(project=self.project, status=status_value)
+            .order_by('rank').values_list('title', flat=True)
+        )
+
+    def test_rank_between_orders_keys(self):
+        """Test that generated keys always sort between their neighbours"""
+        self.assertLess('a', rank_between('a', 'b'))
+        self.assertLess(rank_between('a', 'b'), 'b')
+        self.assertLess(rank_between(None, '1'), '1')
+        self.assertGreater(rank_between('z', None), 'z')
+        with self.assertRaises(ValueError):
+            rank_between('b', 'a')
+
+        ranks = spread_ranks(50)
+        self.assertEqual(ranks, sorted(set(ranks)))
+
+    def test_new_tasks_are_appended_to_column(self):
+        """Test that created tasks get increasing ranks"""
+        self.assertEqual(self.column(), ['Card 0', 'Card 1', 'Card 2'])
+
+    def test_move_updates_only_moved_row(self):
+        """Test that moving a card between two others writes a single row"""
+        url = reverse('task-move', kwargs={'pk': self.tasks[2].id})
+        data = {'before_id': str(self.tasks[0].id), 'after_id': str(self.tasks[1].id)}
+
+        # task, neighbour ranks, update, change log
+        with self.assertNumQueries(4):
+            response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(), ['Card 0', 'Card 2', 'Card 1'])
+
+    def test_move_to_other_column(self):
+        """Test that a card can be dropped at the bottom of another column"""
+        Task.objects.create(title='Done card', status='done', project=self.project, created_by=self.user)
+
+        url = reverse('task-move', kwargs={'pk': self.tasks[0].id})
+        response = self.client.post(url, {'status': 'done'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column('done'), ['Done card', 'Card 0'])
+
+    def test_repeated_inserts_at_one_spot_stay_within_max_length(self):
+        """Test that cards dropped again and again just below one card never outgrow the rank column"""
+        top, below, moving = self.tasks
+        longest = 0
+        # Each drop halves the gap above, about five drops per extra character
+        for _ in range(300):
+            url = reverse('task-move', kwargs={'pk': moving.id})
+            response = self.client.post(url, {'before_id': str(top.id), 'after_id': str(below.id)}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            longest = max(longest, len(response.data['rank']))
+            below, moving = moving, below
+
+        self.assertLessEqual(longest, MAX_RANK_LENGTH)
+        self.assertLessEqual(max(len(rank) for rank in Task.objects.values_list('rank', flat=True)),
+                             Task._meta.get_field('rank').max_length)
+        self.assertEqual(self.column(), ['Card 0', below.title, moving.title])
+
+    def test_move_rejects_neighbour_from_other_column(self):
+        """Test that neighbours must belong to the target column"""
+        url = reverse('task-move', kwargs={'pk': self.tasks[0].id})
+        response = self.client.post(url, {'status': 'done', 'after_id': str(self.tasks[1].id)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,157 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from api.models import User, Project, Task
+
+
+class BulkTaskOperationsTests(TestCase):
+    """Tests for POST /api/tasks/bulk/"""
+
+    def setUp(self):
+        self.scrum_master = User.objects.create_user(
+            username='scrummaster',
+            email='scrummaster@example.com',
+            password='password123',
+            name='Scrum Master',
+            role='SCRUM_MASTER'
+        )
+
+        self.employee = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(
+            title='Test Project',
+            created_by=self.scrum_master,
+            status='active'
+        )
+        self.project.team_members.add(self.employee)
+
+        self.other_project = Project.objects.create(
+            title='Other Project',
+            created_by=self.scrum_master,
+            status='active'
+        )
+
+        self.tasks = [
+            Task.objects.create(
+                title=f'Task {i}',
+                project=self.project,
+                created_by=self.scrum_master,
+                assigned_to=self.employee
+            )
+            for i in range(3)
+        ]
+
+        self.url = reverse('task-bulk')
+
+        self.scrum_master_client = APIClient()
+        self.scrum_master_client.force_authenticate(user=self.scrum_master)
+
+        self.employee_client = APIClient()
+        self.employee_client.force_authenticate(user=self.employee)
+
+    def test_mixed_operations_are_applied(self):
+        """Test that create, update, status and delete operations are applied together"""
+        data = {'operations': [
+            {'op': 'create', 'data': {'title': 'New Task', 'project_id': str(self.project.id)}},
+            {'op': 'update', 'id': str(self.tasks[0].id), 'data': {'priority': 'urgent'}},
+            {'op': 'status', 'id': str(self.tasks[1].id), 'status': 'done'},
+            {'op': 'delete', 'id': str(self.tasks[2].id)},
+        ]}
+
+        response = self.scrum_master_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertTrue(all(result['ok'] for result in response.data['results']))
+
+        created = Task.objects.get(id=response.data['results'][0]['id'])
+        self.assertEqual(created.created_by, self.scrum_master)
+        self.assertEqual(created.project, self.project)
+
+        self.tasks[0].refresh_from_db()
+        self.tasks[1].refresh_from_db()
+        self.assertEqual(self.tasks[0].priority, 'urgent')
+        self.assertEqual(self.tasks[1].status, 'done')
+        self.assertFalse(Task.objects.filter(id=self.tasks[2].id).exists())
+
+    def test_invalid_operation_rejects_whole_batch(self):
+        """Test that one invalid operation prevents every operation from being applied"""
+        data = {'operations': [
+            {'op': 'status', 'id': str(self.tasks[0].id), 'status': 'done'},
+            {'op': 'status', 'id': str(self.tasks[1].id), 'status': 'not-a-status'},
+        ]}
+
+        response = self.scrum_master_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['results'][0]['ok'])
+        self.assertFalse(response.data['results'][1]['ok'])
+
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, 'todo')
+
+    def test_employee_cannot_create_in_foreign_project(self):
+        """Test that employees can only add tasks to projects they are members of"""
+        data = {'operations': [
+            {'op': 'create', 'data': {'title': 'Mine', 'project_id': str(self.project.id)}},
+            {'op': 'create', 'data': {'title': 'Not mine', 'project_id': str(self.other_project.id)}},
+        ]}
+
+        response = self.employee_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('project_id', response.data['results'][1]['errors'])
+        self.assertFalse(Task.objects.filter(title='Mine').exists())
+
+    def test_status_changes_rank_cards_at_the_bottom_of_the_new_column(self):
+        """Test that bulk and single status changes place cards below the target column's cards"""
+        existing = Task.objects.create(title='Already there', project=self.project, status='review',
+                                       created_by=self.tasks[0].created_by, rank='zz')
+        response = self.employee_client.post(self.url, {'operations': [
+            {'op': 'status', 'id': str(self.tasks[0].id), 'status': 'review'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        task = self.tasks[1]
+        task.refresh_from_db()
+        task.status = 'review'
+        task.save()
+
+        column = Task.objects.filter(project=self.project, status='review').order_by('rank')
+        self.assertEqual(list(column.values_list('id', flat=True)), [existing.id, self.tasks[0].id, task.id])
+
+    def test_project_changes_rank_cards_at_the_bottom_of_the_new_project(self):
+        """Test that bulk and single project moves place cards below the target project's column"""
+        existing = Task.objects.create(title='Already there', project=self.other_project,
+                                       created_by=self.scrum_master, rank='zz')
+        response = self.scrum_master_client.post(self.url, {'operations': [
+            {'op': 'update', 'id': str(self.tasks[0].id), 'data': {'project_id': str(self.other_project.id)}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        task = self.tasks[1]
+        task.refresh_from_db()
+        task.project = self.other_project
+        task.save()
+
+        column = Task.objects.filter(project=self.other_project, status='todo').order_by('rank')
+        self.assertEqual(list(column.values_list('id', flat=True)), [existing.id, self.tasks[0].id, task.id])
+
+    def test_query_count_is_independent_of_batch_size(self):
+        """Test that a status change for many tasks uses a fixed number of queries"""
+        data = {'operations': [
+            {'op': 'status', 'id': str(task.id), 'status': 'in_progress'} for task in self.tasks
+        ]}
+
+        # task lookup, savepoint, new column's bottom rank, bulk update, change log,
+        # status transitions, savepoint release
+        with self.assertNumQueries(7):
+            response = self.employee_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.filter(status='in_progress').count(), 3)
@@ -0,0 +1,124 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import datetime, timedelta
+import pytz
+
+from api.models import User, Project, Task, TimeEntry
+
+
+class CalendarTests(TestCase):
+    """Tests for GET /api/calendar/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='password123',
+            name='Other',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Calendar Project', created_by=self.other)
+        self.project.team_members.add(self.user)
+
+        def at(day, hour=12):
+            return pytz.timezone('UTC').localize(datetime(2025, 3, day, hour))
+
+        self.at = at
+
+        self.in_window = Task.objects.create(title='Due in March', project=self.project,
+                                             created_by=self.other, due_date=at(10))
+        self.same_day = Task.objects.create(title='Also due', assigned_to=self.user,
+                                            created_by=self.other, due_date=at(10, 15))
+        Task.objects.create(title='Due in April', project=self.project, created_by=self.other,
+                            due_date=at(31) + timedelta(days=2))
+        Task.objects.create(title='Not visible', created_by=self.other, due_date=at(12))
+
+        TimeEntry.objects.create(task=self.in_window, user=self.user,
+                                 start_time=at(11, 9), end_time=at(11, 11))
+
+        self.url = reverse('calendar')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_tasks_are_bucketed_by_day(self):
+        """Test that only visible tasks due in the window are returned, grouped per day"""
+        response = self.client.get(self.url, {'start': '2025-03-01', 'end': '2025-03-31'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        days = response.data['days']
+        self.assertEqual([day['date'] for day in days], ['2025-03-10'])
+        self.assertEqual([task['title'] for task in days[0]['tasks']], ['Due in March', 'Also due'])
+        self.assertEqual(days[0]['time_entries'], [])
+
+    def test_time_entries_are_optional(self):
+        """Test that time entries are included when requested"""
+        response = self.client.get(self.url, {'start': '2025-03-01', 'end': '2025-03-31',
+                                              'time_entries': 'true'})
+
+        days = {day['date']: day for day in response.data['days']}
+        self.assertEqual(len(days['2025-03-11']['time_entries']), 1)
+        self.assertEqual(days['2025-03-11']['time_entries'][0]['duration_hours'], 2)
+
+    def test_etag_returns_not_modified_until_window_changes(self):
+        """Test that a matching If-None-Match yields 304 until a task in the window changes"""
+        params = {'start': '2025-03-01', 'end': '2025-03-31'}
+        etag = self.client.get(self.url, params)['ETag']
+
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.same_day.title = 'Renamed'
+        self.same_day.save()
+
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_covers_embedded_titles(self):
+        """Test that renaming a project or a timed task changes the ETag"""
+        params = {'start': '2025-03-01', 'end': '2025-03-31', 'time_entries': 'true'}
+        etag = self.client.get(self.url, params)['ETag']
+
+        self.project.title = 'Renamed project'
+        self.project.save()
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['days'][0]['tasks'][0]['project_title'], 'Renamed project')
+
+        etag = response['ETag']
+        Task.objects.filter(pk=self.in_window.pk).update(title='Renamed task', updated_at=self.at(20))
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_compares_whole_etags(self):
+        """Test that If-None-Match is parsed as a list and compared weakly, not as a substring"""
+        params = {'start': '2025-03-01', 'end': '2025-03-31'}
+        etag = self.client.get(self.url, params)['ETag']
+
+        for header, expected in (
+            (f'"other", W/{etag}', status.HTTP_304_NOT_MODIFIED),
+            ('*', status.HTTP_304_NOT_MODIFIED),
+            (f'{etag}-stale', status.HTTP_200_OK),
+            (etag[1:-1], status.HTTP_200_OK),
+        ):
+            response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, expected, header)
+
+    def test_invalid_window_is_rejected(self):
+        """Test that bad dates and oversized windows return 400"""
+        response = self.client.get(self.url, {'start': 'March'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'start': '2025-01-01', 'end': '2025-12-31'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
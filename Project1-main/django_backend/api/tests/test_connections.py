@@ -0,0 +1,67 @@
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+import os
+import shutil
+import tempfile
+
+from api.connections import connection_stats, reset_connection_stats
+from api.models import User
+
+
+class ConnectionTuningTests(TestCase):
+    """Tests for per-connection SQLite tuning and connection counters"""
+
+    def setUp(self):
+        reset_connection_stats()
+        self.addCleanup(reset_connection_stats)
+
+    def pragmas(self, name):
+        """Open a fresh SQLite file through the tuning hook and read its pragmas back"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': os.path.join(directory, f'{name}.sqlite3')},
+                                  alias=name)
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+
+        with wrapper.cursor() as cursor:
+            pragmas = {}
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {pragma}')
+                pragmas[pragma] = cursor.fetchone()[0]
+        return pragmas
+
+    def test_sqlite_pragmas_are_applied(self):
+        """Test that new SQLite connections get the configured pragmas but keep their journal mode"""
+        self.assertEqual(self.pragmas('tuned'), {'journal_mode': 'delete', 'synchronous': 1, 'busy_timeout': 5000})
+        self.assertEqual(connection_stats()['tuned'], {'opened': 1, 'reused': 0})
+
+    def test_wal_is_opt_in(self):
+        """Test that SQLITE_JOURNAL_MODE switches new connections to WAL"""
+        with self.settings(DB_TUNING={'SQLITE_JOURNAL_MODE': 'WAL'}):
+            self.assertEqual(self.pragmas('wal')['journal_mode'], 'wal')
+
+    def test_requests_reuse_open_connection(self):
+        """Test that requests are counted as reusing the persistent connection"""
+        user = User.objects.create_user(
+            username='scrum',
+            email='scrum@example.com',
+            password='password123',
+            name='Scrum Master',
+            role='SCRUM_MASTER'
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        client.get(reverse('metrics-connections'))
+        response = client.get(reverse('metrics-connections'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['connections']['default']['reused'], 2)
+
+        user.role = 'EMPLOYEE'
+        user.save()
+        self.assertEqual(client.get(reverse('metrics-connections')).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,140 @@
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework import status
+from datetime import timedelta
+from unittest import mock
+
+from api import db_routing
+from api.db_routing import ReplicaRouter, check_pin_cache, replica_lag, replica_reads, reset_replica_lag
+from api.models import User, Task
+
+
+@api_view(['GET'])
+@replica_reads
+def read_alias_view(request):
+    return Response({'alias': ReplicaRouter().db_for_read(Task)})
+
+
+class ReplicaRoutingTests(TestCase):
+    """Tests for sending report reads to the replica"""
+
+    def setUp(self):
+        cache.clear()
+        reset_replica_lag()
+        self.addCleanup(cache.clear)
+        self.addCleanup(reset_replica_lag)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.factory = APIRequestFactory()
+
+        for name, value in (('replica_configured', True), ('replica_lag', 0.0)):
+            patcher = mock.patch.object(db_routing, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def read_alias(self, cookies=None, **headers):
+        request = self.factory.get('/reports/', **headers)
+        if cookies is not None:
+            request.COOKIES = {name: morsel.value for name, morsel in cookies.items()}
+        force_authenticate(request, user=self.user)
+        return read_alias_view(request).data['alias']
+
+    def test_report_reads_use_replica(self):
+        """Test that decorated views read from the replica and others from the primary"""
+        self.assertEqual(self.read_alias(), 'replica')
+        self.assertIsNone(ReplicaRouter().db_for_read(Task))
+        self.assertEqual(ReplicaRouter().db_for_write(Task), 'default')
+
+    def test_users_read_their_own_writes(self):
+        """Test that a user who just wrote reads reports from the primary"""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.post(reverse('task-list-create'), {'title': 'Fresh'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertIsNone(self.read_alias(client.cookies))
+        self.assertEqual(self.read_alias(client.cookies, HTTP_X_READ_CONSISTENCY='replica'), 'replica')
+
+    def test_write_pin_reaches_other_workers(self):
+        """Test that a write pinned by one worker is honoured by a worker with its own cache"""
+        worker_a, worker_b = LocMemCache('worker-a', {}), LocMemCache('worker-b', {})
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with mock.patch.object(db_routing, '_pin_cache', return_value=worker_a):
+            client.post(reverse('task-list-create'), {'title': 'Fresh'}, format='json')
+
+        with mock.patch.object(db_routing, '_pin_cache', return_value=worker_b):
+            self.assertIsNone(self.read_alias(client.cookies))
+            # A client without the cookie is only pinned through a cache both workers share
+            self.assertEqual(self.read_alias(), 'replica')
+        with mock.patch.object(db_routing, '_pin_cache', return_value=worker_a):
+            self.assertIsNone(self.read_alias())
+
+        # Someone else's cookie does not pin this user
+        other = User.objects.create_user(username='other', email='other@example.com', password='password123',
+                                         name='Other', role='EMPLOYEE')
+        client.force_authenticate(user=other)
+        client.post(reverse('task-list-create'), {'title': 'Theirs'}, format='json')
+        self.assertEqual(self.read_alias(client.cookies), 'replica')
+
+    def test_write_pin_without_cookies(self):
+        """Test that a client that drops cookies still reads its own writes from the primary"""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.post(reverse('task-list-create'), {'title': 'Fresh'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        client.cookies.clear()
+
+        self.assertIsNone(self.read_alias())
+        with self.settings(REPLICA_ROUTING={'READ_YOUR_WRITES': 60}):
+            self.assertIsNone(self.read_alias())
+
+    def test_per_process_pin_cache_is_reported(self):
+        """Test that the system check warns when write pins live in a per-process cache"""
+        self.assertEqual([warning.id for warning in check_pin_cache(None)], ['api.W002'])
+        with mock.patch.object(db_routing, 'replica_configured', return_value=False):
+            self.assertEqual(check_pin_cache(None), [])
+
+    def test_request_can_force_primary(self):
+        """Test the per-request override"""
+        self.assertIsNone(self.read_alias(HTTP_X_READ_CONSISTENCY='primary'))
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """Test that a replica behind by more than MAX_LAG is not used"""
+        with mock.patch.object(db_routing, 'replica_lag', return_value=120.0):
+            self.assertIsNone(self.read_alias())
+        with mock.patch.object(db_routing, 'replica_lag', return_value=None):
+            self.assertIsNone(self.read_alias())
+
+    def test_lag_is_measured_from_change_log(self):
+        """Test lag computed from the newest change-log row on each side"""
+        mock.patch.stopall()
+        now = timezone.now()
+        latest = {'default': (10, now), 'replica': (8, now - timedelta(seconds=42))}
+        with mock.patch.object(db_routing, '_latest_change', side_effect=latest.get):
+            self.assertEqual(replica_lag(), 42.0)
+            latest['replica'] = (10, now)
+            self.assertEqual(replica_lag(), 42.0)  # cached until LAG_CHECK_INTERVAL passes
+            reset_replica_lag()
+            self.assertEqual(replica_lag(), 0.0)
+
+    def test_report_views_work_without_replica(self):
+        """Test that report endpoints still answer from the primary when no replica is configured"""
+        mock.patch.stopall()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        for name in ('time-summary', 'analytics-productivity', 'analytics-team',
+                     'analytics-distribution', 'timesheet-daily', 'timesheet-weekly'):
+            self.assertEqual(client.get(reverse(name)).status_code, status.HTTP_200_OK, name)
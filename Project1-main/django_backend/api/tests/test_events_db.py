@@ -0,0 +1,114 @@
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from unittest import mock
+
+from api import db_routing
+from api.db_routing import EventsRouter, id_subquery
+from api.models import User, Project, Task, TaskTimer, ActivityLog, Notification, load_related
+
+
+class EventsDatabaseTests(TestCase):
+    """Tests for keeping activity, notification and timer rows in the events database"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.project = Project.objects.create(title='Project', created_by=self.user)
+        self.project.team_members.add(self.user)
+        self.task = Task.objects.create(
+            title='Task', project=self.project, created_by=self.user, assigned_to=self.user
+        )
+
+    def test_router_sends_event_tables_to_events(self):
+        """Test routing and migration rules when an events database is configured"""
+        router = EventsRouter()
+        with mock.patch.object(db_routing, 'events_configured', return_value=True):
+            for model in (ActivityLog, Notification, TaskTimer):
+                self.assertEqual(router.db_for_read(model), 'events')
+                self.assertEqual(router.db_for_write(model), 'events')
+            self.assertIsNone(router.db_for_write(Task))
+
+            self.assertTrue(router.allow_migrate('events', 'api', 'tasktimer'))
+            self.assertFalse(router.allow_migrate('events', 'api', 'task'))
+            self.assertFalse(router.allow_migrate('events', 'auth', 'group'))
+            self.assertFalse(router.allow_migrate('default', 'api', 'notification'))
+            self.assertIsNone(router.allow_migrate('default', 'api', 'task'))
+
+        self.assertIsNone(router.db_for_write(ActivityLog))
+        self.assertIsNone(router.allow_migrate('default', 'api', 'notification'))
+
+    def test_id_subquery_is_evaluated_across_databases(self):
+        """Test that ids stay a subquery in one database and become a list across two"""
+        tasks = Task.objects.filter(project=self.project)
+        self.assertIsInstance(id_subquery(tasks, ActivityLog), QuerySet)
+
+        with mock.patch.object(db_routing.router, 'db_for_read',
+                               side_effect=lambda model: 'events' if model is ActivityLog else 'default'):
+            self.assertEqual(id_subquery(tasks, ActivityLog), [self.task.pk])
+
+    def test_objects_assign_ids(self):
+        """Test that user/task keyword arguments set the id columns"""
+        timer = TaskTimer.objects.create(task=self.task, user=self.user, start_time=timezone.now())
+        timer = TaskTimer.objects.get(pk=timer.pk)
+        self.assertEqual(timer.task_id, self.task.pk)
+        self.assertEqual(timer.task, self.task)
+
+        timer.user = None
+        self.assertIsNone(timer.user_id)
+
+    def test_load_related_uses_one_query_per_relation(self):
+        """Test batch loading of users and tasks for many rows"""
+        for index in range(5):
+            ActivityLog.objects.create(user=self.user, task=self.task, action='created',
+                                       description=f'Log {index}')
+
+        with self.assertNumQueries(3):
+            logs = load_related(ActivityLog.objects.all(), 'user', 'task')
+        with self.assertNumQueries(0):
+            self.assertEqual({log.task.title for log in logs}, {'Task'})
+            self.assertEqual({log.user.email for log in logs}, {'employee@example.com'})
+
+    def test_deletes_clean_up_event_rows(self):
+        """Test that removing a task or user removes its event rows"""
+        TaskTimer.objects.create(task=self.task, user=self.user, start_time=timezone.now())
+        ActivityLog.objects.create(user=self.user, task=self.task, project=self.project,
+                                   action='created', description='Created')
+        Notification.objects.create(user=self.user, title='Hello', message='Hi',
+                                    notification_type='task_assigned')
+
+        self.task.delete()
+        self.assertFalse(TaskTimer.objects.exists())
+        self.assertFalse(ActivityLog.objects.filter(task_id=self.task.pk).exists())
+
+        self.user.delete()
+        self.assertFalse(ActivityLog.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_activity_log_visibility(self):
+        """Test that employees only see logs of their own tasks and projects"""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='password123',
+            name='Other', role='EMPLOYEE'
+        )
+        hidden = Task.objects.create(title='Hidden', created_by=other)
+        ActivityLog.objects.create(user=other, task=self.task, action='updated', description='Mine')
+        ActivityLog.objects.create(user=other, task=hidden, action='updated', description='Hidden')
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get(reverse('activity-log-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([log['description'] for log in response.data['results']], ['Mine'])
+        self.assertEqual(response.data['results'][0]['task']['title'], 'Task')
+
+        response = client.get(reverse('recent-activity'))
+        self.assertEqual([log['description'] for log in response.data], ['Mine'])
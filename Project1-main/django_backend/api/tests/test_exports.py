@@ -0,0 +1,104 @@
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import datetime, timedelta
+import csv
+import io
+import json
+import pytz
+
+from api.models import User, Project, Task, TimeEntry, TaskTimer
+
+
+class ExportTests(TestCase):
+    """Tests for the streaming /api/exports/ endpoints"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username='scrummaster',
+            email='scrummaster@example.com',
+            password='password123',
+            name='Scrum Master',
+            role='SCRUM_MASTER'
+        )
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Export Project', created_by=self.manager)
+        self.task = Task.objects.create(title='Report, "quoted"', project=self.project,
+                                        assigned_to=self.user, created_by=self.manager)
+
+        def at(day, hour):
+            return pytz.timezone('UTC').localize(datetime(2025, 3, day, hour))
+
+        for day in (3, 4, 20):
+            TimeEntry.objects.create(task=self.task, user=self.user,
+                                     start_time=at(day, 9), end_time=at(day, 11))
+        TimeEntry.objects.create(task=self.task, user=self.manager, start_time=at(4, 9), end_time=at(4, 10))
+
+        for hour in (9, 14):
+            TaskTimer.objects.create(task=self.task, user=self.user,
+                                     start_time=at(3, hour), end_time=at(3, hour) + timedelta(minutes=30))
+        TaskTimer.objects.create(task=self.task, user=self.user, start_time=at(3, 16))
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+
+    def export(self, name, params=None):
+        response = self.client.get(reverse('export', kwargs={'dataset': name.split('.')[0],
+                                                             'fmt': name.split('.')[1]}), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b''.join(response.streaming_content).decode()
+
+    def test_time_entries_csv_filters_by_range_and_user(self):
+        """Test that the CSV export honours date range and user filters"""
+        content = self.export('time-entries.csv', {'start': '2025-03-01', 'end': '2025-03-10',
+                                                   'user_id': str(self.user.id)})
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['task_title'], 'Report, "quoted"')
+        self.assertEqual(rows[0]['start_time'], '2025-03-03T09:00:00Z')
+        self.assertEqual(rows[0]['duration_hours'], '2.0')
+
+    def test_time_entries_ndjson(self):
+        """Test that NDJSON exports one JSON object per line"""
+        lines = self.export('time-entries.ndjson', {'project_id': str(self.project.id)}).splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[0])['user_email'], 'employee@example.com')
+
+    def test_timesheets_sum_completed_timers_per_day(self):
+        """Test that timesheet rows aggregate completed timers per user, day and task"""
+        rows = list(csv.DictReader(io.StringIO(self.export('timesheets.csv'))))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['date'], '2025-03-03')
+        self.assertEqual(rows[0]['total_duration_seconds'], '3600')
+
+    def test_employees_only_export_their_own_entries(self):
+        """Test that employees cannot export other users' time entries"""
+        self.client.force_authenticate(user=self.user)
+        lines = self.export('time-entries.ndjson', {'user_id': str(self.manager.id)}).splitlines()
+        self.assertEqual(lines, [])
+
+        rows = list(csv.DictReader(io.StringIO(self.export('tasks.csv'))))
+        self.assertEqual([row['assigned_to_email'] for row in rows], ['employee@example.com'])
+
+    def test_invalid_export_requests(self):
+        """Test that unknown exports and bad filters are rejected"""
+        response = self.client.get(reverse('export', kwargs={'dataset': 'users', 'fmt': 'csv'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(reverse('export', kwargs={'dataset': 'tasks', 'fmt': 'csv'}),
+                                   {'start': 'March'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
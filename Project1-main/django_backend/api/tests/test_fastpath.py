@@ -0,0 +1,136 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import datetime
+import pytz
+import uuid
+
+from api.models import User, Project, Task, TimeEntry, Notification
+from api.renderers import FastJSONRenderer
+from api.serializers import TaskSerializer, TimeEntrySerializer, NotificationSerializer
+from api.serializers_fastpath import (
+    FastTaskSerializer, FastTimeEntrySerializer, FastNotificationSerializer
+)
+
+
+class FastPathContractTests(TestCase):
+    """Fast-path serializers must render exactly what the ModelSerializers render"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username='scrummaster',
+            email='scrummaster@example.com',
+            password='password123',
+            name='Scrum Master',
+            role='SCRUM_MASTER',
+            avatar='https://example.com/a.png'
+        )
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Émployée  ',
+            role='EMPLOYEE'
+        )
+
+        def at(day, hour):
+            return pytz.timezone('UTC').localize(datetime(2025, 3, day, hour, 15, 30, 120))
+
+        self.project = Project.objects.create(title='Fast Project', created_by=self.manager,
+                                              deadline=at(28, 9), description='Ünïcode')
+        self.project.team_members.add(self.user, self.manager)
+        empty_project = Project.objects.create(title='Empty', created_by=self.user)
+
+        self.task = Task.objects.create(title='Timed', project=self.project, assigned_to=self.user,
+                                        created_by=self.manager, due_date=at(20, 17), estimated_hours=3)
+        Task.objects.create(title='Loose', created_by=self.user, priority='high')
+        Task.objects.create(title='Elsewhere', project=empty_project, created_by=self.user, actual_hours=1.25)
+
+        TimeEntry.objects.create(task=self.task, user=self.user, start_time=at(3, 9), end_time=at(3, 10))
+        TimeEntry.objects.create(task=self.task, user=self.user, start_time=at(4, 9), end_time=at(4, 11))
+        TimeEntry.objects.create(task=self.task, user=self.user, start_time=at(5, 9))
+
+        Notification.objects.create(user=self.user, title='Ping', message='Hello',
+                                    notification_type='task_assigned')
+        Notification.objects.create(user=self.user, title='Read', message='Done', is_read=True)
+
+        self.client = APIClient()
+
+    def assertMatchesSerializer(self, fast_class, serializer_class, queryset):
+        objects = list(queryset)
+        expected = JSONRenderer().render(serializer_class(objects, many=True).data)
+
+        fast_data = fast_class().serialize(fast_class().rows(queryset))
+        self.assertEqual(FastJSONRenderer().render(fast_data), expected)
+        self.assertEqual(
+            list(fast_data[0]),
+            [field.field_name for field in serializer_class()._readable_fields]
+        )
+
+    def assertListMatchesSerializer(self, url_name, serializer_class, model, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data['results']
+        self.assertTrue(results)
+        by_id = model.objects.in_bulk([row['id'] for row in results])
+        objects = [by_id[model._meta.pk.to_python(row['id'])] for row in results]
+        self.assertEqual(
+            FastJSONRenderer().render(results),
+            JSONRenderer().render(serializer_class(objects, many=True).data)
+        )
+
+    def test_task_serializer_contract(self):
+        """Test that fast task rows match TaskSerializer byte for byte"""
+        self.assertMatchesSerializer(FastTaskSerializer, TaskSerializer, Task.objects.all())
+
+    def test_time_entry_serializer_contract(self):
+        """Test that fast time entry rows match TimeEntrySerializer byte for byte"""
+        self.assertMatchesSerializer(FastTimeEntrySerializer, TimeEntrySerializer, TimeEntry.objects.all())
+
+    def test_notification_serializer_contract(self):
+        """Test that fast notification rows match NotificationSerializer byte for byte"""
+        self.assertMatchesSerializer(FastNotificationSerializer, NotificationSerializer,
+                                     Notification.objects.all())
+
+    def test_team_members_inserted_out_of_id_order(self):
+        """Test that both paths list members in the same order whatever order they joined in"""
+        project = Project.objects.create(title='Crowded', created_by=self.manager)
+        for prefix in 'f80':
+            member = User.objects.create_user(
+                id=uuid.UUID(prefix * 32),
+                username=f'member-{prefix}',
+                email=f'member-{prefix}@example.com',
+                password='password123',
+                name=f'Member {prefix}',
+                role='EMPLOYEE'
+            )
+            project.team_members.add(member)
+        Task.objects.create(title='Crowded task', project=project, created_by=self.manager)
+
+        tasks = Task.objects.filter(project=project)
+        self.assertMatchesSerializer(FastTaskSerializer, TaskSerializer, tasks)
+        self.assertMatchesSerializer(FastTaskSerializer, TaskSerializer, TaskSerializer.setup_eager_loading(tasks))
+        members = TaskSerializer(tasks.get()).data['project']['team_members']
+        self.assertEqual([member['name'] for member in members], ['Member 0', 'Member 8', 'Member f'])
+
+    def test_list_endpoints_use_fast_path(self):
+        """Test that GET list responses are identical to the ModelSerializer output"""
+        self.assertListMatchesSerializer('task-list-create', TaskSerializer, Task, self.user)
+        self.assertListMatchesSerializer('timeentry-list-create', TimeEntrySerializer, TimeEntry, self.user)
+        self.assertListMatchesSerializer('notification-list', NotificationSerializer, Notification, self.user)
+
+    def test_task_list_query_count_is_flat(self):
+        """Test that the task list does not issue queries per row"""
+        self.client.force_authenticate(user=self.manager)
+        for i in range(10):
+            Task.objects.create(title=f'Extra {i}', project=self.project, created_by=self.manager)
+
+        # count, page, team members, task counts, time spent
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('task-list-create'))
+        self.assertEqual(response.data['count'], 11)
@@ -0,0 +1,142 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+import csv
+import io
+import json
+import os
+import tempfile
+
+from api.importer import import_rows, read_rows
+from api.models import User, Project, Task, TimeEntry, ChangeLog
+
+
+class ImportTests(TestCase):
+    """Tests for the task / time entry import pipeline"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='password123',
+            name='Other',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Import Project', created_by=self.user)
+        self.project.team_members.add(self.user)
+        Project.objects.create(title='Foreign Project', created_by=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, kind, name, content, **data):
+        return self.client.post(reverse('import', kwargs={'kind': kind}),
+                                {'file': SimpleUploadedFile(name, content), **data},
+                                format='multipart')
+
+    def test_csv_import_reports_rejected_rows(self):
+        """Test that valid rows are created and invalid rows reported by number"""
+        content = (
+            'title,status,project,assigned_to,estimated_hours\n'
+            'First,todo,Import Project,other@example.com,2\n'
+            ',todo,,,\n'
+            'Second,in_progress,Foreign Project,,\n'
+            'Third,bogus,,,\n'
+            'Fourth,,,nobody@example.com,\n'
+            'Fifth,,Import Project,,\n'
+        ).encode()
+
+        response = self.upload('tasks', 'tasks.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['total'], response.data['created'], response.data['failed']), (6, 2, 4))
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 4, 5])
+        self.assertIn('project', response.data['errors'][1]['errors'])
+
+        first = Task.objects.get(title='First')
+        self.assertEqual((first.project, first.assigned_to, first.created_by), (self.project, self.other, self.user))
+        self.assertLess(first.rank, Task.objects.get(title='Fifth').rank)
+        self.assertEqual(ChangeLog.objects.filter(model='tasks').count(), 2)
+
+    def test_references_are_resolved_per_batch(self):
+        """Test that the query count does not grow with the number of rows"""
+        def run(count):
+            rows = [{'title': f'Task {i}', 'project': 'Import Project', 'assigned_to': 'other@example.com'}
+                    for i in range(count)]
+            with self.assertNumQueries(9):
+                report = import_rows('tasks', rows, self.user)
+            self.assertEqual(report['created'], count)
+
+        # projects, membership, users, savepoint, ranks, insert, change log, status transitions, release
+        run(5)
+        run(50)
+
+    def test_ndjson_time_entries_and_dry_run(self):
+        """Test time entry import from NDJSON, including dry runs and ownership"""
+        task = Task.objects.create(title='Timed', project=self.project, created_by=self.user)
+        lines = [
+            {'task_id': str(task.id), 'start_time': '2025-03-03T09:00:00Z', 'end_time': '2025-03-03T10:30:00Z'},
+            {'task_id': str(task.id), 'start_time': '2025-03-03T09:00:00Z', 'user': 'other@example.com'},
+        ]
+        content = ('\n'.join(json.dumps(line) for line in lines) + '\nnot json\n').encode()
+
+        response = self.upload('time-entries', 'entries.ndjson', content, dry_run='true')
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 2))
+        self.assertFalse(TimeEntry.objects.exists())
+
+        response = self.upload('time-entries', 'entries.ndjson', content)
+        self.assertEqual(response.data['errors'][0],
+                         {'row': 2, 'errors': {'user': 'You can only import your own time entries'}})
+        self.assertEqual(response.data['errors'][1]['row'], 3)
+        entry = TimeEntry.objects.get()
+        self.assertEqual((entry.user, entry.duration_hours), (self.user, 1.5))
+
+    def test_management_command(self):
+        """Test that import_tasks imports a file from disk"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('title,priority\nFrom disk,high\n')
+        self.addCleanup(os.unlink, handle.name)
+
+        out = io.StringIO()
+        call_command('import_tasks', handle.name, '--as', self.user.email, stdout=out)
+
+        self.assertIn('Imported 1 of 1 rows', out.getvalue())
+        self.assertEqual(Task.objects.get().priority, 'high')
+
+    def test_read_rows_flags_bad_ndjson(self):
+        """Test that unparseable NDJSON lines are passed on as None"""
+        rows = list(read_rows(io.BytesIO(b'{"title": "ok"}\n\n[1]\n{broken\n'), 'ndjson'))
+        self.assertEqual(rows, [{'title': 'ok'}, None, None])
+
+    def test_invalid_utf8_is_rejected(self):
+        """Test that a CSV that is not UTF-8 gets a 400 instead of a server error"""
+        content = 'title,description\nCafé,crème\n'.encode('latin-1')
+
+        response = self.upload('tasks', 'tasks.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error'], {'row': 1, 'detail': 'The file is not valid UTF-8'})
+        self.assertFalse(Task.objects.exists())
+
+    def test_oversized_csv_field_is_rejected(self):
+        """Test that a field over the csv module's size limit gets a 400 naming its row"""
+        content = f'title,description\nFine,short\nHuge,{"x" * (csv.field_size_limit() + 1)}\n'.encode()
+
+        response = self.upload('tasks', 'tasks.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error']['row'], 2)
+        self.assertIn('field larger than field limit', response.data['file_error']['detail'])
+        self.assertFalse(Task.objects.exists())
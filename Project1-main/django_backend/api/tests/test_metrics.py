@@ -0,0 +1,97 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+import re
+import shutil
+import tempfile
+
+from api.metrics import MetricsStore, metrics_store, instrument_connection, render_metrics
+from api.models import User, Task
+
+
+def sample(text, line_prefix):
+    """Value of the metrics line starting with line_prefix"""
+    match = re.search(rf'^{re.escape(line_prefix)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class RequestMetricsTests(TestCase):
+    """Tests for per-endpoint request/SQL metrics and the /metrics endpoint"""
+
+    def setUp(self):
+        # The test database connection may predate the signal handler
+        instrument_connection(sender=None, connection=connection)
+        metrics_store.reset()
+        self.addCleanup(metrics_store.reset)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.staff = User.objects.create_user(
+            username='ops',
+            email='ops@example.com',
+            password='password123',
+            name='Ops',
+            role='EMPLOYEE',
+            is_staff=True
+        )
+        for index in range(3):
+            Task.objects.create(title=f'Task {index}', created_by=self.user, assigned_to=self.user)
+        self.client = APIClient()
+
+    def scrape(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_recorded_by_url_name(self):
+        """Test request count, SQL count, latency histogram and size per URL name"""
+        self.client.force_authenticate(user=self.user)
+        # request_started clears connection.queries, so count with a wrapper of our own
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            first = self.client.get(reverse('task-list-create'))
+        self.client.get(reverse('task-list-create'))
+
+        text = self.scrape()
+        labels = '{view="task-list-create"'
+        self.assertEqual(sample(text, f'taskflow_http_requests_total{labels},method="GET",status="200"}}'), 2)
+        self.assertEqual(sample(text, f'taskflow_db_queries_total{labels}}}'), 2 * len(queries))
+        self.assertEqual(sample(text, f'taskflow_http_response_size_bytes_total{labels}}}'),
+                         2 * len(first.content))
+        self.assertEqual(sample(text, f'taskflow_http_request_duration_seconds_bucket{labels},le="+Inf"}}'), 2)
+        self.assertEqual(sample(text, f'taskflow_http_request_duration_seconds_count{labels}}}'), 2)
+        self.assertGreater(sample(text, f'taskflow_db_query_duration_seconds_total{labels}}}'), 0)
+
+    def test_metrics_are_staff_only(self):
+        """Test that non-staff users cannot read /metrics"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_worker_files_are_summed(self):
+        """Test that counters flushed by other worker processes are included"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+
+        with override_settings(METRICS={'DIRECTORY': directory}):
+            other_worker = MetricsStore()
+            other_worker.observe('task-detail', 'GET', 200, 0.02, queries=4, sql_seconds=0.01, size=100)
+            other_worker.flush()
+            metrics_store.observe('task-detail', 'GET', 200, 3.0, queries=1, sql_seconds=0.5, size=50)
+
+            text = render_metrics()
+
+        labels = '{view="task-detail"'
+        self.assertEqual(sample(text, f'taskflow_http_requests_total{labels},method="GET",status="200"}}'), 2)
+        self.assertEqual(sample(text, f'taskflow_db_queries_total{labels}}}'), 5)
+        self.assertEqual(sample(text, f'taskflow_http_request_duration_seconds_bucket{labels},le="0.025"}}'), 1)
+        self.assertEqual(sample(text, f'taskflow_http_request_duration_seconds_bucket{labels},le="5.0"}}'), 2)
+        self.assertEqual(sample(text, f'taskflow_http_response_size_bytes_total{labels}}}'), 150)
@@ -0,0 +1,166 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.querycheck import QueryCheckError, QueryCheckMiddleware, fingerprint, query_budget
+from api.models import (
+    User, Project, Task, TimeEntry, Comment, Attachment, ActivityLog, Notification, TaskTimer
+)
+
+
+class FingerprintTests(TestCase):
+    """Tests for SQL fingerprinting and the N+1 / budget checks"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+    def test_literals_and_in_lists_share_a_fingerprint(self):
+        """Test that statements differing only in values have the same fingerprint"""
+        self.assertEqual(
+            fingerprint('SELECT "api_task"."id" FROM "api_task" WHERE "api_task"."project_id" = %s LIMIT 21'),
+            fingerprint('SELECT  "api_task"."id" FROM "api_task"\nWHERE "api_task"."project_id" = \'abc\' LIMIT 5'),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM "api_user" WHERE "api_user"."id" IN (%s, %s, %s)'),
+            'SELECT * FROM "api_user" WHERE "api_user"."id" IN (...)',
+        )
+        self.assertNotEqual(fingerprint('SELECT * FROM "api_user"'), fingerprint('SELECT * FROM "api_task"'))
+
+    def test_repeated_statement_is_reported(self):
+        """Test that the middleware raises or logs when one statement shape repeats"""
+        def view(request):
+            for _ in range(4):
+                User.objects.filter(pk=self.user.pk).exists()
+            return HttpResponse()
+
+        middleware = QueryCheckMiddleware(view)
+        request = RequestFactory().get('/api/tasks/')
+        with override_settings(QUERY_CHECKS={'ACTION': 'raise', 'N_PLUS_ONE_THRESHOLD': 3}):
+            with self.assertRaisesMessage(QueryCheckError, 'Possible N+1 in GET /api/tasks/: 4 runs of'):
+                middleware(request)
+        with override_settings(QUERY_CHECKS={'ACTION': 'log', 'N_PLUS_ONE_THRESHOLD': 3}):
+            with self.assertLogs('api.querycheck', 'WARNING'):
+                middleware(request)
+        with override_settings(QUERY_CHECKS={'ACTION': 'raise', 'N_PLUS_ONE_THRESHOLD': 4}):
+            self.assertEqual(middleware(request).status_code, status.HTTP_200_OK)
+
+    def test_query_budget(self):
+        """Test that @query_budget reports views running more queries than allowed"""
+        @query_budget(2)
+        def view(count):
+            for _ in range(count):
+                User.objects.count()
+            return count
+
+        self.assertEqual(view(2), 2)
+        with self.assertRaisesMessage(QueryCheckError, 'ran 3 queries, over its budget of 2'):
+            view(3)
+        with override_settings(QUERY_CHECKS={'ACTION': 'off'}):
+            self.assertEqual(view(3), 3)
+
+
+class QueryCountScalingTests(TestCase):
+    """Test that list and report endpoints run as many queries for 100 rows as for 1"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.colleague = User.objects.create_user(
+            username='colleague',
+            email='colleague@example.com',
+            password='password123',
+            name='Colleague',
+            role='EMPLOYEE'
+        )
+        self.home_task = None
+        self.seeded = 0
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def seed(self, total):
+        """Add rows of every kind until there are `total` of each"""
+        now = timezone.now()
+        for index in range(self.seeded, total):
+            project = Project.objects.create(title=f'Project {index}', created_by=self.colleague)
+            project.team_members.add(self.user, self.colleague)
+            task = Task.objects.create(title=f'Task {index}', project=project, created_by=self.colleague,
+                                       assigned_to=self.user, due_date=now - timedelta(days=1))
+            if index % 2 == 0:
+                task.status = 'done'
+                task.save()
+            self.home_task = self.home_task or task
+            TimeEntry.objects.create(task=task, user=self.user, start_time=now - timedelta(hours=2),
+                                     end_time=now - timedelta(hours=1))
+            TaskTimer.objects.create(task_id=task.pk, user_id=self.user.pk, start_time=now - timedelta(minutes=30),
+                                     end_time=now - timedelta(minutes=10))
+            Comment.objects.create(task=self.home_task, user=self.colleague, content=f'Comment {index}')
+            Attachment.objects.create(task=self.home_task, uploaded_by=self.colleague, file_name=f'{index}.txt',
+                                      file_size=1, file_type='text/plain', file_url='https://example.com/a.txt')
+            ActivityLog.objects.create(user=self.colleague, task=task, project=project,
+                                       action='created', description=f'Created task {index}')
+            Notification.objects.create(user=self.user, title='Assigned', message=f'Task {index}',
+                                        notification_type='task_assigned')
+            User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com',
+                                     password='password123', name=f'User {index}', role='EMPLOYEE')
+        self.seeded = total
+
+    def endpoints(self):
+        task_id = self.home_task.pk
+        return [
+            ('project-list-create', reverse('project-list-create')),
+            ('task-list-create', reverse('task-list-create')),
+            ('timeentry-list-create', reverse('timeentry-list-create')),
+            ('time-summary', reverse('time-summary')),
+            ('dashboard-stats', reverse('dashboard-stats')),
+            ('comment-list-create', reverse('comment-list-create', kwargs={'task_id': task_id})),
+            ('attachment-list-create', reverse('attachment-list-create', kwargs={'task_id': task_id})),
+            ('notification-list', reverse('notification-list')),
+            ('notification-summary', reverse('notification-summary')),
+            ('activity-log-list', reverse('activity-log-list')),
+            ('recent-activity', reverse('recent-activity')),
+            ('timesheet-daily', reverse('timesheet-daily')),
+            ('timesheet-weekly', reverse('timesheet-weekly')),
+            ('calendar', reverse('calendar')),
+            ('analytics-productivity', reverse('analytics-productivity')),
+            ('analytics-team', reverse('analytics-team')),
+            ('analytics-distribution', reverse('analytics-distribution')),
+            ('analytics-lead-time', reverse('analytics-lead-time')),
+            ('analytics-cycle-time', reverse('analytics-cycle-time')),
+            ('changes-feed', reverse('changes-feed')),
+        ]
+
+    def query_count(self, name, url):
+        # request_started clears connection.queries, so count with a wrapper of our own
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+        return len(queries)
+
+    def test_query_counts_are_flat(self):
+        """Test that seeding 1, 10 and 100 rows does not change any endpoint's query count"""
+        counts = {}
+        for total in (1, 10, 100):
+            self.seed(total)
+            counts[total] = {name: self.query_count(name, url) for name, url in self.endpoints()}
+
+        for name in counts[1]:
+            self.assertEqual(counts[10][name], counts[1][name], name)
+            self.assertEqual(counts[100][name], counts[1][name], name)
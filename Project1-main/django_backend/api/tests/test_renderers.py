@@ -0,0 +1,125 @@
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+import io
+import json
+import uuid
+import pytz
+
+from api.models import User, Project, Task
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer must produce the same JSON as DRF's JSONRenderer"""
+
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def assertSameValues(self, data):
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_native_types_match_stdlib_output(self):
+        """Test UUIDs, dates, datetimes and text render identically"""
+        self.assertSameOutput({
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'aware': pytz.timezone('UTC').localize(datetime(2025, 3, 10, 12, 30, 5, 120)),
+            'offset': pytz.timezone('Asia/Kolkata').localize(datetime(2025, 3, 10, 12, 30)),
+            'naive': datetime(2025, 3, 10, 12, 30),
+            'day': date(2025, 3, 10),
+            'text': 'café\u2028line\u2029',
+            'nested': [{'n': 1, 'f': 1.5, 'none': None, 'flag': True}],
+        })
+
+    def test_microseconds_match_stdlib_output(self):
+        """Test that datetimes and times with microseconds render to the same bytes"""
+        moment = datetime(2025, 3, 10, 12, 30, 5, 123456)
+        data = {
+            'utc': pytz.timezone('UTC').localize(moment),
+            'offset': pytz.timezone('Asia/Kolkata').localize(moment),
+            'naive': moment,
+            'time': moment.time(),
+            'milliseconds': moment.replace(microsecond=7000),
+        }
+        self.assertSameOutput(data)
+        self.assertIn(b'"2025-03-10T12:30:05.123456Z"', FastJSONRenderer().render(data))
+
+    def test_fallback_types_match_stdlib_output(self):
+        """Test types orjson does not know go through DRF's encoder"""
+        self.assertSameOutput({
+            'decimal': Decimal('1.25'),
+            'duration': timedelta(hours=1),
+            'lazy': gettext_lazy('Done'),
+        })
+
+    def test_float_exponents_decode_to_the_same_values(self):
+        """Test that floats orjson formats differently still decode to the same numbers"""
+        data = {'big': 1e16, 'small': 1e-7, 'huge': 1e22, 'tiny': 5e-324}
+        self.assertSameValues(data)
+        self.assertEqual(FastJSONRenderer().render({'big': 1e16}), b'{"big":1e16}')
+
+    def test_wide_integers_fall_back_to_stdlib(self):
+        """Test that integers beyond 64 bits render like JSONRenderer instead of failing"""
+        self.assertSameOutput({'wide': 2 ** 70, 'negative': -2 ** 64, 'nested': [{'n': 10 ** 30}]})
+
+    def test_non_finite_floats_fall_back_to_stdlib(self):
+        """Test that NaN and infinity are refused like JSONRenderer does, not rendered as null"""
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({'value': [value]})
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'value': [value]})
+        self.assertSameOutput({'value': None, 'ok': 1.5})
+
+    def test_indent_uses_stdlib(self):
+        """Test that pretty-printing requests are honoured"""
+        data = {'a': [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2')
+        )
+
+    def test_parser_round_trip_and_errors(self):
+        """Test that the parser decodes JSON and reports malformed input"""
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"a": [1, "\xc3\xa9"]}')), {'a': [1, 'é']})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"a": NaN}'))
+
+
+class FastJSONApiTests(TestCase):
+    """The API is wired to the fast renderer and parser"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='scrummaster',
+            email='scrummaster@example.com',
+            password='password123',
+            name='Scrum Master',
+            role='SCRUM_MASTER'
+        )
+        self.project = Project.objects.create(title='JSON Project', created_by=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_task_round_trip(self):
+        """Test that a task can be created and listed through the JSON API"""
+        response = self.client.post(
+            reverse('task-list-create'),
+            data=b'{"title": "Caf\xc3\xa9", "project_id": "%s"}' % str(self.project.id).encode(),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse('task-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertEqual(Task.objects.get().title, 'Café')
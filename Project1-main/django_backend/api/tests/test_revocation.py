@@ -0,0 +1,133 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import timedelta
+import io
+import uuid
+
+from api.models import User, RevokedToken
+from api.revocation import BloomFilter, revocation_store
+
+
+class RevocationTests(TestCase):
+    """Tests for refresh-token rotation, logout and the revocation store"""
+
+    def setUp(self):
+        revocation_store.reset()
+        self.addCleanup(revocation_store.reset)
+
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post(reverse('token_refresh'), {'refresh': str(token)}, format='json')
+
+    def revoked_queries(self, token):
+        """Refresh a token and return the queries reading the revocation table"""
+        with CaptureQueriesContext(connection) as queries:
+            self.response = self.refresh(token)
+        table = RevokedToken._meta.db_table
+        return [query for query in queries if f'FROM "{table}"' in query['sql']]
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added value is found and unrelated values rarely are"""
+        bloom = BloomFilter(1000, 0.01)
+        values = [str(uuid.uuid4()) for _ in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_rotated_token_cannot_be_reused(self):
+        """Test that refreshing revokes the presented refresh token"""
+        token = RefreshToken.for_user(self.user)
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(RevokedToken.objects.filter(jti=token['jti']).exists())
+
+    def test_unrevoked_tokens_skip_the_table(self):
+        """Test that only filter hits are checked in the database"""
+        self.refresh(RefreshToken.for_user(self.user))
+
+        self.assertEqual(self.revoked_queries(RefreshToken.for_user(self.user)), [])
+        self.assertEqual(self.response.status_code, status.HTTP_200_OK)
+        stats = revocation_store.stats()
+        self.assertEqual(stats['db_checks'], 0)
+        self.assertGreaterEqual(stats['filter_negatives'], 2)
+
+    def test_logout_revokes_refresh_token(self):
+        """Test that a logged-out refresh token is refused"""
+        token = RefreshToken.for_user(self.user)
+        response = self.client.post(reverse('logout'), {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(reverse('logout'), {'refresh': 'garbage'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_without_refresh_token_is_rejected(self):
+        """Test that logout without a refresh token is a 400 and revokes nothing"""
+        for data in ({}, {'refresh': ''}):
+            response = self.client.post(reverse('logout'), data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_revocations_from_other_processes_are_synced(self):
+        """Test that rows written elsewhere reach the filter on the next sync"""
+        self.refresh(RefreshToken.for_user(self.user))
+        token = RefreshToken.for_user(self.user)
+        RevokedToken.objects.create(jti=token['jti'], expires_at=timezone.now() + timedelta(days=1))
+
+        with self.settings(TOKEN_REVOCATION={'SYNC_INTERVAL': 0}):
+            revocation_store._next_sync = 0
+            self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_concurrent_rotations_of_one_token(self):
+        """Test that a token rotated elsewhere after the revocation check cannot be rotated again"""
+        self.refresh(RefreshToken.for_user(self.user))
+        token = RefreshToken.for_user(self.user)
+        # The other request's insert lands after this process last synced its filter
+        RevokedToken.objects.create(jti=token['jti'], expires_at=timezone.now() + timedelta(days=1))
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn('access', response.data)
+
+    def test_refresh_does_not_compact(self):
+        """Test that expired JTIs are left for the compaction command, not purged on refresh"""
+        RevokedToken.objects.create(jti='expired', expires_at=timezone.now() - timedelta(minutes=1))
+        with self.settings(TOKEN_REVOCATION={'SYNC_INTERVAL': 0}):
+            self.refresh(RefreshToken.for_user(self.user))
+            self.refresh(RefreshToken.for_user(self.user))
+        self.assertTrue(RevokedToken.objects.filter(jti='expired').exists())
+
+    def test_compaction_purges_expired_tokens(self):
+        """Test that compaction drops expired JTIs from the table and the filter"""
+        now = timezone.now()
+        RevokedToken.objects.bulk_create([
+            RevokedToken(jti='expired', expires_at=now - timedelta(minutes=1)),
+            RevokedToken(jti='live', expires_at=now + timedelta(days=1)),
+        ])
+
+        out = io.StringIO()
+        call_command('compact_revoked_tokens', stdout=out)
+        self.assertIn('Purged 1', out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(revocation_store.stats()['size'], 1)
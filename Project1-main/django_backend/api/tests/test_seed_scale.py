@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from api.models import (
+    User, Project, Task, TaskStatusTransition, TimeEntry, Comment, Notification, ActivityLog, TaskTimer
+)
+
+
+class SeedScaleTests(TestCase):
+    """Tests for the seed_scale load-testing data generator"""
+
+    def seed(self, seed=7):
+        call_command('seed_scale', seed=seed, users=20, projects=5, tasks_per_project=8, comments=40,
+                     time_entries=50, timers=30, notifications=60, activity_logs=70, chunk_size=16,
+                     stdout=StringIO())
+
+    def test_row_counts_and_generated_columns(self):
+        """Test that the requested rows are written with ranks, durations and historical timestamps"""
+        self.seed()
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Project.objects.count(), 5)
+        self.assertEqual(Comment.objects.count(), 40)
+        self.assertEqual(TimeEntry.objects.count(), 50)
+        self.assertEqual(TaskTimer.objects.count(), 30)
+        self.assertEqual(Notification.objects.count(), 60)
+        self.assertEqual(ActivityLog.objects.count(), 70)
+        self.assertGreater(Task.objects.count(), 0)
+
+        self.assertFalse(Task.objects.filter(rank='').exists())
+        self.assertFalse(TimeEntry.objects.filter(duration_hours__isnull=True).exists())
+        self.assertGreater(Task.objects.values('created_at').distinct().count(), 1)
+        self.assertFalse(Task.objects.filter(status='done', completed_at__isnull=True).exists())
+        self.assertFalse(Task.objects.exclude(status='done').filter(completed_at__isnull=False).exists())
+        self.assertEqual(TaskStatusTransition.objects.filter(from_status__isnull=True).count(), Task.objects.count())
+        for task in Task.objects.filter(status='done')[:20]:
+            last = task.status_transitions.last()
+            self.assertEqual((last.to_status, last.at), ('done', task.completed_at))
+        for project in Project.objects.prefetch_related('team_members'):
+            self.assertIn(project.created_by, project.team_members.all())
+        user = User.objects.get(email='seed7-user0@example.com')
+        self.assertTrue(user.check_password('password123'))
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_same_seed_gives_same_rows(self):
+        """Test that a seed reproduces the same ids and values"""
+        def snapshot():
+            return (sorted(Task.objects.values_list('id', 'status', 'assigned_to_id', 'rank')),
+                    sorted(TimeEntry.objects.values_list('id', 'task_id', 'duration_hours')))
+
+        self.seed()
+        first = snapshot()
+        User.objects.all().delete()
+        self.assertEqual(Task.objects.count(), 0)
+
+        self.seed()
+        self.assertEqual(snapshot(), first)
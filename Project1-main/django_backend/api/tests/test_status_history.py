@@ -0,0 +1,155 @@
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.models import User, Project, Task, TaskStatusTransition
+
+
+class StatusHistoryTests(TestCase):
+    """Tests for task status transitions, completed_at and the flow-time analytics"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+        self.project = Project.objects.create(title='Flow Project', created_by=self.user, status='active')
+        self.project.team_members.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def history(self, task):
+        return list(task.status_transitions.values_list('from_status', 'to_status', 'user_id'))
+
+    def test_saves_record_transitions_and_completed_at(self):
+        """Test that creating, updating and reopening a task keeps its history and completed_at"""
+        response = self.client.post(reverse('task-list-create'), {
+            'title': 'Tracked', 'project_id': str(self.project.id)
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(pk=response.data['id'])
+
+        url = reverse('task-detail', kwargs={'pk': task.pk})
+        self.client.patch(url, {'status': 'in_progress'}, format='json')
+        self.client.patch(url, {'title': 'Renamed'}, format='json')
+        response = self.client.patch(url, {'status': 'done'}, format='json')
+        self.assertIsNotNone(response.data['completed_at'])
+
+        self.assertEqual(self.history(task), [
+            (None, 'todo', self.user.pk),
+            ('todo', 'in_progress', self.user.pk),
+            ('in_progress', 'done', self.user.pk),
+        ])
+        task.refresh_from_db()
+        self.assertEqual(task.completed_at, task.status_transitions.last().at)
+
+        self.client.patch(url, {'status': 'review'}, format='json')
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+
+    def test_bulk_and_board_moves_record_transitions(self):
+        """Test that bulk status operations and Kanban moves write transitions and completed_at"""
+        first = Task.objects.create(title='First', project=self.project, created_by=self.user)
+        second = Task.objects.create(title='Second', project=self.project, created_by=self.user)
+
+        response = self.client.post(reverse('task-bulk'), {'operations': [
+            {'op': 'status', 'id': str(first.id), 'status': 'done'},
+            {'op': 'update', 'id': str(second.id), 'data': {'title': 'Still todo'}},
+            {'op': 'create', 'data': {'title': 'Born done', 'status': 'done', 'project_id': str(self.project.id)}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        first.refresh_from_db()
+        self.assertIsNotNone(first.completed_at)
+        self.assertEqual(self.history(first), [(None, 'todo', self.user.pk), ('todo', 'done', self.user.pk)])
+        self.assertEqual(len(self.history(second)), 1)
+        created = Task.objects.get(title='Born done')
+        self.assertIsNotNone(created.completed_at)
+        self.assertEqual(self.history(created), [(None, 'done', self.user.pk)])
+
+        response = self.client.post(reverse('task-move', kwargs={'pk': first.pk}), {'status': 'review'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        self.assertIsNone(first.completed_at)
+        self.assertEqual(self.history(first)[-1], ('done', 'review', self.user.pk))
+
+        # Reordering within a column is not a status change
+        self.client.post(reverse('task-move', kwargs={'pk': first.pk}), {'status': 'review'}, format='json')
+        self.assertEqual(len(self.history(first)), 3)
+
+    def flow(self, title, created_days_ago, steps):
+        """A task whose history is `steps`: (status, days ago) pairs after creation in todo"""
+        now = timezone.now()
+        task = Task.objects.create(title=title, project=self.project, created_by=self.user)
+        created = now - timedelta(days=created_days_ago)
+        Task.objects.filter(pk=task.pk).update(created_at=created)
+        task.status_transitions.update(at=created)
+        previous = 'todo'
+        for to_status, days_ago in steps:
+            TaskStatusTransition.objects.create(task=task, from_status=previous, to_status=to_status,
+                                                at=now - timedelta(days=days_ago))
+            previous = to_status
+        completed_at = now - timedelta(days=steps[-1][1]) if previous == 'done' else None
+        Task.objects.filter(pk=task.pk).update(status=previous, completed_at=completed_at)
+        return task
+
+    def test_lead_and_cycle_time(self):
+        """Test that lead time runs from creation and cycle time from the first start to completion"""
+        self.flow('Straight', 10, [('in_progress', 8), ('done', 6)])
+        self.flow('Reopened', 12, [('in_progress', 11), ('done', 9), ('review', 5), ('done', 2)])
+        self.flow('Skipped work', 4, [('done', 3)])
+        self.flow('Open', 10, [('in_progress', 9)])
+        self.flow('Long ago', 90, [('in_progress', 80), ('done', 60)])
+
+        response = self.client.get(reverse('analytics-lead-time'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['median_hours'], 96.0)  # 4, 10 and 1 days
+        self.assertEqual(sum(week['count'] for week in response.data['weekly']), 3)
+
+        response = self.client.get(reverse('analytics-cycle-time'))
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['mean_hours'], 5.5 * 24)  # 2 and 9 days
+
+        response = self.client.get(reverse('analytics-lead-time'), {'days': 120})
+        self.assertEqual(response.data['count'], 4)
+
+    def test_trends_and_dashboard_use_completion_times(self):
+        """Test that productivity trends count completions by day and the dashboard averages lead time"""
+        self.flow('Old work', 40, [('done', 1)])
+        self.flow('Quick', 3, [('done', 1)])
+
+        response = self.client.get(reverse('analytics-productivity'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        completed_day = (timezone.localtime() - timedelta(days=1)).date()
+        trends = {row['date']: row for row in response.data['trends']}
+        self.assertEqual(trends[completed_day]['completed'], 2)
+        self.assertEqual(sum(row['total'] for row in trends.values()), 1)
+
+        response = self.client.get(reverse('dashboard-stats'))
+        self.assertEqual(response.data['avg_completion_time'], round((39 + 2) / 2 * 24, 1))
+
+    def test_backfilled_tasks_count_for_lead_time_only(self):
+        """Test that tasks done before history was kept get a synthetic transition used by lead time"""
+        migration = import_module('api.migrations.0012_task_status_transitions')
+        task = Task.objects.create(title='Legacy', project=self.project, created_by=self.user)
+        task.status_transitions.all().delete()
+        Task.objects.filter(pk=task.pk).update(status='done', completed_at=timezone.now() - timedelta(days=1),
+                                               created_at=timezone.now() - timedelta(days=3))
+
+        migration.backfill_done_transitions(apps, None)
+        migration.backfill_done_transitions(apps, None)
+        self.assertEqual(self.history(task), [('todo', 'done', None)])
+
+        response = self.client.get(reverse('analytics-lead-time'))
+        self.assertEqual((response.data['count'], response.data['median_hours']), (1, 48.0))
+        self.assertEqual(self.client.get(reverse('analytics-cycle-time')).data['count'], 0)
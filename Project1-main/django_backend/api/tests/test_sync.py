@@ -0,0 +1,156 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import timedelta
+from unittest import mock
+
+from api.models import User, Project, Task, Comment, TimeEntry, Notification, ChangeLog
+
+
+@override_settings(CHANGE_SYNC={'SETTLE_WINDOW': 0})
+class ChangesFeedTests(TestCase):
+    """Tests for GET /api/changes/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            name='Employee',
+            role='EMPLOYEE'
+        )
+
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='password123',
+            name='Other',
+            role='EMPLOYEE'
+        )
+
+        self.project = Project.objects.create(title='Sync Project', created_by=self.other)
+        self.project.team_members.add(self.user)
+
+        self.url = reverse('changes-feed')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def current_cursor(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.data['reset'])
+        return response.data['cursor']
+
+    def test_feed_returns_rows_changed_since_cursor(self):
+        """Test that created and updated rows after the cursor are returned once"""
+        cursor = self.current_cursor()
+
+        task = Task.objects.create(title='Synced', project=self.project, created_by=self.other)
+        task.title = 'Synced and renamed'
+        task.save()
+        Notification.objects.create(user=self.user, title='Hello', message='Hi',
+                                    notification_type='task_assigned')
+        Notification.objects.create(user=self.other, title='Private', message='Hi',
+                                    notification_type='task_assigned')
+
+        response = self.client.get(self.url, {'since': cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['reset'])
+        self.assertEqual([row['title'] for row in response.data['changes']['tasks']], ['Synced and renamed'])
+        self.assertEqual([row['title'] for row in response.data['changes']['notifications']], ['Hello'])
+        self.assertGreater(response.data['cursor'], cursor)
+
+        response = self.client.get(self.url, {'since': response.data['cursor']})
+        self.assertEqual(response.data['changes']['tasks'], [])
+
+    def test_deletes_propagate_as_tombstones(self):
+        """Test that deleted rows are reported through tombstones"""
+        task = Task.objects.create(title='Doomed', project=self.project, created_by=self.other)
+        cursor = self.current_cursor()
+
+        task_id = task.id
+        task.delete()
+
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertEqual(response.data['deleted']['tasks'], [task_id])
+        self.assertEqual(response.data['changes']['tasks'], [])
+
+    def test_bulk_writes_are_logged(self):
+        """Test that QuerySet.update paths record changes explicitly"""
+        Notification.objects.create(user=self.user, title='Unread', message='Hi',
+                                    notification_type='task_due')
+        cursor = self.current_cursor()
+
+        self.client.post(reverse('notification-mark-all-read'))
+
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertTrue(response.data['changes']['notifications'][0]['is_read'])
+
+    def test_notifications_in_events_database_log_after_commit(self):
+        """Test that marking notifications read in another database logs the change once it commits"""
+        Notification.objects.create(user=self.user, title='Unread', message='Hi',
+                                    notification_type='task_due')
+        cursor = self.current_cursor()
+        logged = ChangeLog.objects.count()
+        # Put ChangeLog on another alias; the notifications stay on the test database
+        aliases = {Notification: 'default', ChangeLog: 'changes'}
+        with mock.patch('api.views.router.db_for_write', side_effect=aliases.get), \
+                self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(reverse('notification-mark-all-read'))
+        self.assertEqual(ChangeLog.objects.count(), logged)
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertTrue(response.data['changes']['notifications'][0]['is_read'])
+
+    def test_pruned_cursor_requires_reset(self):
+        """Test that a cursor older than the retained log asks the client to reload"""
+        Task.objects.create(title='Old', project=self.project, created_by=self.other)
+        cursor = self.current_cursor()
+        Task.objects.create(title='New', project=self.project, created_by=self.other)
+        Task.objects.create(title='Newer', project=self.project, created_by=self.other)
+        ChangeLog.objects.filter(id__lte=cursor + 1).delete()
+
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertTrue(response.data['reset'])
+
+    def test_cursor_waits_for_the_settle_window(self):
+        """Test that fresh entries are returned but the cursor only passes settled ones"""
+        cursor = self.current_cursor()
+        ChangeLog.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        Task.objects.create(title='Fresh', project=self.project, created_by=self.other)
+
+        with self.settings(CHANGE_SYNC={'SETTLE_WINDOW': 60}):
+            self.assertEqual(self.client.get(self.url).data['cursor'], cursor)
+            response = self.client.get(self.url, {'since': cursor, 'limit': 1})
+            self.assertEqual([row['title'] for row in response.data['changes']['tasks']], ['Fresh'])
+            self.assertEqual(response.data['cursor'], cursor)
+            self.assertFalse(response.data['has_more'])
+
+            ChangeLog.objects.filter(id__gt=cursor).update(created_at=timezone.now() - timedelta(minutes=2))
+            response = self.client.get(self.url, {'since': cursor})
+            self.assertGreater(response.data['cursor'], cursor)
+
+    def test_membership_changes_resync_project_contents(self):
+        """Test that joining or leaving a project brings or removes its tasks, comments and time entries"""
+        project = Project.objects.create(title='Elsewhere', created_by=self.other)
+        task = Task.objects.create(title='Hidden', project=project, created_by=self.other)
+        comment = Comment.objects.create(task=task, user=self.other, content='Note')
+        entry = TimeEntry.objects.create(task=task, user=self.user, start_time=timezone.now(), duration_hours=1)
+        cursor = self.current_cursor()
+
+        project.team_members.add(self.user)
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertEqual([row['id'] for row in response.data['changes']['tasks']], [str(task.id)])
+        self.assertEqual([row['id'] for row in response.data['changes']['comments']], [str(comment.id)])
+        self.assertEqual([row['id'] for row in response.data['changes']['time_entries']], [str(entry.id)])
+
+        # From the user's side of the relation
+        self.user.projects.remove(project)
+        response = self.client.get(self.url, {'since': response.data['cursor']})
+        self.assertEqual(response.data['deleted']['tasks'], [task.id])
+        self.assertEqual(response.data['deleted']['comments'], [comment.id])
+        self.assertEqual(response.data['deleted']['projects'], [project.id])
@@ -50,7 +50,7 @@ class TaskTimerTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
         # Check that a timer was created
-        timer = TaskTimer.objects.filter(task=self.task, user=self.user).first()
+        timer = TaskTimer.objects.filter(task_id=self.task.id, user_id=self.user.id).first()
         self.assertIsNotNone(timer)
         self.assertIsNotNone(timer.start_time)
         self.assertIsNone(timer.end_time)
@@ -58,8 +58,8 @@ class TaskTimerTests(TestCase):
         
         # Check that an activity log was created
         log = ActivityLog.objects.filter(
-            task=self.task,
-            user=self.user,
+            task_id=self.task.id,
+            user_id=self.user.id,
             action='created'
         ).first()
         self.assertIsNotNone(log)
@@ -93,8 +93,8 @@ class TaskTimerTests(TestCase):
         
         # Check that an activity log was created
         log = ActivityLog.objects.filter(
-            task=self.task,
-            user=self.user,
+            task_id=self.task.id,
+            user_id=self.user.id,
             action='updated'
         ).first()
         self.assertIsNotNone(log)
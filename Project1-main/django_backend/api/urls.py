@@ -1,45 +1,59 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import (
-    TokenRefreshView,
-)
 from . import views
-from .auth import EmailTokenObtainPairView
+from .auth import EmailTokenObtainPairView, ClaimsTokenRefreshView
 from . import views_timetracking
+from . import views_bulk
+from . import views_board
+from . import views_calendar
+from . import views_sync
+from . import views_exports
+from . import views_imports
+from . import views_attachments
+from . import views_metrics
+from . import views_async
+
+# Read-heavy endpoints served by async views under ASGI (see views_async)
+read_views = views_async if settings.ASYNC_READ_VIEWS else views
 
 # API URL patterns
 urlpatterns = [
     # Authentication (compat + required endpoints)
     path('auth/register/', views.RegisterView.as_view(), name='register'),  # legacy path used by UI
     path('auth/login/', views.login_view, name='login'),                     # legacy path used by UI
-    path('auth/me/', views.me_view, name='auth-me'),                         # new endpoint for auth
+    path('auth/logout/', views.logout_view, name='logout'),
+    path('auth/me/', read_views.me_view, name='auth-me'),                         # new endpoint for auth
     path('users/register/', views.RegisterView.as_view(), name='users-register'),
     path('token/', EmailTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', ClaimsTokenRefreshView.as_view(), name='token_refresh'),
     
     # Dashboard endpoints
-    path('dashboard/stats/', views.dashboard_stats, name='dashboard-stats'),
+    path('dashboard/stats/', read_views.dashboard_stats, name='dashboard-stats'),
     
     # Project endpoints
     path('projects/', views.ProjectListCreateView.as_view(), name='project-list-create'),
     path('projects/<uuid:pk>/', views.ProjectDetailView.as_view(), name='project-detail'),
+    path('projects/<uuid:pk>/board/', views_board.project_board, name='project-board'),
     
     # Task endpoints
     path('tasks/', views.TaskListCreateView.as_view(), name='task-list-create'),
     path('tasks/<uuid:pk>/', views.TaskDetailView.as_view(), name='task-detail'),
+    path('tasks/bulk/', views_bulk.bulk_tasks, name='task-bulk'),
+    path('tasks/<uuid:pk>/move/', views_board.move_task, name='task-move'),
     
     # Time entry endpoints
     path('time-entries/', views.TimeEntryListCreateView.as_view(), name='timeentry-list-create'),
     path('time-entries/<uuid:pk>/', views.TimeEntryDetailView.as_view(), name='timeentry-detail'),
     path('time-entries/start-timer/', views.start_timer, name='start-timer'),
     path('time-entries/stop-timer/', views.stop_timer, name='stop-timer'),
-    path('time-entries/active-timer/', views.active_timer, name='active-timer'),
+    path('time-entries/active-timer/', read_views.active_timer, name='active-timer'),
     path('time-entries/summary/', views.time_summary, name='time-summary'),
     
     # User endpoints
     path('users/', views.UserListView.as_view(), name='user-list'),
     path('users/<uuid:pk>/', views.UserDetailView.as_view(), name='user-detail'),
-    path('users/me/', views.me_view, name='user-profile'),
+    path('users/me/', read_views.me_view, name='user-profile'),
     path('users/change-password/', views.change_password, name='change-password'),
     path('users/update-profile/', views.update_profile, name='update-profile'),
     path('users/preferences/', views.user_preferences, name='user-preferences'),
@@ -57,20 +71,41 @@ urlpatterns = [
     path('timesheets/weekly/', views_timetracking.weekly_timesheet, name='timesheet-weekly'),
     path('notifications/<uuid:pk>/read/', views.mark_notification_read, name='notification-read'),
     path('notifications/mark-all-read/', views.mark_all_notifications_read, name='notification-mark-all-read'),
-    path('notifications/summary/', views.notification_summary, name='notification-summary'),
+    path('notifications/summary/', read_views.notification_summary, name='notification-summary'),
     path('notifications/check-reminders/', views.check_reminders, name='check-reminders'),
     
+    # Calendar endpoints
+    path('calendar/', views_calendar.calendar_view, name='calendar'),
+    
+    # Sync endpoints
+    path('changes/', views_sync.changes_feed, name='changes-feed'),
+    
+    # Export endpoints
+    path('exports/<slug:dataset>.<slug:fmt>', views_exports.export_dataset, name='export'),
+    
+    # Import endpoints
+    path('imports/<slug:kind>/', views_imports.import_data, name='import'),
+    
     # Analytics endpoints
     path('analytics/productivity-trends/', views.analytics_productivity_trends, name='analytics-productivity'),
     path('analytics/team-performance/', views.analytics_team_performance, name='analytics-team'),
     path('analytics/task-distribution/', views.analytics_task_distribution, name='analytics-distribution'),
+    path('analytics/lead-time/', views.analytics_lead_time, name='analytics-lead-time'),
+    path('analytics/cycle-time/', views.analytics_cycle_time, name='analytics-cycle-time'),
     
     # Attachment endpoints
     path('tasks/<uuid:task_id>/attachments/', views.AttachmentListCreateView.as_view(), name='attachment-list-create'),
     path('attachments/<uuid:pk>/', views.AttachmentDetailView.as_view(), name='attachment-detail'),
     path('attachments/', views.AttachmentListCreateView.as_view(), name='attachments-list'),
+    path('attachments/uploads/', views_attachments.create_upload, name='attachment-upload-create'),
+    path('attachments/uploads/<uuid:pk>/', views_attachments.upload_session, name='attachment-upload'),
+    path('attachments/<uuid:pk>/download/', views_attachments.download_attachment, name='attachment-download'),
+    path('attachments/<uuid:pk>/preview/', views_attachments.attachment_preview, name='attachment-preview'),
     
     # Activity log endpoints
     path('activity-logs/', views.ActivityLogListView.as_view(), name='activity-log-list'),
-    path('activity-logs/recent/', views.recent_activity, name='recent-activity'),
+    path('activity-logs/recent/', read_views.recent_activity, name='recent-activity'),
+    
+    # Operational metrics
+    path('metrics/connections/', views_metrics.connection_metrics, name='metrics-connections'),
 ]
\ No newline at end of file
@@ -1,14 +1,21 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
+from django.db import router, transaction
+from django.db.models import Q, Count, Avg, Sum, Min, Case, When, F, Window, DurationField, ExpressionWrapper
+from django.db.models.functions import RowNumber, TruncDate
 from datetime import datetime, timedelta
 import pandas as pd
+import statistics
 
-from .models import User, Project, Task, TimeEntry, Comment, Notification, Attachment, ActivityLog
+from .models import (
+    User, Project, Task, TimeEntry, Comment, Notification, Attachment, ActivityLog, ChangeLog,
+    TaskStatusTransition
+)
 from .serializers import (
     UserSerializer, UserCreateSerializer, UserLoginSerializer,
     ProjectSerializer, TaskSerializer, TimeEntrySerializer,
@@ -20,6 +27,31 @@ from .permissions import (
     IsAssignedOrScrumMaster, CanAccessProject, CanAccessTask,
     IsProjectMemberOrReadOnly
 )
+from .auth import add_claims
+from .db_routing import id_subquery, replica_reads
+from .querycheck import query_budget
+from .revocation import RevocableRefreshToken
+from .previews import schedule_preview
+from .serializers_fastpath import FastTaskSerializer, FastTimeEntrySerializer, FastNotificationSerializer
+from .views_calendar import visible_tasks
+
+
+class FastPathListMixin:
+    """Serve GET list requests through a values()-based fast serializer.
+
+    The fast serializer must mirror serializer_class field for field (see
+    serializers_fastpath.py); writes and the other actions are unchanged.
+    """
+    fast_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        fast_serializer = self.fast_serializer_class()
+        queryset = fast_serializer.rows(self.filter_queryset(self.get_queryset()))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        return Response(fast_serializer.serialize(queryset))
 
 
 # Authentication Views
@@ -59,9 +91,8 @@ def login_view(request):
     user = serializer.validated_data['user']
     refresh = RefreshToken.for_user(user)
     
-    # Include role in token payload
-    token = RefreshToken.for_user(user)
-    token['role'] = user.role
+    # Include role, project and claims-version claims in token payload
+    token = add_claims(RefreshToken.for_user(user), user)
     access_token = str(token.access_token)
     
     user_data = UserSerializer(user).data
@@ -74,6 +105,21 @@ def login_view(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def logout_view(request):
+    """Revoke the given refresh token so it can no longer be used"""
+    refresh = request.data.get('refresh')
+    if not refresh:
+        # Token(None) would mint a fresh token instead of parsing one
+        return Response({'error': 'refresh is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        RevocableRefreshToken(refresh).blacklist()
+    except TokenError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'message': 'Logged out successfully'})
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def me_view(request):
@@ -84,67 +130,66 @@ def me_view(request):
 
 
 # Dashboard Views
-@api_view(['GET'])
-def dashboard_stats(request):
-    """Get dashboard statistics with role-based filtering"""
-    user = request.user
-    
-    # Apply role-based filtering
+def dashboard_querysets(user):
+    """(tasks, projects) the dashboard counts for this user, by role"""
     if user.role == 'scrum_master':
-        tasks_queryset = Task.objects.all()
-        projects_queryset = Project.objects.all()
-    else:
-        tasks_queryset = Task.objects.filter(
-            Q(assigned_to=user) |
-            Q(created_by=user) |
-            Q(project__team_members=user)
-        ).distinct()
-        projects_queryset = Project.objects.filter(team_members=user)
-    
-    # Get task statistics
-    total_tasks = tasks_queryset.count()
-    completed_tasks = tasks_queryset.filter(status='done').count()
-    overdue_tasks = tasks_queryset.filter(
-        due_date__lt=timezone.now(),
-        status__in=['todo', 'in_progress', 'review']
-    ).count()
-    
-    # Get active projects
-    active_projects = projects_queryset.filter(status='active').count()
-    
-    # Get recent tasks
-    recent_tasks = tasks_queryset.select_related('assigned_to', 'created_by', 'project').order_by('-created_at')[:5]
-    recent_tasks_data = TaskSerializer(recent_tasks, many=True).data
-    
+        return Task.objects.all(), Project.objects.all()
+    tasks_queryset = Task.objects.filter(
+        Q(assigned_to=user) |
+        Q(created_by=user) |
+        Q(project__team_members=user)
+    ).distinct()
+    return tasks_queryset, Project.objects.filter(team_members=user)
+
+
+def dashboard_queries(user):
+    """The dashboard's independent queries, by name. Shared with views_async,
+    which runs them concurrently."""
+    tasks_queryset, projects_queryset = dashboard_querysets(user)
+    now = timezone.now()
+    return {
+        'total_tasks': tasks_queryset,
+        'completed_tasks': tasks_queryset.filter(status='done'),
+        'overdue_tasks': tasks_queryset.filter(
+            due_date__lt=now,
+            status__in=['todo', 'in_progress', 'review']
+        ),
+        'active_projects': projects_queryset.filter(status='active'),
+        'recently_completed': tasks_queryset.filter(completed_at__gte=now - timedelta(days=30)),
+        'recent_tasks': TaskSerializer.setup_eager_loading(tasks_queryset).order_by('-created_at')[:5],
+        'time_data': TimeEntry.objects.filter(
+            user=user,
+            end_time__isnull=False,
+            start_time__gte=now - timedelta(days=30)
+        ).values('duration_hours', 'start_time', 'task_id'),
+    }
+
+
+# Aggregate over tasks: mean time from creation to completion
+AVG_COMPLETION_TIME = Avg(ExpressionWrapper(F('completed_at') - F('created_at'), output_field=DurationField()))
+
+
+def dashboard_payload(total_tasks, completed_tasks, overdue_tasks, active_projects,
+                      avg_completion_time, time_data, recent_tasks_data):
+    """Dashboard response body from the results of dashboard_queries()"""
     # Calculate real metrics using pandas for data processing
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
     
-    # Calculate real time-based metrics
-    time_entries = TimeEntry.objects.filter(
-        user=user,
-        end_time__isnull=False,
-        start_time__gte=timezone.now() - timedelta(days=30)
-    )
+    # Hours from creation to completion of tasks completed in the last 30 days
+    avg_completion_time = avg_completion_time.total_seconds() / 3600 if avg_completion_time else 0
     
-    if time_entries.exists():
+    # Calculate real time-based metrics
+    if time_data:
         # Use pandas for analysis
-        time_data = list(time_entries.values('duration_hours', 'start_time', 'task_id'))
         df = pd.DataFrame(time_data)
-        
-        if not df.empty:
-            avg_completion_time = df['duration_hours'].mean()
-            daily_focus_time = df.groupby(df['start_time'].dt.date)['duration_hours'].sum().mean()
-        else:
-            avg_completion_time = 0
-            daily_focus_time = 0
+        daily_focus_time = df.groupby(df['start_time'].dt.date)['duration_hours'].sum().mean()
     else:
-        avg_completion_time = 0
         daily_focus_time = 0
     
     # Calculate team productivity (completion rate * efficiency)
     team_productivity = completion_rate * 0.85 if completion_rate > 0 else 0
     
-    stats = {
+    return {
         'tasks_completed': completed_tasks,
         'avg_completion_time': round(avg_completion_time, 1),
         'team_productivity': round(team_productivity, 1),
@@ -154,7 +199,22 @@ def dashboard_stats(request):
         'active_projects': active_projects,
         'recent_tasks': recent_tasks_data
     }
-    
+
+
+@query_budget(11)
+@api_view(['GET'])
+def dashboard_stats(request):
+    """Get dashboard statistics with role-based filtering"""
+    queries = dashboard_queries(request.user)
+    stats = dashboard_payload(
+        total_tasks=queries['total_tasks'].count(),
+        completed_tasks=queries['completed_tasks'].count(),
+        overdue_tasks=queries['overdue_tasks'].count(),
+        active_projects=queries['active_projects'].count(),
+        avg_completion_time=queries['recently_completed'].aggregate(avg=AVG_COMPLETION_TIME)['avg'],
+        time_data=list(queries['time_data']),
+        recent_tasks_data=TaskSerializer(queries['recent_tasks'], many=True).data,
+    )
     return Response(stats)
 
 
@@ -163,15 +223,17 @@ class ProjectListCreateView(generics.ListCreateAPIView):
     """List all projects or create a new project"""
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsScrumMasterOrReadOnly]
+    claims_authorization = True
     
     def get_queryset(self):
         """Filter projects based on user role"""
         user = self.request.user
         if user.role == 'scrum_master':
-            return Project.objects.all()
+            queryset = Project.objects.all()
         else:
             # Employees can only see projects they're team members of
-            return Project.objects.filter(team_members=user)
+            queryset = Project.objects.filter(team_members=user.pk)
+        return ProjectSerializer.setup_eager_loading(queryset)
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -181,6 +243,7 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a project"""
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, CanAccessProject, IsScrumMaster]
+    claims_authorization = True
     
     def get_queryset(self):
         """Filter projects based on user role"""
@@ -188,14 +251,16 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         if user.role == 'scrum_master':
             return Project.objects.all()
         else:
-            return Project.objects.filter(team_members=user)
+            return Project.objects.filter(team_members=user.pk)
 
 
 # Task Views
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(FastPathListMixin, generics.ListCreateAPIView):
     """List all tasks or create a new task"""
     serializer_class = TaskSerializer
+    fast_serializer_class = FastTaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsProjectMemberOrReadOnly]
+    claims_authorization = True
     
     def get_queryset(self):
         """Filter tasks based on user role and permissions"""
@@ -217,9 +282,9 @@ class TaskListCreateView(generics.ListCreateAPIView):
         else:
             # Employees can only see tasks assigned to them or in projects they're part of
             return queryset.filter(
-                Q(assigned_to=user) |
-                Q(created_by=user) |
-                Q(project__team_members=user)
+                Q(assigned_to=user.pk) |
+                Q(created_by=user.pk) |
+                Q(project__team_members=user.pk)
             ).distinct()
     
     def perform_create(self, serializer):
@@ -230,6 +295,7 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a task"""
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, CanAccessTask, IsAssignedOrScrumMaster]
+    claims_authorization = True
     
     def get_queryset(self):
         """Filter tasks based on user role"""
@@ -240,17 +306,23 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
             return queryset
         else:
             return queryset.filter(
-                Q(assigned_to=user) |
-                Q(created_by=user) |
-                Q(project__team_members=user)
+                Q(assigned_to=user.pk) |
+                Q(created_by=user.pk) |
+                Q(project__team_members=user.pk)
             ).distinct()
+    
+    def perform_update(self, serializer):
+        serializer.instance.status_changed_by = self.request.user
+        serializer.save()
 
 
 # Time Entry Views
-class TimeEntryListCreateView(generics.ListCreateAPIView):
+class TimeEntryListCreateView(FastPathListMixin, generics.ListCreateAPIView):
     """List all time entries or create a new time entry"""
     serializer_class = TimeEntrySerializer
+    fast_serializer_class = FastTimeEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
+    claims_authorization = True
     
     def get_queryset(self):
         """Filter time entries based on user role"""
@@ -270,7 +342,7 @@ class TimeEntryListCreateView(generics.ListCreateAPIView):
             return queryset
         else:
             # Employees can only see their own time entries
-            return queryset.filter(user=user)
+            return queryset.filter(user=user.pk)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -388,8 +460,10 @@ def active_timer(request):
         return Response({'active_timer': None})
 
 
+@query_budget(8)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@replica_reads
 def time_summary(request):
     """Get time tracking summary for the user"""
     user = request.user
@@ -405,7 +479,8 @@ def time_summary(request):
         start_time__date__gte=start_date,
         start_time__date__lte=end_date,
         end_time__isnull=False
-    ).select_related('task', 'task__project')
+    )
+    time_entries = TimeEntrySerializer.setup_eager_loading(time_entries)
     
     # Calculate summary statistics
     total_hours = sum(entry.duration_hours or 0 for entry in time_entries)
@@ -591,7 +666,7 @@ def user_preferences(request):
 # Comment Views
 class CommentListCreateView(generics.ListCreateAPIView):
     """List comments or create a new comment"""
-    queryset = Comment.objects.select_related('user', 'task')
+    queryset = CommentSerializer.setup_eager_loading(Comment.objects.all())
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, CanAccessTask]
     
@@ -607,13 +682,16 @@ class CommentListCreateView(generics.ListCreateAPIView):
 
 
 # Notification Views
-class NotificationListView(generics.ListAPIView):
+@query_budget(3)
+class NotificationListView(FastPathListMixin, generics.ListAPIView):
     """List user notifications"""
     serializer_class = NotificationSerializer
+    fast_serializer_class = FastNotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    claims_authorization = True
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user).order_by('-created_at')
+        return Notification.objects.filter(user_id=self.request.user.pk).order_by('-created_at')
 
 
 @api_view(['PATCH'])
@@ -621,7 +699,7 @@ class NotificationListView(generics.ListAPIView):
 def mark_notification_read(request, pk):
     """Mark a notification as read"""
     try:
-        notification = Notification.objects.get(pk=pk, user=request.user)
+        notification = Notification.objects.get(pk=pk, user_id=request.user.pk)
         notification.is_read = True
         notification.save()
         return Response({'message': 'Notification marked as read'})
@@ -632,11 +710,30 @@ def mark_notification_read(request, pk):
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_all_notifications_read(request):
-    """Mark all user notifications as read"""
-    Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    """Mark all user notifications as read.
+
+    The change log entries are written in the same transaction when
+    notifications share ChangeLog's database. When they live in the events
+    database no transaction spans both, so the entries are written once the
+    notification update has committed: the feed never announces a change
+    that rolled back, and the sync settle window starts from that later
+    insert. A failure between the two commits leaves clients with the old
+    rows until those notifications change again.
+    """
+    alias = router.db_for_write(Notification)
+    with transaction.atomic(using=alias):
+        notification_ids = list(Notification.objects.select_for_update().filter(
+            user_id=request.user.pk, is_read=False
+        ).values_list('id', flat=True))
+        Notification.objects.filter(id__in=notification_ids).update(is_read=True)
+        if alias == router.db_for_write(ChangeLog):
+            ChangeLog.record('notifications', notification_ids)
+        else:
+            transaction.on_commit(lambda: ChangeLog.record('notifications', notification_ids), using=alias)
     return Response({'message': 'All notifications marked as read'})
 
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def notification_summary(request):
@@ -667,36 +764,36 @@ def check_reminders(request):
 
 
 # Analytics Views
+@query_budget(4)
 @api_view(['GET'])
+@replica_reads
 def analytics_productivity_trends(request):
-    """Get productivity trends for analytics"""
-    # Use pandas for data analysis
+    """Get productivity trends for analytics.
+
+    For each of the last 30 days: tasks created (total), tasks completed
+    (by completed_at) and completed as a percentage of created.
+    """
     end_date = timezone.now()
     start_date = end_date - timedelta(days=30)
     
-    # Get task completion data
-    tasks = Task.objects.filter(
-        created_at__gte=start_date,
-        created_at__lte=end_date
-    ).values('created_at', 'status', 'priority')
+    def per_day(field):
+        return dict(
+            Task.objects.filter(**{f'{field}__gte': start_date, f'{field}__lte': end_date})
+            .order_by().annotate(date=TruncDate(field)).values('date')
+            .annotate(count=Count('id')).values_list('date', 'count')
+        )
     
-    # Convert to DataFrame for analysis
-    if tasks:
-        df = pd.DataFrame(list(tasks))
-        df['date'] = pd.to_datetime(df['created_at']).dt.date
-        
-        # Group by date and calculate completion rates
-        daily_stats = df.groupby('date').agg({
-            'status': lambda x: (x == 'done').sum(),  # completed tasks
-            'priority': 'count'  # total tasks
-        }).reset_index()
-        
-        daily_stats['completion_rate'] = (daily_stats['status'] / daily_stats['priority'] * 100).round(2)
-        daily_stats = daily_stats.rename(columns={'status': 'completed', 'priority': 'total'})
-        
-        trends = daily_stats.to_dict('records')
-    else:
-        trends = []
+    created = per_day('created_at')
+    completed = per_day('completed_at')
+    trends = [
+        {
+            'date': date,
+            'completed': completed.get(date, 0),
+            'total': created.get(date, 0),
+            'completion_rate': round(completed.get(date, 0) / created[date] * 100, 2) if created.get(date) else 0.0,
+        }
+        for date in sorted(created.keys() | completed.keys())
+    ]
     
     return Response({
         'trends': trends,
@@ -704,20 +801,27 @@ def analytics_productivity_trends(request):
     })
 
 
+@query_budget(5)
 @api_view(['GET'])
+@replica_reads
 def analytics_team_performance(request):
     """Get team performance analytics"""
-    users = User.objects.filter(is_active=True)
+    # Task counts and hours for all users at once rather than per user
+    users = User.objects.filter(is_active=True).annotate(
+        total_tasks=Count('assigned_tasks', distinct=True),
+        completed_tasks=Count('assigned_tasks', filter=Q(assigned_tasks__status='done'), distinct=True),
+    )
+    hours_by_user = dict(
+        TimeEntry.objects.filter(user__is_active=True)
+        .values('user_id').annotate(total=Sum('duration_hours'))
+        .values_list('user_id', 'total')
+    )
     performance_data = []
     
     for user in users:
-        user_tasks = Task.objects.filter(assigned_to=user)
-        completed_tasks = user_tasks.filter(status='done').count()
-        total_tasks = user_tasks.count()
-        
-        # Calculate time entries for this user
-        time_entries = TimeEntry.objects.filter(user=user)
-        total_hours = sum(entry.duration_hours or 0 for entry in time_entries)
+        completed_tasks = user.completed_tasks
+        total_tasks = user.total_tasks
+        total_hours = hours_by_user.get(user.id) or 0
         
         performance_data.append({
             'user_id': str(user.id),
@@ -734,7 +838,9 @@ def analytics_team_performance(request):
     })
 
 
+@query_budget(6)
 @api_view(['GET'])
+@replica_reads
 def analytics_task_distribution(request):
     """Get task distribution by status and priority"""
     # Status distribution
@@ -758,6 +864,89 @@ def analytics_task_distribution(request):
     })
 
 
+# Statuses in which work on a task has started, for cycle time
+ACTIVE_STATUSES = ['in_progress', 'review']
+
+
+def completed_task_flow(request):
+    """(completed_at, created_at, started_at) of every task completed in the requested period.
+
+    Window functions reduce each task's transition history to its latest
+    row, which for a task that is done is the move to done, carrying the
+    first time the task entered an active status (None if it never did).
+    Query parameters: days (default 30), project_id.
+    """
+    try:
+        days = int(request.query_params.get('days', 30))
+    except ValueError:
+        days = 30
+    transitions = TaskStatusTransition.objects.filter(
+        task__completed_at__gte=timezone.now() - timedelta(days=max(days, 1))
+    )
+    project_id = request.query_params.get('project_id')
+    if project_id:
+        transitions = transitions.filter(task__project_id=project_id)
+    
+    per_task = [F('task_id')]
+    rows = transitions.annotate(
+        started_at=Window(Min(Case(When(to_status__in=ACTIVE_STATUSES, then=F('at')))), partition_by=per_task),
+        latest=Window(RowNumber(), partition_by=per_task, order_by=[F('at').desc(), F('id').desc()]),
+    ).filter(latest=1).values_list('at', 'task__created_at', 'started_at')
+    return days, list(rows)
+
+
+def flow_time_summary(days, durations):
+    """Count, mean, median and 85th percentile in hours, plus the median per completion week"""
+    def summary(values):
+        hours = sorted(value.total_seconds() / 3600 for value, _ in values)
+        return {
+            'count': len(hours),
+            'mean_hours': round(statistics.fmean(hours), 2) if hours else None,
+            'median_hours': round(statistics.median(hours), 2) if hours else None,
+            'p85_hours': round(hours[min(len(hours) - 1, int(len(hours) * 0.85))], 2) if hours else None,
+        }
+    
+    weeks = {}
+    for duration, completed_at in durations:
+        week_start = timezone.localtime(completed_at).date()
+        weeks.setdefault(week_start - timedelta(days=week_start.weekday()), []).append((duration, completed_at))
+    return {
+        'period': f'{days}_days',
+        **summary(durations),
+        'weekly': [
+            {'week_start': week_start, 'count': len(values), 'median_hours': summary(values)['median_hours']}
+            for week_start, values in sorted(weeks.items())
+        ],
+    }
+
+
+@query_budget(2)
+@api_view(['GET'])
+@replica_reads
+def analytics_lead_time(request):
+    """Lead time of completed tasks: from creation to completion"""
+    days, rows = completed_task_flow(request)
+    return Response(flow_time_summary(days, [
+        (completed_at - created_at, completed_at) for completed_at, created_at, _ in rows
+    ]))
+
+
+@query_budget(2)
+@api_view(['GET'])
+@replica_reads
+def analytics_cycle_time(request):
+    """Cycle time of completed tasks: from the first move to in progress or review to completion.
+
+    Tasks with no active status on record are left out, which includes
+    those completed before status history was kept (migration 0012 gives
+    them only a synthetic todo -> done move). They still count for lead time.
+    """
+    days, rows = completed_task_flow(request)
+    return Response(flow_time_summary(days, [
+        (completed_at - started_at, completed_at) for completed_at, _, started_at in rows if started_at
+    ]))
+
+
 # Attachment Views
 class AttachmentListCreateView(generics.ListCreateAPIView):
     """List attachments or create a new attachment"""
@@ -774,10 +963,10 @@ class AttachmentListCreateView(generics.ListCreateAPIView):
                 task = Task.objects.get(id=task_id)
                 # Check if user can access this task
                 if user.role == 'scrum_master':
-                    return Attachment.objects.filter(task=task)
+                    return Attachment.objects.filter(task=task).select_related('uploaded_by')
                 elif (task.assigned_to == user or task.created_by == user or 
                       (task.project and task.project.team_members.filter(id=user.id).exists())):
-                    return Attachment.objects.filter(task=task)
+                    return Attachment.objects.filter(task=task).select_related('uploaded_by')
                 else:
                     return Attachment.objects.none()
             except Task.DoesNotExist:
@@ -798,6 +987,7 @@ class AttachmentListCreateView(generics.ListCreateAPIView):
                 raise PermissionDenied("You don't have permission to add attachments to this task")
         
         attachment = serializer.save(uploaded_by=user, task=task)
+        schedule_preview(attachment)
         
         # Create activity log
         ActivityLog.objects.create(
@@ -848,6 +1038,7 @@ class AttachmentDetailView(generics.RetrieveDestroyAPIView):
 
 
 # Activity Log Views
+@query_budget(10)
 class ActivityLogListView(generics.ListAPIView):
     """List activity logs with filtering options"""
     serializer_class = ActivityLogSerializer
@@ -856,7 +1047,7 @@ class ActivityLogListView(generics.ListAPIView):
     def get_queryset(self):
         """Filter activity logs based on user role and query parameters"""
         user = self.request.user
-        queryset = ActivityLog.objects.select_related('user', 'task', 'project')
+        queryset = ActivityLog.objects.all()
         
         # Filter by task_id, project_id, or user_id if provided
         task_id = self.request.query_params.get('task_id')
@@ -873,15 +1064,17 @@ class ActivityLogListView(generics.ListAPIView):
         # Apply role-based filtering
         if user.role != 'scrum_master':
             # Regular employees can only see activity logs for their tasks/projects
+            tasks = Task.objects.filter(Q(assigned_to=user.pk) | Q(created_by=user.pk))
+            projects = Project.objects.filter(team_members=user.pk)
             queryset = queryset.filter(
-                Q(task__assigned_to=user) | 
-                Q(task__created_by=user) | 
-                Q(project__team_members=user)
-            ).distinct()
+                Q(task_id__in=id_subquery(tasks, ActivityLog)) |
+                Q(project_id__in=id_subquery(projects, ActivityLog))
+            )
         
         return queryset.order_by('-created_at')
 
 
+@query_budget(9)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def recent_activity(request):
@@ -890,14 +1083,13 @@ def recent_activity(request):
     limit = int(request.GET.get('limit', 10))
     
     if user.role == 'scrum_master':
-        activities = ActivityLog.objects.select_related('user', 'task', 'project')[:limit]
+        activities = ActivityLog.objects.all()[:limit]
     else:
+        projects = Project.objects.filter(team_members=user.pk)
         activities = ActivityLog.objects.filter(
-            Q(task__assigned_to=user) |
-            Q(task__created_by=user) |
-            Q(task__project__team_members=user) |
-            Q(project__team_members=user) |
-            Q(user=user)
-        ).select_related('user', 'task', 'project').distinct()[:limit]
+            Q(task_id__in=id_subquery(visible_tasks(user), ActivityLog)) |
+            Q(project_id__in=id_subquery(projects, ActivityLog)) |
+            Q(user_id=user.pk)
+        )[:limit]
     
     return Response(ActivityLogSerializer(activities, many=True).data)
\ No newline at end of file
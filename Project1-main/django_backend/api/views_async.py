@@ -0,0 +1,149 @@
+"""
+Async variants of the read-heavy endpoints, for ASGI deployments.
+
+DRF 3.14 dispatches views synchronously, so under ASGI every DRF view
+holds a worker thread for the whole request. The views below are plain
+Django async views with the same responses: they authenticate through
+CachedJWTAuthentication.aauthenticate() (IsAuthenticated, GET only), run
+their queries with the async ORM, gather independent queries with
+asyncio.gather, and render with FastJSONRenderer.
+
+urls.py routes the same paths here instead of api.views when
+ASYNC_READ_VIEWS is on. Leave it off under WSGI, where Django would start
+an event loop for every one of these requests.
+
+Django runs async ORM calls on the request's single database thread, so
+gathered queries still reach the database one after another; the event
+loop stays free for other requests while they do. Serializers that load
+relations lazily (nested tasks and projects) run through sync_to_async
+for the same reason.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+
+from .authentication import CachedJWTAuthentication
+from .db_routing import aid_subquery
+from .models import Project, TimeEntry, ActivityLog
+from .notifications import aget_user_notification_summary
+from .querycheck import query_budget
+from .renderers import FastJSONRenderer
+from .serializers import UserSerializer, TaskSerializer, TimeEntrySerializer, NotificationSerializer, ActivityLogSerializer
+from .views import dashboard_queries, dashboard_payload, AVG_COMPLETION_TIME
+from .views_calendar import visible_tasks
+
+_authenticator = CachedJWTAuthentication()
+_renderer = FastJSONRenderer()
+
+
+def _json(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(_renderer.render(data), status=status_code, content_type='application/json')
+
+
+def _error(request, exc):
+    # Same body and headers as DRF's exception handler
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = _json(data, exc.status_code)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response['WWW-Authenticate'] = _authenticator.authenticate_header(request)
+    return response
+
+
+async def _rows(queryset):
+    return [row async for row in queryset]
+
+
+def authenticated_get(view):
+    """@api_view(['GET']) with IsAuthenticated, for async views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return _error(request, exceptions.MethodNotAllowed(request.method))
+        try:
+            result = await _authenticator.aauthenticate(request)
+        except exceptions.APIException as exc:
+            return _error(request, exc)
+        if result is None:
+            return _error(request, exceptions.NotAuthenticated())
+        request.user = result[0]
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@authenticated_get
+async def me_view(request):
+    """Return the current authenticated user's profile"""
+    return _json(UserSerializer(request.user).data)
+
+
+@query_budget(11)
+@authenticated_get
+async def dashboard_stats(request):
+    """Get dashboard statistics with role-based filtering"""
+    queries = dashboard_queries(request.user)
+    total, completed, overdue, active, completion, time_data, recent_tasks = await asyncio.gather(
+        queries['total_tasks'].acount(),
+        queries['completed_tasks'].acount(),
+        queries['overdue_tasks'].acount(),
+        queries['active_projects'].acount(),
+        queries['recently_completed'].aaggregate(avg=AVG_COMPLETION_TIME),
+        _rows(queries['time_data']),
+        _rows(queries['recent_tasks']),
+    )
+    recent_tasks_data = await sync_to_async(lambda: TaskSerializer(recent_tasks, many=True).data)()
+    return _json(dashboard_payload(
+        total_tasks=total,
+        completed_tasks=completed,
+        overdue_tasks=overdue,
+        active_projects=active,
+        avg_completion_time=completion['avg'],
+        time_data=time_data,
+        recent_tasks_data=recent_tasks_data,
+    ))
+
+
+@authenticated_get
+async def active_timer(request):
+    """Get user's active timer"""
+    entry = await TimeEntry.objects.filter(user=request.user.pk, end_time__isnull=True).afirst()
+    if entry is None:
+        return _json({'active_timer': None})
+    return _json(await sync_to_async(lambda: TimeEntrySerializer(entry).data)())
+
+
+@query_budget(3)
+@authenticated_get
+async def notification_summary(request):
+    """Get notification summary for the user"""
+    summary = await aget_user_notification_summary(request.user)
+    summary['recent_notifications'] = NotificationSerializer(
+        summary['recent_notifications'], many=True
+    ).data
+    return _json(summary)
+
+
+@query_budget(9)
+@authenticated_get
+async def recent_activity(request):
+    """Get recent activity for the user's accessible tasks and projects"""
+    user = request.user
+    limit = int(request.GET.get('limit', 10))
+
+    activities = ActivityLog.objects.all()
+    if user.role != 'scrum_master':
+        task_ids, project_ids = await asyncio.gather(
+            aid_subquery(visible_tasks(user), ActivityLog),
+            aid_subquery(Project.objects.filter(team_members=user.pk), ActivityLog),
+        )
+        activities = activities.filter(
+            Q(task_id__in=task_ids) |
+            Q(project_id__in=project_ids) |
+            Q(user_id=user.pk)
+        )
+
+    logs = await _rows(activities[:limit])
+    return _json(await sync_to_async(lambda: ActivityLogSerializer(logs, many=True).data)())
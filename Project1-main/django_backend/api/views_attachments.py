@@ -0,0 +1,248 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.http import quote_etag
+import re
+
+from .models import Attachment, UploadSession, ActivityLog
+from .serializers import AttachmentSerializer
+from .previews import preview_path, schedule_preview
+from .storage import (
+    MAX_ATTACHMENT_SIZE, FileRange, blob_path, commit_part, discard_part, hash_part, parse_range, write_chunk
+)
+from .views_calendar import visible_tasks
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+def _session_data(session):
+    return {
+        'id': str(session.id),
+        'task_id': str(session.task_id),
+        'file_name': session.file_name,
+        'file_type': session.file_type,
+        'total_size': session.total_size,
+        'received': session.received,
+    }
+
+
+def _finish_upload(request, session):
+    """Create the Attachment for a completed part file, which becomes its blob on commit"""
+    # Hashing reads the whole file, keep it out of the transaction
+    content_hash = hash_part(session.id, session.total_size)
+    with transaction.atomic():
+        attachment = Attachment(
+            task_id=session.task_id,
+            uploaded_by=session.user,
+            file_name=session.file_name,
+            file_size=session.total_size,
+            file_type=session.file_type,
+            content_hash=content_hash,
+        )
+        attachment.file_url = request.build_absolute_uri(
+            reverse('attachment-download', kwargs={'pk': attachment.id})
+        )
+        attachment.save()
+        # Registered first so the blob is in place before a preview renders from it
+        commit_part(session.id, content_hash)
+        schedule_preview(attachment)
+        session.delete()
+
+        task = attachment.task
+        ActivityLog.objects.create(
+            user=request.user,
+            task=task,
+            project=task.project,
+            action='attached_file',
+            description=f'Attached file: {attachment.file_name}',
+            metadata={'file_name': attachment.file_name, 'file_size': attachment.file_size}
+        )
+    return attachment
+
+
+def _visible_attachment(user, pk):
+    attachments = Attachment.objects.all()
+    if user.role != 'SCRUM_MASTER':
+        attachments = attachments.filter(
+            Q(task__in=visible_tasks(user).values('id')) | Q(uploaded_by=user)
+        )
+    return get_object_or_404(attachments, pk=pk)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def create_upload(request):
+    """Start a resumable upload.
+
+    Body: task_id, file_name, file_type, file_size. Send the file with
+    PUT requests to the returned session, each carrying a
+    `Content-Range: bytes <start>-<end>/<file_size>` header.
+    """
+    data = request.data
+    try:
+        total_size = int(data.get('file_size'))
+    except (TypeError, ValueError):
+        return Response({'error': 'file_size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 0 < total_size <= MAX_ATTACHMENT_SIZE:
+        return Response({'error': f'file_size must be between 1 and {MAX_ATTACHMENT_SIZE} bytes'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if not data.get('file_name'):
+        return Response({'error': 'file_name is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    task = visible_tasks(request.user).filter(pk=data.get('task_id')).first() if data.get('task_id') else None
+    if task is None:
+        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    session = UploadSession.objects.create(
+        task=task,
+        user=request.user,
+        file_name=str(data['file_name'])[:255],
+        file_type=str(data.get('file_type') or 'application/octet-stream')[:100],
+        total_size=total_size,
+    )
+    return Response(_session_data(session), status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def upload_session(request, pk):
+    """Resume (GET), append a chunk to (PUT) or cancel (DELETE) an upload.
+
+    GET reports how many bytes were received so a client can continue
+    after an interruption. The chunk sent with PUT must start exactly at
+    `received`; the body is streamed to disk in blocks before the session
+    row is locked, so a slow client never holds the lock. The PUT carrying
+    the last byte returns 201 with the new attachment.
+    """
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+    if request.method == 'GET':
+        return Response(_session_data(session))
+    if request.method == 'DELETE':
+        discard_part(session.id)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    match = CONTENT_RANGE.match(request.headers.get('Content-Range', ''))
+    if not match:
+        return Response({'error': 'Content-Range: bytes <start>-<end>/<total> is required'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    start, end, total = (int(value) for value in match.groups())
+    length = end - start + 1
+    if total != session.total_size or end >= total or length <= 0:
+        return Response({'error': 'Content-Range does not fit this upload'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if int(request.headers.get('Content-Length') or 0) != length:
+        return Response({'error': 'Content-Length must match Content-Range'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    if start != session.received:
+        return Response(_session_data(session), status=status.HTTP_409_CONFLICT)
+
+    written = write_chunk(session.id, start, request, length)
+    if written < length:
+        return Response({'error': 'Chunk ended early', **_session_data(session)},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(pk=session.pk).first()
+        if session is None:
+            return Response({'error': 'Upload was cancelled'}, status=status.HTTP_404_NOT_FOUND)
+        # A concurrent request for the same range got the lock first
+        if start != session.received:
+            return Response(_session_data(session), status=status.HTTP_409_CONFLICT)
+        session.received = end + 1
+        session.save(update_fields=['received', 'updated_at'])
+
+    if session.received < session.total_size:
+        return Response(_session_data(session))
+    attachment = _finish_upload(request, session)
+    return Response(AttachmentSerializer(attachment, context={'request': request}).data,
+                    status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def download_attachment(request, pk):
+    """Stream an attachment from storage.
+
+    Supports single `Range` requests (206), `If-Range` and
+    `If-None-Match` against a strong ETag derived from the content hash.
+    Whole-file responses are handed to the server as a file so it can use
+    sendfile().
+    """
+    attachment = _visible_attachment(request.user, pk)
+
+    if not attachment.content_hash:
+        # Link-only attachment created before uploads were stored locally
+        return HttpResponseRedirect(attachment.file_url)
+
+    etag = quote_etag(attachment.content_hash)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+
+    try:
+        file = open(blob_path(attachment.content_hash), 'rb')
+    except FileNotFoundError:
+        return Response({'error': 'File is missing from storage'}, status=status.HTTP_404_NOT_FOUND)
+
+    size = attachment.file_size
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        file.close()
+        response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=attachment.file_name)
+    else:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1),
+                                as_attachment=True, filename=attachment.file_name)
+        response.status_code = status.HTTP_206_PARTIAL_CONTENT
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+
+    response['Content-Type'] = attachment.file_type or 'application/octet-stream'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def attachment_preview(request, pk):
+    """PNG thumbnail of an image or PDF attachment, 404 until it has been rendered"""
+    attachment = _visible_attachment(request.user, pk)
+    etag = quote_etag(f'preview-{attachment.content_hash}')
+    if attachment.content_hash and etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+
+    try:
+        file = open(preview_path(attachment.content_hash), 'rb') if attachment.content_hash else None
+    except FileNotFoundError:
+        file = None
+    if file is None:
+        return Response({'error': 'No preview available'}, status=status.HTTP_404_NOT_FOUND)
+
+    response = FileResponse(file, content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=86400'
+    return response
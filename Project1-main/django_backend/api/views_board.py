@@ -0,0 +1,198 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+import uuid
+
+from .models import Project, Task, ChangeLog, TaskStatusTransition
+from .permissions import CanAccessProject
+from .ranking import MAX_RANK_LENGTH, rank_between, needs_rebalance, rebalance_column, schedule_rebalance
+from .views_bulk import can_modify_task
+
+DEFAULT_COLUMN_LIMIT = 20
+MAX_COLUMN_LIMIT = 100
+
+# Order of cards inside a column
+CARD_ORDERING = [F('rank').asc(), F('created_at').desc()]
+
+CARD_FIELDS = [
+    'id', 'title', 'status', 'rank', 'priority', 'due_date', 'estimated_hours', 'actual_hours',
+    'assigned_to_id', 'assigned_to__name', 'assigned_to__avatar',
+]
+
+
+def _card(row):
+    """Compact card payload built straight from a values() row"""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'rank': row['rank'],
+        'priority': row['priority'],
+        'due_date': row['due_date'],
+        'estimated_hours': row['estimated_hours'],
+        'actual_hours': row['actual_hours'],
+        'assigned_to': {
+            'id': row['assigned_to_id'],
+            'name': row['assigned_to__name'],
+            'avatar': row['assigned_to__avatar'],
+        } if row['assigned_to_id'] else None,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def project_board(request, pk):
+    """Tasks of a project grouped into Kanban columns by status.
+
+    Query params:
+        limit  - cards per column (default 20, max 100)
+        status - only return this column (used together with cursor)
+        cursor - next_cursor value from a previous response for that column
+    """
+    project = get_object_or_404(Project, pk=pk)
+    if not CanAccessProject().has_object_permission(request, None, project):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        limit = min(int(request.query_params.get('limit', DEFAULT_COLUMN_LIMIT)), MAX_COLUMN_LIMIT)
+        offset = int(request.query_params.get('cursor') or 0)
+    except ValueError:
+        return Response({'error': 'limit and cursor must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1 or offset < 0:
+        return Response({'error': 'limit must be positive and cursor non-negative'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    columns = [(value, label) for value, label in Task.TASK_STATUS_CHOICES]
+    status_filter = request.query_params.get('status')
+    if status_filter:
+        columns = [(value, label) for value, label in columns if value == status_filter]
+        if not columns:
+            return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+    elif offset:
+        return Response({'error': 'cursor requires a status'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # One query: number the cards inside each status partition and keep
+    # only the requested window of every column. The first card of each
+    # column is always kept as well, so a column's total is known even
+    # when the cursor is past its last card.
+    queryset = Task.objects.filter(project=project)
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    rows = (
+        queryset
+        .annotate(
+            position=Window(RowNumber(), partition_by=[F('status')], order_by=CARD_ORDERING),
+            column_count=Window(Count('id'), partition_by=[F('status')]),
+        )
+        .filter(Q(position__gt=offset, position__lte=offset + limit) | Q(position=1))
+        .order_by('status', 'position')
+        .values(*CARD_FIELDS, 'position', 'column_count')
+    )
+
+    grouped = {value: {'cards': [], 'count': 0, 'last': offset} for value, _ in columns}
+    for row in rows:
+        column = grouped[row['status']]
+        column['count'] = row['column_count']
+        if row['position'] > offset:
+            column['cards'].append(_card(row))
+            column['last'] = row['position']
+
+    return Response({
+        'project': {'id': project.id, 'title': project.title},
+        'columns': [
+            {
+                'status': value,
+                'title': label,
+                'count': grouped[value]['count'],
+                'cards': grouped[value]['cards'],
+                'next_cursor': (
+                    str(grouped[value]['last'])
+                    if grouped[value]['last'] < grouped[value]['count'] else None
+                ),
+            }
+            for value, label in columns
+        ],
+    })
+
+
+def _rank_for_move(task, target_status, neighbour_ids):
+    """Rank between the requested neighbours, or the error Response to return"""
+    neighbours = {}
+    if neighbour_ids:
+        ranks = dict(
+            Task.objects.filter(
+                id__in=neighbour_ids.values(), project_id=task.project_id, status=target_status
+            ).values_list('id', 'rank')
+        )
+        for key, neighbour_id in neighbour_ids.items():
+            if neighbour_id not in ranks or neighbour_id == task.id:
+                return Response({key: 'Card not found in the target column'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            neighbours[key] = ranks[neighbour_id]
+    else:
+        neighbours['before_id'] = Task.last_rank(task.project_id, target_status)
+
+    try:
+        return rank_between(neighbours.get('before_id') or None, neighbours.get('after_id') or None)
+    except ValueError:
+        # Neighbours are out of order (stale board or duplicate keys)
+        schedule_rebalance(task.project_id, target_status)
+        return Response({'error': 'The column changed, reload the board and try again'},
+                        status=status.HTTP_409_CONFLICT)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def move_task(request, pk):
+    """Move a card to a position within a (possibly different) Kanban column.
+
+    Body:
+        status    - target column (defaults to the card's current status)
+        before_id - card that will sit directly above the moved card, if any
+        after_id  - card that will sit directly below the moved card, if any
+
+    Only the moved row is written; neighbours keep their ranks.
+    """
+    task = get_object_or_404(Task, pk=pk)
+    if not can_modify_task(request.user, task):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    target_status = request.data.get('status') or task.status
+    if target_status not in dict(Task.TASK_STATUS_CHOICES):
+        return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+
+    neighbour_ids = {}
+    for key in ('before_id', 'after_id'):
+        if request.data.get(key):
+            try:
+                neighbour_ids[key] = uuid.UUID(str(request.data[key]))
+            except ValueError:
+                return Response({key: 'Must be a valid UUID'}, status=status.HTTP_400_BAD_REQUEST)
+
+    rank = _rank_for_move(task, target_status, neighbour_ids)
+    if isinstance(rank, Response):
+        return rank
+    if len(rank) > MAX_RANK_LENGTH:
+        # Renumber now so the key shrinks instead of running into max_length
+        rebalance_column(task.project_id, target_status)
+        rank = _rank_for_move(task, target_status, neighbour_ids)
+        if isinstance(rank, Response):
+            return rank
+
+    now = timezone.now()
+    previous = task.status
+    task.status = target_status
+    task.sync_completed_at(now)
+    Task.objects.filter(pk=task.pk).update(
+        status=target_status, rank=rank, completed_at=task.completed_at, updated_at=now
+    )
+    ChangeLog.record('tasks', [task.pk])
+    TaskStatusTransition.record([(task.pk, previous, target_status)], user_id=request.user.pk, at=now)
+
+    if needs_rebalance(rank):
+        schedule_rebalance(task.project_id, target_status)
+
+    return Response({'id': task.id, 'status': target_status, 'rank': rank})
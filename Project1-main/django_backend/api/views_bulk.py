@@ -0,0 +1,163 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task, Project, User, ChangeLog, TaskStatusTransition
+from .ranking import assign_bottom_ranks
+from .serializers_bulk import BulkTaskOperationSerializer, BulkTaskRequestSerializer
+
+
+def writable_project_ids(user, project_ids):
+    """Return the subset of project_ids the user may add or move tasks into.
+
+    Runs a single membership query for the whole batch, i.e. one permission
+    check per distinct project rather than one per task.
+    """
+    if not project_ids:
+        return set()
+    if user.role == 'SCRUM_MASTER':
+        return set(Project.objects.filter(id__in=project_ids).values_list('id', flat=True))
+    return set(
+        Project.objects.filter(id__in=project_ids, team_members=user).values_list('id', flat=True)
+    )
+
+
+def can_modify_task(user, task):
+    """Mirror IsAssignedOrScrumMaster without touching the database"""
+    return (user.role == 'SCRUM_MASTER' or
+            task.assigned_to_id == user.id or
+            task.created_by_id == user.id)
+
+
+def _result(index, op, task_id, errors=None):
+    result = {'index': index, 'op': op, 'id': str(task_id) if task_id else None, 'ok': errors is None}
+    if errors is not None:
+        result['errors'] = errors
+    return result
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_tasks(request):
+    """Apply many task create/update/delete/status operations in one transaction"""
+    envelope = BulkTaskRequestSerializer(data=request.data)
+    envelope.is_valid(raise_exception=True)
+    user = request.user
+
+    # Validate every operation up front (no queries yet)
+    results = []
+    operations = []
+    seen_ids = set()
+    for index, raw in enumerate(envelope.validated_data['operations']):
+        serializer = BulkTaskOperationSerializer(data=raw)
+        if not serializer.is_valid():
+            results.append(_result(index, raw.get('op'), raw.get('id'), serializer.errors))
+            continue
+
+        op = serializer.validated_data
+        if op['op'] != 'create':
+            if op['id'] in seen_ids:
+                results.append(_result(index, op['op'], op['id'], {
+                    'id': 'Each task may only appear in one operation per request'
+                }))
+                continue
+            seen_ids.add(op['id'])
+
+        operations.append((index, op))
+        results.append(_result(index, op['op'], op.get('id')))
+
+    # Resolve every referenced row with one query per model
+    tasks = Task.objects.in_bulk(seen_ids)
+    project_ids = {
+        op['data']['project_id'] for _, op in operations if op['data'].get('project_id')
+    }
+    user_ids = {
+        op['data']['assigned_to_id'] for _, op in operations if op['data'].get('assigned_to_id')
+    }
+    writable_projects = writable_project_ids(user, project_ids)
+    active_users = set(User.objects.filter(id__in=user_ids, is_active=True).values_list('id', flat=True))
+
+    for index, op in operations:
+        errors = {}
+        data = op['data']
+
+        if op['op'] != 'create':
+            task = tasks.get(op['id'])
+            if task is None:
+                errors['id'] = 'Task not found'
+            elif not can_modify_task(user, task):
+                errors['id'] = 'You do not have permission to modify this task'
+
+        project_id = data.get('project_id')
+        if project_id and project_id not in writable_projects:
+            errors['project_id'] = 'Project not found or you are not a member of it'
+
+        assigned_to_id = data.get('assigned_to_id')
+        if assigned_to_id and assigned_to_id not in active_users:
+            errors['assigned_to_id'] = 'User not found'
+
+        if errors:
+            results[index] = _result(index, op['op'], op.get('id'), errors)
+
+    if not all(result['ok'] for result in results):
+        return Response({
+            'detail': 'No operations were applied',
+            'results': results
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Apply everything in a single transaction
+    now = timezone.now()
+    to_create = []
+    to_update = {}
+    update_fields = set()
+    to_delete = []
+    transitions = []
+    moved = []
+
+    for index, op in operations:
+        if op['op'] == 'create':
+            task = Task(created_by=user, **op['data'])
+            task.sync_completed_at(now)
+            to_create.append(task)
+            transitions.append((task.id, None, task.status))
+            results[index]['id'] = str(task.id)
+        elif op['op'] == 'delete':
+            to_delete.append(op['id'])
+        else:
+            task = tasks[op['id']]
+            previous, previous_project_id = task.status, task.project_id
+            changes = op['data'] if op['op'] == 'update' else {'status': op['status']}
+            for field, value in changes.items():
+                setattr(task, field, value)
+            if task.status != previous:
+                task.sync_completed_at(now)
+                update_fields.add('completed_at')
+                transitions.append((task.id, previous, task.status))
+            if task.status != previous or task.project_id != previous_project_id:
+                # Ranked at the bottom of its new column below
+                task.rank = ''
+                update_fields.add('rank')
+                moved.append(task)
+            task.updated_at = now
+            update_fields.update(changes)
+            to_update[task.id] = task
+
+    with transaction.atomic():
+        assign_bottom_ranks(to_create + moved)
+        if to_create:
+            Task.objects.bulk_create(to_create)
+        if to_update:
+            Task.objects.bulk_update(to_update.values(), sorted(update_fields | {'updated_at'}))
+        ChangeLog.record('tasks', [task.id for task in to_create] + list(to_update))
+        TaskStatusTransition.record(transitions, user_id=user.pk, at=now)
+        if to_delete:
+            Task.objects.filter(id__in=to_delete).delete()
+
+    return Response({
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(to_delete),
+        'results': results
+    })
@@ -0,0 +1,142 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.db.models import Q, Count, Max, Sum
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers, quote_etag
+from django.utils.http import parse_etags
+from datetime import datetime, timedelta
+import hashlib
+
+from .models import Project, Task, TimeEntry
+
+MAX_WINDOW_DAYS = 62
+
+
+def visible_tasks(user):
+    """Tasks the user may see, expressed without joins that need DISTINCT"""
+    queryset = Task.objects.all()
+    if user.role == 'SCRUM_MASTER':
+        return queryset
+    return queryset.filter(
+        Q(assigned_to=user) |
+        Q(created_by=user) |
+        Q(project__in=Project.objects.filter(team_members=user).values('id'))
+    )
+
+
+def _parse_window(params):
+    """Return (start_date, end_date) from ?start=&end=, defaulting to the current month"""
+    today = timezone.localdate()
+    start_str = params.get('start')
+    end_str = params.get('end')
+
+    start = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else today.replace(day=1)
+    if end_str:
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+    else:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = next_month - timedelta(days=1)
+    return start, end
+
+
+def _none_match(request, etag):
+    """True when If-None-Match lists etag (weak comparison, RFC 9110 13.1.2) or is *"""
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    if etags == ['*']:
+        return True
+    return etag.removeprefix('W/') in {candidate.removeprefix('W/') for candidate in etags}
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_view(request):
+    """Tasks due (and optionally time entries logged) within a date window, bucketed per day.
+
+    Query params:
+        start, end   - inclusive YYYY-MM-DD bounds (default: current month)
+        time_entries - 'true' to include the user's time entries in the window
+
+    Responses carry an ETag; send it back as If-None-Match to get a 304
+    when nothing in the window has changed.
+    """
+    try:
+        start, end = _parse_window(request.query_params)
+    except ValueError:
+        return Response({"detail": "Invalid date format. Use YYYY-MM-DD"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if end < start or (end - start).days >= MAX_WINDOW_DAYS:
+        return Response({"detail": f"end must be after start and the window at most {MAX_WINDOW_DAYS} days"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    include_time_entries = request.query_params.get('time_entries', '').lower() == 'true'
+    user = request.user
+
+    window_start = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    window_end = timezone.make_aware(datetime.combine(end + timedelta(days=1), datetime.min.time()))
+
+    tasks = visible_tasks(user).filter(due_date__gte=window_start, due_date__lt=window_end)
+    time_entries = TimeEntry.objects.filter(user=user, start_time__lt=window_end).filter(
+        Q(end_time__isnull=True) | Q(end_time__gte=window_start)
+    )
+
+    # Cheap fingerprint of the window, checked before any row is loaded. It
+    # covers the rows the payload embeds titles from: projects for tasks,
+    # tasks for time entries.
+    version = [start, end, user.id, tasks.aggregate(
+        n=Count('id'), changed=Max('updated_at'), project_changed=Max('project__updated_at')
+    )]
+    if include_time_entries:
+        version.append(time_entries.aggregate(
+            n=Count('id'), changed=Max('created_at'), open=Count('id', filter=Q(end_time__isnull=True)),
+            hours=Sum('duration_hours'), task_changed=Max('task__updated_at')
+        ))
+    etag = quote_etag(hashlib.md5(repr(version).encode()).hexdigest())
+
+    if _none_match(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        days = {}
+
+        def bucket(moment):
+            date_str = timezone.localtime(moment).date().isoformat()
+            if date_str not in days:
+                days[date_str] = {'date': date_str, 'tasks': [], 'time_entries': []}
+            return days[date_str]
+
+        for row in tasks.order_by('due_date').values(
+            'id', 'title', 'status', 'priority', 'due_date', 'project_id', 'project__title'
+        ):
+            bucket(row['due_date'])['tasks'].append({
+                'id': row['id'],
+                'title': row['title'],
+                'status': row['status'],
+                'priority': row['priority'],
+                'due_date': row['due_date'],
+                'project_id': row['project_id'],
+                'project_title': row['project__title'],
+            })
+
+        if include_time_entries:
+            for row in time_entries.order_by('start_time').values(
+                'id', 'task_id', 'task__title', 'start_time', 'end_time', 'duration_hours'
+            ):
+                bucket(max(row['start_time'], window_start))['time_entries'].append({
+                    'id': row['id'],
+                    'task_id': row['task_id'],
+                    'task_title': row['task__title'],
+                    'start_time': row['start_time'],
+                    'end_time': row['end_time'],
+                    'duration_hours': row['duration_hours'],
+                })
+
+        response = Response({
+            'start': start,
+            'end': end,
+            'days': [days[key] for key in sorted(days)],
+        })
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
@@ -0,0 +1,211 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import datetime, timedelta
+from itertools import islice
+import csv
+import io
+
+from .db_routing import id_subquery
+from .models import User, Task, TimeEntry, TaskTimer
+from .renderers import FastJSONRenderer
+from .serializers_fastpath import iso_datetime
+from .views_calendar import visible_tasks
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Dataset -> (column name, values() lookup) pairs, in output order. Timer
+# rows cannot join users and tasks (see api.db_routing), so the timesheet
+# columns without a lookup are filled in by _with_timesheet_names.
+EXPORT_COLUMNS = {
+    'tasks': [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('status', 'status'),
+        ('priority', 'priority'),
+        ('project_id', 'project_id'),
+        ('project_title', 'project__title'),
+        ('assigned_to_email', 'assigned_to__email'),
+        ('created_by_email', 'created_by__email'),
+        ('due_date', 'due_date'),
+        ('estimated_hours', 'estimated_hours'),
+        ('actual_hours', 'actual_hours'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ],
+    'time-entries': [
+        ('id', 'id'),
+        ('task_id', 'task_id'),
+        ('task_title', 'task__title'),
+        ('project_id', 'task__project_id'),
+        ('project_title', 'task__project__title'),
+        ('user_id', 'user_id'),
+        ('user_email', 'user__email'),
+        ('start_time', 'start_time'),
+        ('end_time', 'end_time'),
+        ('duration_hours', 'duration_hours'),
+        ('description', 'description'),
+        ('created_at', 'created_at'),
+    ],
+    'timesheets': [
+        ('date', 'date'),
+        ('user_id', 'user_id'),
+        ('user_email', None),
+        ('task_id', 'task_id'),
+        ('task_title', None),
+        ('project_id', None),
+        ('project_title', None),
+        ('total_duration_seconds', 'total_duration_seconds'),
+    ],
+}
+
+
+def _export_queryset(dataset, user, params):
+    """values_list() queryset for one export, filtered by ?start=&end=&user_id=&project_id="""
+    is_scrum_master = user.role == 'SCRUM_MASTER'
+
+    start_str = params.get('start')
+    end_str = params.get('end')
+    start = end = None
+    if start_str:
+        start = timezone.make_aware(datetime.strptime(start_str, '%Y-%m-%d'))
+    if end_str:
+        end = timezone.make_aware(datetime.strptime(end_str, '%Y-%m-%d') + timedelta(days=1))
+
+    if dataset == 'tasks':
+        queryset = visible_tasks(user).order_by('created_at', 'id')
+        date_field, user_field, project_field = 'created_at', 'assigned_to_id', 'project_id'
+    elif dataset == 'time-entries':
+        queryset = TimeEntry.objects.order_by('start_time', 'id')
+        date_field, user_field, project_field = 'start_time', 'user_id', 'task__project_id'
+    else:
+        # Completed timers summed per user, day and task, like the timesheet endpoints
+        queryset = TaskTimer.objects.filter(end_time__isnull=False)
+        date_field, user_field, project_field = 'start_time', 'user_id', None
+
+    if dataset != 'tasks' and not is_scrum_master:
+        queryset = queryset.filter(user_id=user.pk)
+    if start:
+        queryset = queryset.filter(**{f'{date_field}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{date_field}__lt': end})
+    if params.get('user_id'):
+        queryset = queryset.filter(**{user_field: params['user_id']})
+    if params.get('project_id'):
+        if project_field:
+            queryset = queryset.filter(**{project_field: params['project_id']})
+        else:
+            tasks = Task.objects.filter(project_id=params['project_id'])
+            queryset = queryset.filter(task_id__in=id_subquery(tasks, TaskTimer))
+
+    if dataset == 'timesheets':
+        return (
+            queryset.annotate(date=TruncDate('start_time'))
+            .values('date', 'user_id', 'task_id')
+            .annotate(total_duration_seconds=Sum('duration_seconds'))
+            .order_by('date', 'user_id', 'task_id')
+            .values_list('date', 'user_id', 'task_id', 'total_duration_seconds')
+        )
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS[dataset]]
+    return queryset.values_list(*lookups)
+
+
+def _with_timesheet_names(rows):
+    """Expand (date, user_id, task_id, total) timer rows to the timesheets columns"""
+    rows = iter(rows)
+    while chunk := list(islice(rows, EXPORT_CHUNK_SIZE)):
+        emails = dict(User.objects.filter(pk__in={row[1] for row in chunk})
+                      .values_list('id', 'email'))
+        tasks = {
+            task_id: rest for task_id, *rest in
+            Task.objects.filter(pk__in={row[2] for row in chunk})
+            .values_list('id', 'title', 'project_id', 'project__title')
+        }
+        for day, user_id, task_id, total in chunk:
+            title, project_id, project_title = tasks.get(task_id, (None, None, None))
+            yield (day, user_id, emails.get(user_id), task_id, title,
+                   project_id, project_title, total)
+
+
+def _format_cell(value):
+    if isinstance(value, datetime):
+        return iso_datetime(value)
+    return value
+
+
+def _csv_chunks(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for index, row in enumerate(rows, 1):
+        writer.writerow([_format_cell(value) for value in row])
+        if index % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(header, rows):
+    renderer = FastJSONRenderer()
+    lines = []
+    for row in rows:
+        lines.append(renderer.render(dict(zip(header, map(_format_cell, row)))))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_dataset(request, dataset, fmt):
+    """Stream tasks, time entries or timesheets as CSV or NDJSON.
+
+    URL: /api/exports/<tasks|time-entries|timesheets>.<csv|ndjson>
+
+    Query params:
+        start, end - inclusive YYYY-MM-DD bounds (tasks: created_at,
+                     time entries and timesheets: start_time)
+        user_id    - assignee for tasks, owner for time entries/timesheets
+        project_id - restrict to one project
+
+    Rows are read with a server-side iterator and written out in chunks,
+    so memory use does not grow with the size of the export.
+    """
+    if dataset not in EXPORT_COLUMNS or fmt not in CONTENT_TYPES:
+        return Response({"detail": "Unknown export"}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        queryset = _export_queryset(dataset, request.user, request.query_params)
+    except (ValueError, ValidationError):
+        return Response({"detail": "Invalid filter. Dates use YYYY-MM-DD, ids must be UUIDs"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    header = [name for name, _ in EXPORT_COLUMNS[dataset]]
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if dataset == 'timesheets':
+        rows = _with_timesheet_names(rows)
+    chunks = _csv_chunks(header, rows) if fmt == 'csv' else _ndjson_chunks(header, rows)
+
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+    stamp = timezone.localdate().isoformat()
+    response['Content-Disposition'] = f'attachment; filename="{dataset}-{stamp}.{fmt}"'
+    response['Cache-Control'] = 'no-store'
+    return response
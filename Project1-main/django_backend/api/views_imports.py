@@ -0,0 +1,41 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+import os
+
+from .importer import IMPORTERS, IMPORT_FORMATS, import_rows, read_rows
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def import_data(request, kind):
+    """Import tasks or time entries from an uploaded CSV or NDJSON file.
+
+    URL: /api/imports/<tasks|time-entries>/
+
+    Multipart fields:
+        file    - .csv (with a header row), .ndjson or .jsonl
+        dry_run - 'true' to validate without writing anything
+
+    Valid rows are created and invalid ones skipped; the response reports
+    the errors of each rejected row by its row number. A file that cannot be
+    decoded or parsed is answered with a 400 carrying the report, whose
+    'file_error' names the row where reading stopped.
+    """
+    if kind not in IMPORTERS:
+        return Response({"detail": "Unknown import"}, status=status.HTTP_404_NOT_FOUND)
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({"detail": "Upload the data as a 'file' field"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    fmt = IMPORT_FORMATS.get(os.path.splitext(upload.name)[1].lower())
+    if fmt is None:
+        return Response({"detail": f"Supported file types: {', '.join(IMPORT_FORMATS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = str(request.data.get('dry_run', '')).lower() == 'true'
+    report = import_rows(kind, read_rows(upload.file, fmt), request.user, dry_run=dry_run)
+    if 'file_error' in report:
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report)
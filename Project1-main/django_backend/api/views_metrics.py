@@ -0,0 +1,24 @@
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .connections import connection_stats
+from .metrics import render_metrics
+from .permissions import IsScrumMaster
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, IsScrumMaster])
+def connection_metrics(request):
+    """Database connections opened and reused by this worker process, per alias"""
+    return Response({'connections': connection_stats()})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def prometheus_metrics(request):
+    """Per-endpoint request and SQL metrics of all worker processes, for Prometheus to scrape"""
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,53 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .sync import changes_since, oldest_cursor, settled_cursor
+
+DEFAULT_CHANGE_LIMIT = 500
+MAX_CHANGE_LIMIT = 2000
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def changes_feed(request):
+    """Rows created, updated or deleted since a sync cursor.
+
+    Query params:
+        since - cursor from a previous response; omit it to get the current
+                cursor after loading the collections in full
+        limit - maximum number of change-log entries to consume (default 500)
+
+    When `reset` is true the client's cursor is older than the retained log
+    and it must reload its collections before syncing from `cursor`.
+
+    The cursor stays behind changes from the last few seconds (see
+    api.sync), so a row may be returned again by the next request.
+    """
+    since = request.query_params.get('since')
+    try:
+        limit = min(int(request.query_params.get('limit', DEFAULT_CHANGE_LIMIT)), MAX_CHANGE_LIMIT)
+        since = int(since) if since is not None else None
+    except ValueError:
+        return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'limit must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+
+    oldest = oldest_cursor()
+    if since is None or (oldest is not None and since < oldest):
+        return Response({
+            'cursor': settled_cursor(),
+            'reset': True,
+            'has_more': False,
+            'changes': {},
+            'deleted': {},
+        })
+
+    cursor, has_more, changes, deleted = changes_since(request.user, since, limit)
+    return Response({
+        'cursor': cursor,
+        'reset': False,
+        'has_more': has_more,
+        'changes': changes,
+        'deleted': deleted,
+    })
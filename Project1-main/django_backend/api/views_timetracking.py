@@ -7,7 +7,9 @@ from django.db.models import Sum, F
 from datetime import datetime, timedelta
 import pytz
 
-from .models import Task, TaskTimer, ActivityLog
+from .db_routing import replica_reads
+from .querycheck import query_budget
+from .models import Task, TaskTimer, ActivityLog, load_related
 from .serializers_timetracking import TaskTimerSerializer, TimesheetSummarySerializer, TimesheetEntrySerializer
 
 @api_view(['POST'])
@@ -18,8 +20,8 @@ def start_timer(request, task_id):
     
     # Check if user already has an active timer for this task
     active_timer = TaskTimer.objects.filter(
-        task=task,
-        user=request.user,
+        task_id=task.pk,
+        user_id=request.user.pk,
         end_time__isnull=True
     ).first()
     
@@ -55,8 +57,8 @@ def stop_timer(request, task_id):
     
     # Find active timer
     timer = TaskTimer.objects.filter(
-        task=task,
-        user=request.user,
+        task_id=task.pk,
+        user_id=request.user.pk,
         end_time__isnull=True
     ).first()
     
@@ -81,8 +83,10 @@ def stop_timer(request, task_id):
     serializer = TaskTimerSerializer(timer)
     return Response(serializer.data)
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@replica_reads
 def daily_timesheet(request):
     """Get daily timesheet summary"""
     date_str = request.query_params.get('date', None)
@@ -103,11 +107,13 @@ def daily_timesheet(request):
         
         # Query timers for the day
         timers = TaskTimer.objects.filter(
-            user=request.user,
+            user_id=request.user.pk,
             start_time__gte=start_datetime,
             start_time__lte=end_datetime,
             end_time__isnull=False  # Only completed timers
         )
+        # Tasks may be in another database, so fetch them in one query
+        timers = load_related(timers, task=Task.objects.select_related('project'))
         
         # Aggregate by task
         entries = []
@@ -148,8 +154,10 @@ def daily_timesheet(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@replica_reads
 def weekly_timesheet(request):
     """Get weekly timesheet summary"""
     week_start_str = request.query_params.get('week_start', None)
@@ -175,11 +183,13 @@ def weekly_timesheet(request):
         
         # Query timers for the week
         timers = TaskTimer.objects.filter(
-            user=request.user,
+            user_id=request.user.pk,
             start_time__gte=start_datetime,
             start_time__lte=end_datetime,
             end_time__isnull=False  # Only completed timers
         )
+        # Tasks may be in another database, so fetch them in one query
+        timers = load_related(timers, task=Task.objects.select_related('project'))
         
         # Aggregate by task
         entries = []
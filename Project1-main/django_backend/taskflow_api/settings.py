@@ -37,6 +37,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.RequestMetricsMiddleware',
+    'api.querycheck.QueryCheckMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -45,6 +47,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.db_routing.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'taskflow_api.urls'
@@ -66,14 +69,25 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'taskflow_api.wsgi.application'
+ASGI_APPLICATION = 'taskflow_api.asgi.application'
+
+# Serve the read-heavy endpoints from api.views_async. Turn on when running
+# under an ASGI server (uvicorn/daphne), leave off under WSGI.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'false').lower() == 'true'
 
 # Database
+# Connections are kept open for DB_CONN_MAX_AGE seconds and health-checked
+# before reuse; per-connection tuning lives in api.connections (DB_TUNING).
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
 # For local development, prefer SQLite by setting USE_SQLITE=true in environment.
 if os.getenv('USE_SQLITE', 'true').lower() == 'true':
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 else:
@@ -86,6 +100,8 @@ else:
             'PASSWORD': os.getenv('MYSQL_PASSWORD', 'password'),
             'HOST': os.getenv('MYSQL_HOST', '127.0.0.1'),
             'PORT': os.getenv('MYSQL_PORT', '3306'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
                 'charset': 'utf8mb4',
@@ -93,6 +109,61 @@ else:
         }
     }
 
+# Optional read replica for report queries, routed by api.db_routing: a
+# SQLite snapshot file (refreshed by `manage.py snapshot_replica`) or a
+# MySQL replica host.
+if os.getenv('SQLITE_REPLICA_PATH') and DATABASES['default']['ENGINE'].endswith('sqlite3'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('SQLITE_REPLICA_PATH'),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif os.getenv('MYSQL_REPLICA_HOST') and DATABASES['default']['ENGINE'].endswith('mysql'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('MYSQL_REPLICA_HOST'),
+        'PORT': os.getenv('MYSQL_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Optional separate database for the high-write event tables (activity
+# log, notifications, timers), routed by api.db_routing.EventsRouter: its
+# own SQLite file or MySQL schema. Create its tables with
+# `manage.py migrate --database=events`.
+if os.getenv('EVENTS_DB_PATH') and DATABASES['default']['ENGINE'].endswith('sqlite3'):
+    DATABASES['events'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('EVENTS_DB_PATH'),
+    }
+elif os.getenv('MYSQL_EVENTS_DATABASE') and DATABASES['default']['ENGINE'].endswith('mysql'):
+    DATABASES['events'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('MYSQL_EVENTS_DATABASE'),
+    }
+
+DATABASE_ROUTERS = ['api.db_routing.EventsRouter', 'api.db_routing.ReplicaRouter']
+
+REPLICA_ROUTING = {
+    'MAX_LAG': int(os.getenv('REPLICA_MAX_LAG', '30')),
+    'LAG_CHECK_INTERVAL': 5,
+    'READ_YOUR_WRITES': 60,
+    # Write pins live in this CACHES alias, which every worker must share
+    # when a replica is configured (system check api.W002)
+    'SHARED_CACHE': os.getenv('REPLICA_ROUTING_SHARED_CACHE', 'default'),
+}
+
+DB_TUNING = {
+    # WAL is persistent and would rewrite the tracked dev db.sqlite3, so it is
+    # opt-in: set SQLITE_JOURNAL_MODE=WAL where the database is not in git
+    'SQLITE_JOURNAL_MODE': os.getenv('SQLITE_JOURNAL_MODE') or None,
+    'SQLITE_PRAGMAS': {
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+    },
+    'MYSQL_STATEMENT_TIMEOUT_MS': int(os.getenv('MYSQL_STATEMENT_TIMEOUT_MS', '30000')),
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -120,17 +191,47 @@ STATIC_URL = 'static/'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Per-endpoint request/SQL metrics served at /metrics, see api/metrics.py.
+# Point METRICS_DIR at a directory shared by all worker processes so the
+# endpoint reports every worker, not only the one answering the scrape.
+METRICS = {
+    'DIRECTORY': os.getenv('METRICS_DIR') or None,
+    'FLUSH_INTERVAL': int(os.getenv('METRICS_FLUSH_INTERVAL', '5')),
+}
+
+# N+1 detection and @query_budget checks, see api/querycheck.py. Violations
+# are logged in development and raise in the test suite.
+QUERY_CHECKS = {
+    'ACTION': os.getenv('QUERY_CHECKS', 'log' if DEBUG else 'off'),
+    'N_PLUS_ONE_THRESHOLD': int(os.getenv('QUERY_CHECKS_THRESHOLD', '10')),
+}
+
+TEST_RUNNER = 'api.querycheck.QueryCheckTestRunner'
+
+# Worker processes rendering attachment previews (0 renders inline), see api/previews.py
+PREVIEW_WORKERS = int(os.getenv('PREVIEW_WORKERS', '2'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON (falls back to the stdlib when orjson is missing)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -140,6 +241,28 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Per-process cache of users resolved from JWTs, see api/authentication.py
+AUTH_USER_CACHE = {
+    'TTL': int(os.getenv('AUTH_USER_CACHE_TTL', '30')),
+    'MAX_SIZE': 4096,
+    # A CACHES alias every worker shares. Without one, users and claims versions
+    # are cached per process and changes reach other workers within TTL seconds
+    'SHARED_CACHE': os.getenv('AUTH_USER_SHARED_CACHE') or None,
+}
+
+# Incremental sync feed (api.sync): cursors only pass change-log entries
+# older than SETTLE_WINDOW seconds, longer than any write transaction runs
+CHANGE_SYNC = {
+    'SETTLE_WINDOW': int(os.getenv('CHANGE_SYNC_SETTLE_WINDOW', '5')),
+}
+
+# Revoked refresh tokens (api.revocation)
+TOKEN_REVOCATION = {
+    'CAPACITY': 100000,
+    'ERROR_RATE': 0.001,
+    'SYNC_INTERVAL': int(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '5')),
+}
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
@@ -5,6 +5,8 @@ export const API = `${BACKEND_URL}/api`;
 
 export const api = axios.create({
   baseURL: API,
+  // Sends back the read-your-writes cookie the backend sets on writes
+  withCredentials: true,
 });
 
 api.interceptors.request.use((config) => {